@@ -358,6 +358,66 @@ class Font(dict):
                 index += (len(data)).to_bytes(2, byteorder='little')  # End
         return data, index
 
+    # Width of every character slot in the index, one byte each, so that
+    # char_width() needn't decode a glyph. Returns None if a width won't fit.
+    @staticmethod
+    def build_widths(data, index):
+        widths = bytearray()
+        for idx_offs in range(0, len(index), 4):
+            offset = int.from_bytes(index[idx_offs : idx_offs + 2], 'little')
+            width = int.from_bytes(data[offset : offset + 2], 'little')
+            if width > 255:
+                return None
+            widths.append(width)
+        return widths
+
+    # Crop each horizontally mapped glyph from build_arrays to the bounding
+    # box of its set pixels. A record becomes the 2 byte width, then left,
+    # top, crop width and crop height a byte each, then the cropped rows
+    # padded to whole bytes. A blank glyph keeps a single blank pixel.
+    # Returns None if an offset or size won't fit in a byte.
+    @staticmethod
+    def crop_arrays(data, index, height, reverse):
+        def bit(x):
+            return 1 << (x & 7) if reverse else 0x80 >> (x & 7)
+
+        cropped = bytearray()
+        records = {}  # offset in data -> offset in cropped
+        new_index = bytearray()
+        for idx_offs in range(0, len(index), 4):
+            offset = int.from_bytes(index[idx_offs : idx_offs + 2], 'little')
+            if offset not in records:
+                records[offset] = len(cropped)
+                width = int.from_bytes(data[offset : offset + 2], 'little')
+                stride = (width + 7) // 8
+                rows = data[offset + 2 : offset + 2 + stride * height]
+                on = [(x, y) for y in range(height) for x in range(width)
+                      if rows[y * stride + (x >> 3)] & bit(x)]
+                if on:
+                    left = min(x for x, _ in on)
+                    top = min(y for _, y in on)
+                    crop_width = max(x for x, _ in on) - left + 1
+                    crop_height = max(y for _, y in on) - top + 1
+                else:
+                    left = top = 0
+                    crop_width = crop_height = 1
+                if max(left, top, crop_width, crop_height) > 255:
+                    return None
+                crop_stride = (crop_width + 7) // 8
+                pixels = bytearray(crop_stride * crop_height)
+                for x, y in on:
+                    x -= left
+                    pixels[(y - top) * crop_stride + (x >> 3)] |= bit(x)
+                cropped += width.to_bytes(2, 'little')
+                cropped += bytes((left, top, crop_width, crop_height))
+                cropped += pixels
+            start = records[offset]
+            crop_width, crop_height = cropped[start + 4], cropped[start + 5]
+            end = start + 6 + (crop_width + 7) // 8 * crop_height
+            new_index += start.to_bytes(2, 'little')
+            new_index += end.to_bytes(2, 'little')
+        return cropped, new_index
+
     def build_binary_array(self, hmap, reverse, sig):
         data = bytearray((0x3f + sig, 0xe7, self.max_width, self.height))
         for char in self.charset:
@@ -386,12 +446,51 @@ def get_ch(ch):
  
 """
 
+STR04 = """def char_width(ch):
+    ordch = ord(ch)
+    ordch = ordch + 1 if ordch >= {} and ordch <= {} else {}
+    return _widths[ordch - {}]
+
+"""
+
+# Cropped fonts: get_cropped returns the glyph's bounding box and where it
+# sits in the character cell, for a writer that can draw it without the
+# blank margins. get_ch puts the margins back for anything else.
+STR05 = """_mvfont = memoryview(_font)
+
+def get_cropped(ch):
+    ordch = ord(ch)
+    ordch = ordch + 1 if ordch >= {} and ordch <= {} else {}
+    idx_offs = 4 * (ordch - {})
+    offset = int.from_bytes(_index[idx_offs : idx_offs + 2], 'little')
+    next_offs = int.from_bytes(_index[idx_offs + 2 : idx_offs + 4], 'little')
+    width = int.from_bytes(_font[offset:offset + 2], 'little')
+    left, top, crop_width, crop_height = _font[offset + 2:offset + 6]
+    return _mvfont[offset + 6:next_offs], left, top, crop_width, crop_height, width
+
+def _bit(x):
+    return {}
+
+def get_ch(ch):
+    glyph, left, top, crop_width, crop_height, width = get_cropped(ch)
+    stride = (width + 7) // 8
+    crop_stride = (crop_width + 7) // 8
+    buf = bytearray(stride * {})
+    for y in range(crop_height):
+        row = (top + y) * stride
+        for x in range(crop_width):
+            if glyph[y * crop_stride + (x >> 3)] & _bit(x):
+                buf[row + ((left + x) >> 3)] |= _bit(left + x)
+    return memoryview(buf), {}, width
+
+"""
+
 def write_func(stream, name, arg):
     stream.write('def {}():\n    return {}\n\n'.format(name, arg))
 
 # filename, size, minchar=32, maxchar=126, monospaced=False, defchar=ord('?'):
 
-def write_font(op_path, font_path, height, monospaced, hmap, reverse, minchar, maxchar, defchar, charset, iterate):
+def write_font(op_path, font_path, height, monospaced, hmap, reverse, minchar, maxchar, defchar, charset, iterate, crop=False):
     try:
         fnt = Font(font_path, height, minchar, maxchar, monospaced, defchar, charset)
     except freetype.ft_errors.FT_Exception:
@@ -399,7 +498,7 @@ def write_font(op_path, font_path, height, monospaced, hmap, reverse, minchar, m
         return False
     try:
         with open(op_path, 'w', encoding='utf-8') as stream:
-            write_data(stream, fnt, font_path, hmap, reverse, iterate)
+            write_data(stream, fnt, font_path, hmap, reverse, iterate, crop)
     except OSError:
         print("Can't open", op_path, 'for writing')
         return False
@@ -412,7 +511,7 @@ def glyphs():
 
 '''
 
-def write_data(stream, fnt, font_path, hmap, reverse, iterate):
+def write_data(stream, fnt, font_path, hmap, reverse, iterate, crop=False):
     height = fnt.height  # Actual height, not target height
     minchar = fnt.minchar
     maxchar = fnt.maxchar
@@ -431,13 +530,30 @@ def write_data(stream, fnt, font_path, hmap, reverse, iterate):
     if iterate:
         stream.write(STR03.format(''.join(fnt.pop_charset)))
     data, index = fnt.build_arrays(hmap, reverse)
+    cropped = Font.crop_arrays(data, index, height, reverse) if crop else None
+    if cropped is not None:
+        print('Cropped glyph data from {} to {} bytes.'.format(len(data), len(cropped[0])))
+        data, index = cropped
+    elif crop:
+        print('WARNING: glyphs too large to crop, writing them uncropped.')
     bw_font = ByteWriter(stream, '_font')
     bw_font.odata(data)
     bw_font.eot()
     bw_index = ByteWriter(stream, '_index')
     bw_index.odata(index)
     bw_index.eot()
-    stream.write(STR02.format(minchar, maxchar, defchar, minchar, height))
+    widths = Font.build_widths(data, index)
+    if widths is not None:
+        bw_widths = ByteWriter(stream, '_widths')
+        bw_widths.odata(widths)
+        bw_widths.eot()
+    if cropped is not None:
+        bit = '1 << (x & 7)' if reverse else '0x80 >> (x & 7)'
+        stream.write(STR05.format(minchar, maxchar, defchar, minchar, bit, height, height))
+    else:
+        stream.write(STR02.format(minchar, maxchar, defchar, minchar, height))
+    if widths is not None:
+        stream.write(STR04.format(minchar, maxchar, defchar, minchar))
 
 # BINARY OUTPUT
 # hmap reverse magic bytes
@@ -531,6 +647,9 @@ if __name__ == "__main__":
                         help = 'File containing charset e.g. cyrillic_subset.',
                         default = '')
 
+    parser.add_argument('-p', '--crop', action='store_true',
+                        help='Crop glyphs to their bounding box (needs --xmap).')
+
     args = parser.parse_args()
     if not args.infile[0].isalpha():
         quit('Font filenames must be valid Python variable names.')
@@ -564,6 +683,9 @@ if __name__ == "__main__":
         elif args.largest > 127 and os.path.splitext(args.infile)[1].upper() == '.TTF':
             print('WARNING: extended ASCII characters may not be correctly converted. See docs.')
 
+        if args.crop and not args.xmap:
+            quit('--crop needs horizontal mapping (--xmap)')
+
         if args.errchar < 0 or args.errchar > 255:
             quit('--errchar must be between 0 and 255')
         if args.charset and (args.smallest != 32 or args.largest != 126):
@@ -584,7 +706,7 @@ if __name__ == "__main__":
         print('Writing Python font file.')
         if not write_font(args.outfile, args.infile, args.height, args.fixed,
                           args.xmap, args.reverse, args.smallest, args.largest,
-                          args.errchar, cset, args.iterate):
+                          args.errchar, cset, args.iterate, args.crop):
             sys.exit(1)
 
     print(args.outfile, 'written successfully.')
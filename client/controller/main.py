@@ -9,6 +9,7 @@ from config import *
 import small_font as small_font
 import roboto48 as large_font
 import writer
+from partial_display import PartialDisplay
 
 
 # set up rotary encoder
@@ -23,12 +24,14 @@ r_temp = Rotary(
 
 # initialize display
 i2c = machine.I2C(scl=machine.Pin(DISPLAY_SCL), sda=machine.Pin(DISPLAY_SDA))
-display = ssd1306.SSD1306_I2C(128, 64, i2c)
+# only the parts of the screen that changed are sent on each show()
+display = PartialDisplay(ssd1306.SSD1306_I2C(128, 64, i2c))
 # set display to partial brightness
 display.contrast(1)
 
 small_font_writer = writer.Writer(display, small_font)
-large_font_writer = writer.Writer(display, large_font)
+# rendered 48px strings are a few hundred bytes each, keep fewer of them
+large_font_writer = writer.Writer(display, large_font, string_cache=4)
 
 lastval = r_temp.value()
 
@@ -152,36 +155,61 @@ def write_setpoint():
     small_font_writer.printstring(sp_str)
 
 
-def get_temperature():
-    try:
-        response = urequests.get(URL_GET_TEMP)
-    except OSError as e:
-        print("error on request: ", str(e))
-        return None, None
-    if response.status_code < 400:
-        temp = float(response.json()["temperature"])
-        rh = round(float(response.json()["humidity"]))
-        if TEMP_UNITS == "F":
-            temp = round(temp * 9 / 5 + 32)
-    else:
-        print("Temperature request API call failed:", response)
-        temp = rh = None
-
-    if response:
-        response.close()
-    return temp, rh
+# ETag of the last response per URL, sent back as If-None-Match so the server
+# can answer 304 when nothing has changed
+etags = {}
 
 
-def get_setpoint():
+def conditional_get(url):
+    """
+    GET `url` unless the server says our last copy is still current. returns
+    the response, or None on a 304 (the response is already closed)
+    """
+    headers = {}
+    if url in etags:
+        headers["If-None-Match"] = etags[url]
+    response = urequests.get(url, headers=headers)
+    if response.status_code == 304:
+        response.close()
+        return None
+    # not every urequests build keeps the response headers
+    etag = (getattr(response, "headers", None) or {}).get("ETag")
+    if etag is not None and response.status_code < 400:
+        etags[url] = etag
+    return response
+
+
+def get_state():
+    """
+    temperature, humidity and setpoint from the server's combined controller
+    state endpoint, in one request. returns None if the request failed or
+    nothing has changed since the last poll
+    """
     try:
-        response = urequests.get(URL_SETPOINT)
+        response = conditional_get(URL_STATE)
     except OSError as e:
-        print("error on request:", str(e))
+        print("error on request: ", str(e))
         return None
-    if response.status_code < 400:
-        return int(response.json()["setpoint"])
-    else:
+    if response is None:
+        # unchanged since the last poll
         return None
+    if response.status_code >= 400:
+        print("State request API call failed:", response)
+        response.close()
+        return None
+
+    state = response.json()
+    response.close()
+    # the version is in the body too, for urequests builds without headers
+    etags[URL_STATE] = '"{0:s}"'.format(state["version"])
+
+    temp = state["temperature"]
+    rh = state["humidity"]
+    if temp is not None and TEMP_UNITS == "F":
+        temp = round(temp * 9 / 5 + 32)
+    if rh is not None:
+        rh = round(rh)
+    return temp, rh, state["setpoint"]
 
 
 write_menu()
@@ -218,14 +246,15 @@ while True:
             last_temp_poll_millis, temp_poll_duration
         ):
             connect_wifi()
-            new_temp, new_rh = get_temperature()
-            if new_temp is not None:
-                current_temp = new_temp
-            if new_rh is not None:
-                current_rh = new_rh
-            new_setpoint = get_setpoint()
-            if new_setpoint is not None:
-                setpoint_temp = new_setpoint
+            state = get_state()
+            if state is not None:
+                new_temp, new_rh, new_setpoint = state
+                if new_temp is not None:
+                    current_temp = new_temp
+                if new_rh is not None:
+                    current_rh = new_rh
+                if new_setpoint is not None:
+                    setpoint_temp = new_setpoint
 
             last_temp_poll_millis = utime.ticks_ms()
 
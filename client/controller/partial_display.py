@@ -0,0 +1,167 @@
+# Partial refresh for SSD1306 displays.
+#
+# The SSD1306 driver's show() sends the whole framebuffer (1 KB for 128x64)
+# over I2C however little of it changed. PartialDisplay wraps a driver,
+# remembers which columns of which pages (8 pixel high bands) each drawing
+# call touched, and show() sends only those.
+#
+# Consecutive dirty pages are sent as one column/page window using the
+# union of their column ranges, so the address commands are paid once per
+# run of pages rather than once per page. The data goes out a page at a time
+# straight from the driver's buffer, so nothing is copied.
+
+SET_COL_ADDR = 0x21
+SET_PAGE_ADDR = 0x22
+
+
+class PartialDisplay:
+    def __init__(self, display):
+        self.display = display
+        self.width = display.width
+        self.height = display.height
+        self.pages = display.height // 8
+        # 64 pixel wide panels sit in the middle of the controller's 128 columns
+        self.column_offset = 32 if display.width == 64 else 0
+        self.buffer = memoryview(display.buffer)
+        # per page, the (first, last) dirty column, or None if it's clean
+        self.dirty = [None] * self.pages
+        # whatever is on the panel now has nothing to do with the buffer
+        self.mark(0, 0, self.width, self.height)
+
+    def mark(self, x, y, w, h):
+        """note that the pixels in the rectangle may have changed"""
+        x0 = max(0, x)
+        x1 = min(self.width, x + w) - 1
+        y0 = max(0, y)
+        y1 = min(self.height, y + h) - 1
+        if x0 > x1 or y0 > y1:
+            return
+        dirty = self.dirty
+        for page in range(y0 >> 3, (y1 >> 3) + 1):
+            span = dirty[page]
+            if span is None:
+                dirty[page] = (x0, x1)
+            elif x0 < span[0] or x1 > span[1]:
+                dirty[page] = (min(x0, span[0]), max(x1, span[1]))
+
+    def is_filled(self, x, y, w, h, c):
+        """True if every pixel of the rectangle on screen is already `c`"""
+        x0 = max(0, x)
+        x1 = min(self.width, x + w) - 1
+        y0 = max(0, y)
+        y1 = min(self.height, y + h) - 1
+        buffer = self.buffer
+        for page in range(y0 >> 3, (y1 >> 3) + 1):
+            top = max(y0, page << 3) & 7
+            bottom = min(y1, (page << 3) | 7) & 7
+            mask = (0xFF << top) & (0xFF >> (7 - bottom))
+            want = mask if c else 0
+            start = page * self.width
+            for column in range(start + x0, start + x1 + 1):
+                if buffer[column] & mask != want:
+                    return False
+        return True
+
+    def is_dirty(self):
+        for span in self.dirty:
+            if span is not None:
+                return True
+        return False
+
+    # drawing, passed on to the driver and marked dirty
+
+    def fill(self, c):
+        self.display.fill(c)
+        self.mark(0, 0, self.width, self.height)
+
+    def fill_rect(self, x, y, w, h, c):
+        self.display.fill_rect(x, y, w, h, c)
+        self.mark(x, y, w, h)
+
+    def rect(self, x, y, w, h, c):
+        # the outline would dirty the whole box, so only mark the edges that
+        # actually change. redrawing a box that is already there is free
+        edges = [
+            (x, y, w, 1),
+            (x, y + h - 1, w, 1),
+            (x, y, 1, h),
+            (x + w - 1, y, 1, h),
+        ]
+        changed = [edge for edge in edges if not self.is_filled(*edge, c=c)]
+        self.display.rect(x, y, w, h, c)
+        for edge in changed:
+            self.mark(*edge)
+
+    def blit(self, fbuf, x, y, key=-1):
+        self.display.blit(fbuf, x, y, key)
+        # a plain FrameBuffer doesn't say how big it is, so assume the worst
+        w = getattr(fbuf, "width", self.width)
+        h = getattr(fbuf, "height", self.height)
+        self.mark(x, y, w, h)
+
+    def pixel(self, x, y, c=None):
+        if c is None:
+            return self.display.pixel(x, y)
+        self.display.pixel(x, y, c)
+        self.mark(x, y, 1, 1)
+
+    def hline(self, x, y, w, c):
+        self.display.hline(x, y, w, c)
+        self.mark(x, y, w, 1)
+
+    def vline(self, x, y, h, c):
+        self.display.vline(x, y, h, c)
+        self.mark(x, y, 1, h)
+
+    def line(self, x1, y1, x2, y2, c):
+        self.display.line(x1, y1, x2, y2, c)
+        self.mark(min(x1, x2), min(y1, y2), abs(x2 - x1) + 1, abs(y2 - y1) + 1)
+
+    def text(self, string, x, y, c=1):
+        self.display.text(string, x, y, c)
+        self.mark(x, y, 8 * len(string), 8)
+
+    def scroll(self, dx, dy):
+        self.display.scroll(dx, dy)
+        self.mark(0, 0, self.width, self.height)
+
+    # refresh
+
+    def show(self):
+        """send the pages that changed since the last show"""
+        display = self.display
+        dirty = self.dirty
+        width = self.width
+        page = 0
+        while page < self.pages:
+            if dirty[page] is None:
+                page += 1
+                continue
+            first_page = page
+            x0, x1 = dirty[page]
+            while page + 1 < self.pages and dirty[page + 1] is not None:
+                page += 1
+                x0 = min(x0, dirty[page][0])
+                x1 = max(x1, dirty[page][1])
+
+            display.write_cmd(SET_COL_ADDR)
+            display.write_cmd(x0 + self.column_offset)
+            display.write_cmd(x1 + self.column_offset)
+            display.write_cmd(SET_PAGE_ADDR)
+            display.write_cmd(first_page)
+            display.write_cmd(page)
+            # the panel moves on to the next page after column x1
+            for p in range(first_page, page + 1):
+                start = p * width
+                display.write_data(self.buffer[start + x0 : start + x1 + 1])
+                dirty[p] = None
+            page += 1
+
+    def show_all(self):
+        """send the whole framebuffer, as the driver's own show does"""
+        self.display.show()
+        self.dirty = [None] * self.pages
+
+    def __getattr__(self, name):
+        # contrast, invert, poweroff and the rest don't touch the buffer
+        return getattr(self.display, name)
@@ -24,220 +24,222 @@ def max_ch():
     return 176
 
 _font =\
-b'\x1b\x00\x00\xfe\x00\x00\x03\xff\x80\x00\x0f\xff\xe0\x00\x1f\xff'\
-b'\xf0\x00\x3f\xff\xf8\x00\x3f\x83\xf8\x00\x7f\x01\xfc\x00\x7e\x00'\
-b'\xfc\x00\x7c\x00\xfc\x00\xfc\x00\x7c\x00\xfc\x00\x7c\x00\x00\x00'\
-b'\x7c\x00\x00\x00\x7c\x00\x00\x00\x7c\x00\x00\x00\x7c\x00\x00\x00'\
-b'\xfc\x00\x00\x00\xfc\x00\x00\x01\xf8\x00\x00\x01\xf8\x00\x00\x03'\
-b'\xf0\x00\x00\x07\xf0\x00\x00\x0f\xe0\x00\x00\x1f\xc0\x00\x00\x1f'\
-b'\x80\x00\x00\x3f\x00\x00\x00\x7f\x00\x00\x00\x7e\x00\x00\x00\xfc'\
-b'\x00\x00\x00\xfc\x00\x00\x00\xfc\x00\x00\x00\xfc\x00\x00\x00\xf8'\
-b'\x00\x00\x00\xf8\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00'\
-b'\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00'\
-b'\x00\x00\x00\x78\x00\x00\x00\xf8\x00\x00\x00\xfc\x00\x00\x00\xfc'\
-b'\x00\x00\x00\xfc\x00\x00\x00\xfc\x00\x00\x00\x78\x00\x00\x00\x00'\
-b'\x00\x00\x20\x00\x00\xff\x00\x00\x03\xff\xc0\x00\x07\xff\xe0\x00'\
-b'\x0f\xff\xf0\x00\x1f\xff\xf8\x00\x3f\xc3\xfc\x00\x3f\x00\xfc\x00'\
-b'\x7e\x00\x7e\x00\x7e\x00\x7e\x00\x7c\x00\x3e\x00\x7c\x00\x3e\x00'\
-b'\xfc\x00\x3f\x00\xfc\x00\x3f\x00\xfc\x00\x3f\x00\xf8\x00\x1f\x00'\
-b'\xf8\x00\x1f\x00\xf8\x00\x1f\x00\xf8\x00\x1f\x00\xf8\x00\x1f\x00'\
-b'\xf8\x00\x1f\x00\xf8\x00\x1f\x00\xf8\x00\x1f\x00\xf8\x00\x1f\x00'\
-b'\xf8\x00\x1f\x00\xf8\x00\x1f\x00\xf8\x00\x1f\x00\xf8\x00\x1f\x00'\
-b'\xf8\x00\x1f\x00\xf8\x00\x1f\x00\xf8\x00\x1f\x00\xf8\x00\x1f\x00'\
-b'\xf8\x00\x1f\x00\xf8\x00\x1f\x00\xf8\x00\x1f\x00\xfc\x00\x3f\x00'\
-b'\xfc\x00\x3f\x00\xfc\x00\x3f\x00\x7c\x00\x3e\x00\x7e\x00\x7e\x00'\
-b'\x7e\x00\x7e\x00\x3f\x00\x7e\x00\x3f\x00\xfc\x00\x3f\xc3\xfc\x00'\
-b'\x1f\xff\xf8\x00\x0f\xff\xf0\x00\x07\xff\xe0\x00\x03\xff\xc0\x00'\
-b'\x00\x7f\x00\x00\x20\x00\x00\x00\x00\x00\x00\x06\x00\x00\x00\x1e'\
-b'\x00\x00\x00\x7e\x00\x00\x03\xfe\x00\x00\x0f\xfe\x00\x00\x7f\xfe'\
-b'\x00\x00\xff\xfe\x00\x00\xff\x3e\x00\x00\xfc\x3e\x00\x00\xf0\x3e'\
-b'\x00\x00\x80\x3e\x00\x00\x00\x3e\x00\x00\x00\x3e\x00\x00\x00\x3e'\
-b'\x00\x00\x00\x3e\x00\x00\x00\x3e\x00\x00\x00\x3e\x00\x00\x00\x3e'\
-b'\x00\x00\x00\x3e\x00\x00\x00\x3e\x00\x00\x00\x3e\x00\x00\x00\x3e'\
-b'\x00\x00\x00\x3e\x00\x00\x00\x3e\x00\x00\x00\x3e\x00\x00\x00\x3e'\
-b'\x00\x00\x00\x3e\x00\x00\x00\x3e\x00\x00\x00\x3e\x00\x00\x00\x3e'\
-b'\x00\x00\x00\x3e\x00\x00\x00\x3e\x00\x00\x00\x3e\x00\x00\x00\x3e'\
-b'\x00\x00\x00\x3e\x00\x00\x00\x3e\x00\x00\x00\x3e\x00\x00\x00\x3e'\
-b'\x00\x00\x00\x3e\x00\x00\x00\x3e\x00\x00\x00\x3e\x00\x00\x00\x3e'\
-b'\x00\x00\x00\x3e\x00\x00\x00\x3e\x00\x00\x00\x3e\x00\x00\x00\x3e'\
-b'\x00\x00\x00\x00\x00\x00\x20\x00\x00\x7f\x80\x00\x01\xff\xe0\x00'\
-b'\x07\xff\xf8\x00\x0f\xff\xfc\x00\x1f\xff\xfe\x00\x3f\xc1\xfe\x00'\
-b'\x3f\x00\x7f\x00\x7e\x00\x3f\x00\x7e\x00\x3f\x00\x7c\x00\x1f\x80'\
-b'\xfc\x00\x1f\x80\xfc\x00\x1f\x80\xfc\x00\x1f\x80\xfc\x00\x1f\x80'\
-b'\x00\x00\x1f\x80\x00\x00\x1f\x00\x00\x00\x1f\x00\x00\x00\x3f\x00'\
-b'\x00\x00\x3f\x00\x00\x00\x3e\x00\x00\x00\x7e\x00\x00\x00\xfc\x00'\
-b'\x00\x00\xfc\x00\x00\x01\xf8\x00\x00\x03\xf8\x00\x00\x03\xf0\x00'\
-b'\x00\x07\xe0\x00\x00\x0f\xc0\x00\x00\x1f\xc0\x00\x00\x1f\x80\x00'\
-b'\x00\x3f\x00\x00\x00\x7e\x00\x00\x00\xfe\x00\x00\x00\xfc\x00\x00'\
-b'\x01\xf8\x00\x00\x03\xf0\x00\x00\x07\xf0\x00\x00\x07\xe0\x00\x00'\
-b'\x0f\xc0\x00\x00\x1f\x80\x00\x00\x3f\x80\x00\x00\x3f\x00\x00\x00'\
-b'\x7f\xff\xff\xe0\x7f\xff\xff\xe0\x7f\xff\xff\xe0\x7f\xff\xff\xe0'\
-b'\x7f\xff\xff\xe0\x00\x00\x00\x00\x20\x00\x00\x7f\x00\x00\x03\xff'\
-b'\xc0\x00\x07\xff\xf0\x00\x0f\xff\xf8\x00\x1f\xff\xfc\x00\x3f\xc1'\
-b'\xfc\x00\x3f\x00\x7e\x00\x7e\x00\x7e\x00\x7e\x00\x3f\x00\x7c\x00'\
-b'\x3f\x00\xfc\x00\x3f\x00\xfc\x00\x1f\x00\xfc\x00\x1f\x00\x00\x00'\
-b'\x1f\x00\x00\x00\x1f\x00\x00\x00\x3f\x00\x00\x00\x3f\x00\x00\x00'\
-b'\x3e\x00\x00\x00\x7e\x00\x00\x00\xfc\x00\x00\x03\xfc\x00\x00\xff'\
-b'\xf8\x00\x00\xff\xf0\x00\x00\xff\xe0\x00\x00\xff\xf0\x00\x00\xff'\
-b'\xfc\x00\x00\x01\xfe\x00\x00\x00\xfe\x00\x00\x00\x7f\x00\x00\x00'\
-b'\x3f\x00\x00\x00\x1f\x00\x00\x00\x1f\x80\x00\x00\x1f\x80\x00\x00'\
-b'\x1f\x80\x00\x00\x1f\x80\xfc\x00\x1f\x80\xfc\x00\x1f\x80\xfc\x00'\
-b'\x1f\x80\xfc\x00\x1f\x00\x7e\x00\x3f\x00\x7e\x00\x3f\x00\x7f\x00'\
-b'\x7e\x00\x3f\xc1\xfe\x00\x1f\xff\xfc\x00\x0f\xff\xf8\x00\x07\xff'\
-b'\xf0\x00\x03\xff\xe0\x00\x00\xff\x00\x00\x20\x00\x00\x00\x00\x00'\
-b'\x00\x00\x7e\x00\x00\x00\xfe\x00\x00\x00\xfe\x00\x00\x01\xfe\x00'\
-b'\x00\x01\xfe\x00\x00\x03\xfe\x00\x00\x03\xfe\x00\x00\x07\xfe\x00'\
-b'\x00\x07\xfe\x00\x00\x0f\xfe\x00\x00\x1f\x7e\x00\x00\x1f\x7e\x00'\
-b'\x00\x3e\x7e\x00\x00\x3e\x7e\x00\x00\x7c\x7e\x00\x00\x7c\x7e\x00'\
-b'\x00\xf8\x7e\x00\x00\xf8\x7e\x00\x01\xf0\x7e\x00\x01\xf0\x7e\x00'\
-b'\x03\xe0\x7e\x00\x03\xe0\x7e\x00\x07\xc0\x7e\x00\x07\xc0\x7e\x00'\
-b'\x0f\x80\x7e\x00\x0f\x80\x7e\x00\x1f\x00\x7e\x00\x3f\x00\x7e\x00'\
-b'\x3e\x00\x7e\x00\x7e\x00\x7e\x00\x7c\x00\x7e\x00\xff\xff\xff\xf0'\
-b'\xff\xff\xff\xf0\xff\xff\xff\xf0\xff\xff\xff\xf0\xff\xff\xff\xf0'\
-b'\x00\x00\x7e\x00\x00\x00\x7e\x00\x00\x00\x7e\x00\x00\x00\x7e\x00'\
-b'\x00\x00\x7e\x00\x00\x00\x7e\x00\x00\x00\x7e\x00\x00\x00\x7e\x00'\
-b'\x00\x00\x7e\x00\x00\x00\x7e\x00\x00\x00\x00\x00\x20\x00\x00\x00'\
-b'\x00\x00\x1f\xff\xfe\x00\x1f\xff\xfe\x00\x1f\xff\xfe\x00\x1f\xff'\
-b'\xfe\x00\x1f\xff\xfe\x00\x1f\x00\x00\x00\x3f\x00\x00\x00\x3f\x00'\
-b'\x00\x00\x3e\x00\x00\x00\x3e\x00\x00\x00\x3e\x00\x00\x00\x3e\x00'\
-b'\x00\x00\x3e\x00\x00\x00\x3e\x00\x00\x00\x3e\x00\x00\x00\x3e\x00'\
-b'\x00\x00\x3e\x3f\x00\x00\x7f\xff\xc0\x00\x7f\xff\xf0\x00\x7f\xff'\
-b'\xf8\x00\x7f\xff\xf8\x00\x7f\x83\xfc\x00\x7e\x00\xfe\x00\x1c\x00'\
-b'\xfe\x00\x00\x00\x7e\x00\x00\x00\x3f\x00\x00\x00\x3f\x00\x00\x00'\
-b'\x3f\x00\x00\x00\x1f\x00\x00\x00\x1f\x00\x00\x00\x1f\x00\x00\x00'\
-b'\x1f\x00\x00\x00\x1f\x00\x00\x00\x1f\x00\xf8\x00\x1f\x00\xf8\x00'\
-b'\x3f\x00\xf8\x00\x3f\x00\xfc\x00\x3f\x00\xfc\x00\x7e\x00\x7e\x00'\
-b'\x7e\x00\x7f\x00\xfe\x00\x3f\x83\xfc\x00\x3f\xff\xf8\x00\x1f\xff'\
-b'\xf0\x00\x0f\xff\xe0\x00\x03\xff\xc0\x00\x00\xff\x00\x00\x20\x00'\
-b'\x00\x00\x00\x00\x00\x03\xe0\x00\x00\x1f\xe0\x00\x00\x7f\xe0\x00'\
-b'\x01\xff\xe0\x00\x03\xff\xe0\x00\x07\xfe\x00\x00\x07\xf0\x00\x00'\
-b'\x0f\xe0\x00\x00\x1f\xc0\x00\x00\x1f\x80\x00\x00\x3f\x00\x00\x00'\
-b'\x3f\x00\x00\x00\x3e\x00\x00\x00\x7e\x00\x00\x00\x7e\x00\x00\x00'\
-b'\x7c\x00\x00\x00\x7c\x1f\x80\x00\x7c\xff\xe0\x00\x7d\xff\xf0\x00'\
-b'\xff\xff\xf8\x00\xff\xff\xfc\x00\xff\xc1\xfe\x00\xff\x80\xfe\x00'\
-b'\xff\x00\x7f\x00\xfe\x00\x3f\x00\xfc\x00\x3f\x00\xfc\x00\x1f\x00'\
-b'\xfc\x00\x1f\x80\xfc\x00\x1f\x80\xfc\x00\x1f\x80\xfc\x00\x1f\x80'\
-b'\xfc\x00\x1f\x80\xfc\x00\x1f\x80\xfc\x00\x1f\x80\x7c\x00\x1f\x80'\
-b'\x7c\x00\x1f\x80\x7e\x00\x1f\x00\x7e\x00\x3f\x00\x3f\x00\x3f\x00'\
-b'\x3f\x00\x7e\x00\x1f\x80\xfe\x00\x1f\xe1\xfc\x00\x0f\xff\xfc\x00'\
-b'\x07\xff\xf8\x00\x03\xff\xf0\x00\x01\xff\xc0\x00\x00\x7f\x00\x00'\
-b'\x20\x00\x00\x00\x00\x00\xff\xff\xff\xc0\xff\xff\xff\xc0\xff\xff'\
-b'\xff\xc0\xff\xff\xff\xc0\xff\xff\xff\xc0\x00\x00\x0f\x80\x00\x00'\
-b'\x0f\x80\x00\x00\x1f\x80\x00\x00\x1f\x00\x00\x00\x1f\x00\x00\x00'\
-b'\x3f\x00\x00\x00\x3e\x00\x00\x00\x7e\x00\x00\x00\x7c\x00\x00\x00'\
-b'\x7c\x00\x00\x00\xfc\x00\x00\x00\xf8\x00\x00\x01\xf8\x00\x00\x01'\
-b'\xf8\x00\x00\x01\xf0\x00\x00\x03\xf0\x00\x00\x03\xe0\x00\x00\x07'\
-b'\xe0\x00\x00\x07\xe0\x00\x00\x07\xc0\x00\x00\x0f\xc0\x00\x00\x0f'\
-b'\xc0\x00\x00\x0f\x80\x00\x00\x1f\x80\x00\x00\x1f\x00\x00\x00\x3f'\
-b'\x00\x00\x00\x3f\x00\x00\x00\x3e\x00\x00\x00\x7e\x00\x00\x00\x7e'\
-b'\x00\x00\x00\xfc\x00\x00\x00\xfc\x00\x00\x00\xf8\x00\x00\x01\xf8'\
-b'\x00\x00\x01\xf8\x00\x00\x01\xf0\x00\x00\x03\xf0\x00\x00\x03\xf0'\
-b'\x00\x00\x07\xe0\x00\x00\x07\xe0\x00\x00\x0f\xc0\x00\x00\x00\x00'\
-b'\x00\x00\x20\x00\x00\xff\x00\x00\x03\xff\xc0\x00\x07\xff\xe0\x00'\
-b'\x0f\xff\xf0\x00\x1f\xff\xf8\x00\x3f\xc3\xfc\x00\x3f\x00\xfc\x00'\
-b'\x7f\x00\xfe\x00\x7e\x00\x7e\x00\x7e\x00\x7e\x00\x7c\x00\x3e\x00'\
-b'\x7c\x00\x3e\x00\xfc\x00\x3e\x00\xfc\x00\x3e\x00\x7c\x00\x3e\x00'\
-b'\x7c\x00\x3e\x00\x7e\x00\x7e\x00\x7e\x00\x7e\x00\x3e\x00\xfc\x00'\
-b'\x3f\x00\xfc\x00\x1f\xc3\xf8\x00\x0f\xff\xf0\x00\x07\xff\xe0\x00'\
-b'\x03\xff\xc0\x00\x0f\xff\xe0\x00\x1f\xff\xf8\x00\x3f\x83\xf8\x00'\
-b'\x3f\x00\xfc\x00\x7e\x00\x7e\x00\x7c\x00\x3e\x00\xfc\x00\x3f\x00'\
-b'\xfc\x00\x3f\x00\xf8\x00\x1f\x00\xf8\x00\x1f\x00\xf8\x00\x1f\x00'\
-b'\xf8\x00\x1f\x00\xf8\x00\x1f\x00\xf8\x00\x3f\x00\xfc\x00\x3f\x00'\
-b'\xfc\x00\x3f\x00\x7e\x00\x7e\x00\x7f\x00\xfe\x00\x3f\x81\xfc\x00'\
-b'\x3f\xff\xfc\x00\x1f\xff\xf8\x00\x0f\xff\xf0\x00\x03\xff\xc0\x00'\
-b'\x00\xff\x00\x00\x20\x00\x00\x7f\x00\x00\x01\xff\xc0\x00\x07\xff'\
-b'\xe0\x00\x0f\xff\xf0\x00\x1f\xff\xf8\x00\x1f\xc3\xfc\x00\x3f\x80'\
-b'\xfc\x00\x3f\x00\xfe\x00\x7e\x00\x7e\x00\x7e\x00\x3e\x00\x7c\x00'\
-b'\x3f\x00\x7c\x00\x3f\x00\xfc\x00\x1f\x00\xfc\x00\x1f\x00\xfc\x00'\
+b'\x1b\x00\x00\x00\x16\x2f\x00\xfe\x00\x03\xff\x80\x0f\xff\xe0\x1f'\
+b'\xff\xf0\x3f\xff\xf8\x3f\x83\xf8\x7f\x01\xfc\x7e\x00\xfc\x7c\x00'\
+b'\xfc\xfc\x00\x7c\xfc\x00\x7c\x00\x00\x7c\x00\x00\x7c\x00\x00\x7c'\
+b'\x00\x00\x7c\x00\x00\xfc\x00\x00\xfc\x00\x01\xf8\x00\x01\xf8\x00'\
+b'\x03\xf0\x00\x07\xf0\x00\x0f\xe0\x00\x1f\xc0\x00\x1f\x80\x00\x3f'\
+b'\x00\x00\x7f\x00\x00\x7e\x00\x00\xfc\x00\x00\xfc\x00\x00\xfc\x00'\
+b'\x00\xfc\x00\x00\xf8\x00\x00\xf8\x00\x00\x00\x00\x00\x00\x00\x00'\
+b'\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x78'\
+b'\x00\x00\xf8\x00\x00\xfc\x00\x00\xfc\x00\x00\xfc\x00\x00\xfc\x00'\
+b'\x00\x78\x00\x20\x00\x00\x00\x18\x30\x00\xff\x00\x03\xff\xc0\x07'\
+b'\xff\xe0\x0f\xff\xf0\x1f\xff\xf8\x3f\xc3\xfc\x3f\x00\xfc\x7e\x00'\
+b'\x7e\x7e\x00\x7e\x7c\x00\x3e\x7c\x00\x3e\xfc\x00\x3f\xfc\x00\x3f'\
+b'\xfc\x00\x3f\xf8\x00\x1f\xf8\x00\x1f\xf8\x00\x1f\xf8\x00\x1f\xf8'\
+b'\x00\x1f\xf8\x00\x1f\xf8\x00\x1f\xf8\x00\x1f\xf8\x00\x1f\xf8\x00'\
+b'\x1f\xf8\x00\x1f\xf8\x00\x1f\xf8\x00\x1f\xf8\x00\x1f\xf8\x00\x1f'\
+b'\xf8\x00\x1f\xf8\x00\x1f\xf8\x00\x1f\xf8\x00\x1f\xf8\x00\x1f\xfc'\
+b'\x00\x3f\xfc\x00\x3f\xfc\x00\x3f\x7c\x00\x3e\x7e\x00\x7e\x7e\x00'\
+b'\x7e\x3f\x00\x7e\x3f\x00\xfc\x3f\xc3\xfc\x1f\xff\xf8\x0f\xff\xf0'\
+b'\x07\xff\xe0\x03\xff\xc0\x00\x7f\x00\x20\x00\x00\x01\x0f\x2e\x00'\
+b'\x06\x00\x1e\x00\x7e\x03\xfe\x0f\xfe\x7f\xfe\xff\xfe\xff\x3e\xfc'\
+b'\x3e\xf0\x3e\x80\x3e\x00\x3e\x00\x3e\x00\x3e\x00\x3e\x00\x3e\x00'\
+b'\x3e\x00\x3e\x00\x3e\x00\x3e\x00\x3e\x00\x3e\x00\x3e\x00\x3e\x00'\
+b'\x3e\x00\x3e\x00\x3e\x00\x3e\x00\x3e\x00\x3e\x00\x3e\x00\x3e\x00'\
+b'\x3e\x00\x3e\x00\x3e\x00\x3e\x00\x3e\x00\x3e\x00\x3e\x00\x3e\x00'\
+b'\x3e\x00\x3e\x00\x3e\x00\x3e\x00\x3e\x00\x3e\x20\x00\x00\x00\x1b'\
+b'\x2f\x00\x7f\x80\x00\x01\xff\xe0\x00\x07\xff\xf8\x00\x0f\xff\xfc'\
+b'\x00\x1f\xff\xfe\x00\x3f\xc1\xfe\x00\x3f\x00\x7f\x00\x7e\x00\x3f'\
+b'\x00\x7e\x00\x3f\x00\x7c\x00\x1f\x80\xfc\x00\x1f\x80\xfc\x00\x1f'\
+b'\x80\xfc\x00\x1f\x80\xfc\x00\x1f\x80\x00\x00\x1f\x80\x00\x00\x1f'\
+b'\x00\x00\x00\x1f\x00\x00\x00\x3f\x00\x00\x00\x3f\x00\x00\x00\x3e'\
+b'\x00\x00\x00\x7e\x00\x00\x00\xfc\x00\x00\x00\xfc\x00\x00\x01\xf8'\
+b'\x00\x00\x03\xf8\x00\x00\x03\xf0\x00\x00\x07\xe0\x00\x00\x0f\xc0'\
+b'\x00\x00\x1f\xc0\x00\x00\x1f\x80\x00\x00\x3f\x00\x00\x00\x7e\x00'\
+b'\x00\x00\xfe\x00\x00\x00\xfc\x00\x00\x01\xf8\x00\x00\x03\xf0\x00'\
+b'\x00\x07\xf0\x00\x00\x07\xe0\x00\x00\x0f\xc0\x00\x00\x1f\x80\x00'\
+b'\x00\x3f\x80\x00\x00\x3f\x00\x00\x00\x7f\xff\xff\xe0\x7f\xff\xff'\
+b'\xe0\x7f\xff\xff\xe0\x7f\xff\xff\xe0\x7f\xff\xff\xe0\x20\x00\x00'\
+b'\x00\x19\x30\x00\x7f\x00\x00\x03\xff\xc0\x00\x07\xff\xf0\x00\x0f'\
+b'\xff\xf8\x00\x1f\xff\xfc\x00\x3f\xc1\xfc\x00\x3f\x00\x7e\x00\x7e'\
+b'\x00\x7e\x00\x7e\x00\x3f\x00\x7c\x00\x3f\x00\xfc\x00\x3f\x00\xfc'\
+b'\x00\x1f\x00\xfc\x00\x1f\x00\x00\x00\x1f\x00\x00\x00\x1f\x00\x00'\
+b'\x00\x3f\x00\x00\x00\x3f\x00\x00\x00\x3e\x00\x00\x00\x7e\x00\x00'\
+b'\x00\xfc\x00\x00\x03\xfc\x00\x00\xff\xf8\x00\x00\xff\xf0\x00\x00'\
+b'\xff\xe0\x00\x00\xff\xf0\x00\x00\xff\xfc\x00\x00\x01\xfe\x00\x00'\
+b'\x00\xfe\x00\x00\x00\x7f\x00\x00\x00\x3f\x00\x00\x00\x1f\x00\x00'\
+b'\x00\x1f\x80\x00\x00\x1f\x80\x00\x00\x1f\x80\x00\x00\x1f\x80\xfc'\
+b'\x00\x1f\x80\xfc\x00\x1f\x80\xfc\x00\x1f\x80\xfc\x00\x1f\x00\x7e'\
+b'\x00\x3f\x00\x7e\x00\x3f\x00\x7f\x00\x7e\x00\x3f\xc1\xfe\x00\x1f'\
+b'\xff\xfc\x00\x0f\xff\xf8\x00\x07\xff\xf0\x00\x03\xff\xe0\x00\x00'\
+b'\xff\x00\x00\x20\x00\x00\x01\x1c\x2e\x00\x00\x7e\x00\x00\x00\xfe'\
+b'\x00\x00\x00\xfe\x00\x00\x01\xfe\x00\x00\x01\xfe\x00\x00\x03\xfe'\
+b'\x00\x00\x03\xfe\x00\x00\x07\xfe\x00\x00\x07\xfe\x00\x00\x0f\xfe'\
+b'\x00\x00\x1f\x7e\x00\x00\x1f\x7e\x00\x00\x3e\x7e\x00\x00\x3e\x7e'\
+b'\x00\x00\x7c\x7e\x00\x00\x7c\x7e\x00\x00\xf8\x7e\x00\x00\xf8\x7e'\
+b'\x00\x01\xf0\x7e\x00\x01\xf0\x7e\x00\x03\xe0\x7e\x00\x03\xe0\x7e'\
+b'\x00\x07\xc0\x7e\x00\x07\xc0\x7e\x00\x0f\x80\x7e\x00\x0f\x80\x7e'\
+b'\x00\x1f\x00\x7e\x00\x3f\x00\x7e\x00\x3e\x00\x7e\x00\x7e\x00\x7e'\
+b'\x00\x7c\x00\x7e\x00\xff\xff\xff\xf0\xff\xff\xff\xf0\xff\xff\xff'\
+b'\xf0\xff\xff\xff\xf0\xff\xff\xff\xf0\x00\x00\x7e\x00\x00\x00\x7e'\
+b'\x00\x00\x00\x7e\x00\x00\x00\x7e\x00\x00\x00\x7e\x00\x00\x00\x7e'\
+b'\x00\x00\x00\x7e\x00\x00\x00\x7e\x00\x00\x00\x7e\x00\x00\x00\x7e'\
+b'\x00\x20\x00\x00\x01\x18\x2f\x1f\xff\xfe\x1f\xff\xfe\x1f\xff\xfe'\
+b'\x1f\xff\xfe\x1f\xff\xfe\x1f\x00\x00\x3f\x00\x00\x3f\x00\x00\x3e'\
+b'\x00\x00\x3e\x00\x00\x3e\x00\x00\x3e\x00\x00\x3e\x00\x00\x3e\x00'\
+b'\x00\x3e\x00\x00\x3e\x00\x00\x3e\x3f\x00\x7f\xff\xc0\x7f\xff\xf0'\
+b'\x7f\xff\xf8\x7f\xff\xf8\x7f\x83\xfc\x7e\x00\xfe\x1c\x00\xfe\x00'\
+b'\x00\x7e\x00\x00\x3f\x00\x00\x3f\x00\x00\x3f\x00\x00\x1f\x00\x00'\
+b'\x1f\x00\x00\x1f\x00\x00\x1f\x00\x00\x1f\x00\x00\x1f\xf8\x00\x1f'\
+b'\xf8\x00\x3f\xf8\x00\x3f\xfc\x00\x3f\xfc\x00\x7e\x7e\x00\x7e\x7f'\
+b'\x00\xfe\x3f\x83\xfc\x3f\xff\xf8\x1f\xff\xf0\x0f\xff\xe0\x03\xff'\
+b'\xc0\x00\xff\x00\x20\x00\x00\x01\x19\x2f\x00\x03\xe0\x00\x00\x1f'\
+b'\xe0\x00\x00\x7f\xe0\x00\x01\xff\xe0\x00\x03\xff\xe0\x00\x07\xfe'\
+b'\x00\x00\x07\xf0\x00\x00\x0f\xe0\x00\x00\x1f\xc0\x00\x00\x1f\x80'\
+b'\x00\x00\x3f\x00\x00\x00\x3f\x00\x00\x00\x3e\x00\x00\x00\x7e\x00'\
+b'\x00\x00\x7e\x00\x00\x00\x7c\x00\x00\x00\x7c\x1f\x80\x00\x7c\xff'\
+b'\xe0\x00\x7d\xff\xf0\x00\xff\xff\xf8\x00\xff\xff\xfc\x00\xff\xc1'\
+b'\xfe\x00\xff\x80\xfe\x00\xff\x00\x7f\x00\xfe\x00\x3f\x00\xfc\x00'\
+b'\x3f\x00\xfc\x00\x1f\x00\xfc\x00\x1f\x80\xfc\x00\x1f\x80\xfc\x00'\
 b'\x1f\x80\xfc\x00\x1f\x80\xfc\x00\x1f\x80\xfc\x00\x1f\x80\xfc\x00'\
-b'\x1f\x80\xfc\x00\x1f\x80\x7c\x00\x1f\x80\x7c\x00\x1f\x80\x7e\x00'\
-b'\x3f\x80\x7e\x00\x3f\x80\x3f\x00\x7f\x80\x3f\x80\xff\x80\x3f\xc3'\
-b'\xff\x80\x1f\xff\xff\x80\x0f\xff\xdf\x00\x07\xff\x9f\x00\x03\xff'\
-b'\x1f\x00\x00\xfc\x1f\x00\x00\x00\x3f\x00\x00\x00\x3f\x00\x00\x00'\
-b'\x3e\x00\x00\x00\x3e\x00\x00\x00\x7e\x00\x00\x00\xfc\x00\x00\x00'\
-b'\xfc\x00\x00\x01\xf8\x00\x00\x07\xf8\x00\x00\x1f\xf0\x00\x03\xff'\
-b'\xe0\x00\x03\xff\xc0\x00\x03\xff\x00\x00\x03\xfc\x00\x00\x03\xe0'\
-b'\x00\x00\x00\x00\x00\x00\x25\x00\x00\x0f\xf0\x00\x00\x00\x7f\xfe'\
-b'\x00\x00\x01\xff\xff\x00\x00\x03\xff\xff\xc0\x00\x07\xff\xff\xc0'\
-b'\x00\x0f\xf8\x1f\xe0\x00\x1f\xe0\x07\xf0\x00\x1f\x80\x03\xf0\x00'\
-b'\x3f\x80\x03\xf8\x00\x3f\x00\x01\xf8\x00\x7e\x00\x01\xf8\x00\x7e'\
-b'\x00\x00\xfc\x00\x7e\x00\x00\xfc\x00\x7c\x00\x00\xfc\x00\xfc\x00'\
-b'\x00\xfc\x00\xfc\x00\x00\x00\x00\xfc\x00\x00\x00\x00\xfc\x00\x00'\
-b'\x00\x00\xfc\x00\x00\x00\x00\xfc\x00\x00\x00\x00\xfc\x00\x00\x00'\
-b'\x00\xfc\x00\x00\x00\x00\xfc\x00\x00\x00\x00\xfc\x00\x00\x00\x00'\
-b'\xfc\x00\x00\x00\x00\xfc\x00\x00\x00\x00\xfc\x00\x00\x00\x00\xfc'\
-b'\x00\x00\x00\x00\xfc\x00\x00\x00\x00\xfc\x00\x00\x00\x00\xfc\x00'\
-b'\x00\x00\x00\xfc\x00\x00\x00\x00\xfc\x00\x00\x00\x00\xfc\x00\x00'\
-b'\xfc\x00\x7c\x00\x00\xfc\x00\x7e\x00\x00\xfc\x00\x7e\x00\x00\xfc'\
-b'\x00\x7e\x00\x01\xf8\x00\x3f\x00\x01\xf8\x00\x3f\x00\x01\xf8\x00'\
-b'\x1f\x80\x03\xf0\x00\x1f\xc0\x07\xf0\x00\x0f\xf0\x1f\xe0\x00\x07'\
-b'\xff\xff\xc0\x00\x03\xff\xff\x80\x00\x01\xff\xff\x00\x00\x00\x7f'\
-b'\xfe\x00\x00\x00\x1f\xf0\x00\x00\x1f\x00\x00\x00\x00\x00\xff\xff'\
-b'\xff\x00\xff\xff\xff\x00\xff\xff\xff\x00\xff\xff\xff\x00\xff\xff'\
-b'\xff\x00\xfc\x00\x00\x00\xfc\x00\x00\x00\xfc\x00\x00\x00\xfc\x00'\
-b'\x00\x00\xfc\x00\x00\x00\xfc\x00\x00\x00\xfc\x00\x00\x00\xfc\x00'\
-b'\x00\x00\xfc\x00\x00\x00\xfc\x00\x00\x00\xfc\x00\x00\x00\xfc\x00'\
-b'\x00\x00\xfc\x00\x00\x00\xfc\x00\x00\x00\xfc\x00\x00\x00\xfc\x00'\
-b'\x00\x00\xff\xff\xf8\x00\xff\xff\xf8\x00\xff\xff\xf8\x00\xff\xff'\
-b'\xf8\x00\xff\xff\xf8\x00\xfc\x00\x00\x00\xfc\x00\x00\x00\xfc\x00'\
+b'\x1f\x80\x7c\x00\x1f\x80\x7c\x00\x1f\x80\x7e\x00\x1f\x00\x7e\x00'\
+b'\x3f\x00\x3f\x00\x3f\x00\x3f\x00\x7e\x00\x1f\x80\xfe\x00\x1f\xe1'\
+b'\xfc\x00\x0f\xff\xfc\x00\x07\xff\xf8\x00\x03\xff\xf0\x00\x01\xff'\
+b'\xc0\x00\x00\x7f\x00\x00\x20\x00\x00\x01\x1a\x2e\xff\xff\xff\xc0'\
+b'\xff\xff\xff\xc0\xff\xff\xff\xc0\xff\xff\xff\xc0\xff\xff\xff\xc0'\
+b'\x00\x00\x0f\x80\x00\x00\x0f\x80\x00\x00\x1f\x80\x00\x00\x1f\x00'\
+b'\x00\x00\x1f\x00\x00\x00\x3f\x00\x00\x00\x3e\x00\x00\x00\x7e\x00'\
+b'\x00\x00\x7c\x00\x00\x00\x7c\x00\x00\x00\xfc\x00\x00\x00\xf8\x00'\
+b'\x00\x01\xf8\x00\x00\x01\xf8\x00\x00\x01\xf0\x00\x00\x03\xf0\x00'\
+b'\x00\x03\xe0\x00\x00\x07\xe0\x00\x00\x07\xe0\x00\x00\x07\xc0\x00'\
+b'\x00\x0f\xc0\x00\x00\x0f\xc0\x00\x00\x0f\x80\x00\x00\x1f\x80\x00'\
+b'\x00\x1f\x00\x00\x00\x3f\x00\x00\x00\x3f\x00\x00\x00\x3e\x00\x00'\
+b'\x00\x7e\x00\x00\x00\x7e\x00\x00\x00\xfc\x00\x00\x00\xfc\x00\x00'\
+b'\x00\xf8\x00\x00\x01\xf8\x00\x00\x01\xf8\x00\x00\x01\xf0\x00\x00'\
+b'\x03\xf0\x00\x00\x03\xf0\x00\x00\x07\xe0\x00\x00\x07\xe0\x00\x00'\
+b'\x0f\xc0\x00\x00\x20\x00\x00\x00\x18\x30\x00\xff\x00\x03\xff\xc0'\
+b'\x07\xff\xe0\x0f\xff\xf0\x1f\xff\xf8\x3f\xc3\xfc\x3f\x00\xfc\x7f'\
+b'\x00\xfe\x7e\x00\x7e\x7e\x00\x7e\x7c\x00\x3e\x7c\x00\x3e\xfc\x00'\
+b'\x3e\xfc\x00\x3e\x7c\x00\x3e\x7c\x00\x3e\x7e\x00\x7e\x7e\x00\x7e'\
+b'\x3e\x00\xfc\x3f\x00\xfc\x1f\xc3\xf8\x0f\xff\xf0\x07\xff\xe0\x03'\
+b'\xff\xc0\x0f\xff\xe0\x1f\xff\xf8\x3f\x83\xf8\x3f\x00\xfc\x7e\x00'\
+b'\x7e\x7c\x00\x3e\xfc\x00\x3f\xfc\x00\x3f\xf8\x00\x1f\xf8\x00\x1f'\
+b'\xf8\x00\x1f\xf8\x00\x1f\xf8\x00\x1f\xf8\x00\x3f\xfc\x00\x3f\xfc'\
+b'\x00\x3f\x7e\x00\x7e\x7f\x00\xfe\x3f\x81\xfc\x3f\xff\xfc\x1f\xff'\
+b'\xf8\x0f\xff\xf0\x03\xff\xc0\x00\xff\x00\x20\x00\x00\x00\x19\x2f'\
+b'\x00\x7f\x00\x00\x01\xff\xc0\x00\x07\xff\xe0\x00\x0f\xff\xf0\x00'\
+b'\x1f\xff\xf8\x00\x1f\xc3\xfc\x00\x3f\x80\xfc\x00\x3f\x00\xfe\x00'\
+b'\x7e\x00\x7e\x00\x7e\x00\x3e\x00\x7c\x00\x3f\x00\x7c\x00\x3f\x00'\
+b'\xfc\x00\x1f\x00\xfc\x00\x1f\x00\xfc\x00\x1f\x80\xfc\x00\x1f\x80'\
+b'\xfc\x00\x1f\x80\xfc\x00\x1f\x80\xfc\x00\x1f\x80\xfc\x00\x1f\x80'\
+b'\x7c\x00\x1f\x80\x7c\x00\x1f\x80\x7e\x00\x3f\x80\x7e\x00\x3f\x80'\
+b'\x3f\x00\x7f\x80\x3f\x80\xff\x80\x3f\xc3\xff\x80\x1f\xff\xff\x80'\
+b'\x0f\xff\xdf\x00\x07\xff\x9f\x00\x03\xff\x1f\x00\x00\xfc\x1f\x00'\
+b'\x00\x00\x3f\x00\x00\x00\x3f\x00\x00\x00\x3e\x00\x00\x00\x3e\x00'\
+b'\x00\x00\x7e\x00\x00\x00\xfc\x00\x00\x00\xfc\x00\x00\x01\xf8\x00'\
+b'\x00\x07\xf8\x00\x00\x1f\xf0\x00\x03\xff\xe0\x00\x03\xff\xc0\x00'\
+b'\x03\xff\x00\x00\x03\xfc\x00\x00\x03\xe0\x00\x00\x25\x00\x00\x00'\
+b'\x1e\x30\x00\x0f\xf0\x00\x00\x7f\xfe\x00\x01\xff\xff\x00\x03\xff'\
+b'\xff\xc0\x07\xff\xff\xc0\x0f\xf8\x1f\xe0\x1f\xe0\x07\xf0\x1f\x80'\
+b'\x03\xf0\x3f\x80\x03\xf8\x3f\x00\x01\xf8\x7e\x00\x01\xf8\x7e\x00'\
+b'\x00\xfc\x7e\x00\x00\xfc\x7c\x00\x00\xfc\xfc\x00\x00\xfc\xfc\x00'\
 b'\x00\x00\xfc\x00\x00\x00\xfc\x00\x00\x00\xfc\x00\x00\x00\xfc\x00'\
 b'\x00\x00\xfc\x00\x00\x00\xfc\x00\x00\x00\xfc\x00\x00\x00\xfc\x00'\
 b'\x00\x00\xfc\x00\x00\x00\xfc\x00\x00\x00\xfc\x00\x00\x00\xfc\x00'\
 b'\x00\x00\xfc\x00\x00\x00\xfc\x00\x00\x00\xfc\x00\x00\x00\xfc\x00'\
-b'\x00\x00\xfc\x00\x00\x00\x00\x00\x00\x00\x18\x00\x07\xe0\x00\x0f'\
-b'\xf8\x00\x3f\xfc\x00\x3f\xfe\x00\x7c\x3e\x00\x78\x1f\x00\xf0\x0f'\
-b'\x00\xf0\x0f\x00\xf0\x0f\x00\xf0\x0f\x00\xf8\x1f\x00\x7c\x3e\x00'\
-b'\x7f\xfe\x00\x3f\xfc\x00\x1f\xf8\x00\x07\xe0\x00\x00\x00\x00\x00'\
-b'\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00'\
-b'\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00'\
-b'\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00'\
-b'\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00'\
-b'\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00'\
-b'\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00'
+b'\x00\x00\xfc\x00\x00\x00\xfc\x00\x00\xfc\x7c\x00\x00\xfc\x7e\x00'\
+b'\x00\xfc\x7e\x00\x00\xfc\x7e\x00\x01\xf8\x3f\x00\x01\xf8\x3f\x00'\
+b'\x01\xf8\x1f\x80\x03\xf0\x1f\xc0\x07\xf0\x0f\xf0\x1f\xe0\x07\xff'\
+b'\xff\xc0\x03\xff\xff\x80\x01\xff\xff\x00\x00\x7f\xfe\x00\x00\x1f'\
+b'\xf0\x00\x1f\x00\x00\x01\x18\x2e\xff\xff\xff\xff\xff\xff\xff\xff'\
+b'\xff\xff\xff\xff\xff\xff\xff\xfc\x00\x00\xfc\x00\x00\xfc\x00\x00'\
+b'\xfc\x00\x00\xfc\x00\x00\xfc\x00\x00\xfc\x00\x00\xfc\x00\x00\xfc'\
+b'\x00\x00\xfc\x00\x00\xfc\x00\x00\xfc\x00\x00\xfc\x00\x00\xfc\x00'\
+b'\x00\xfc\x00\x00\xfc\x00\x00\xff\xff\xf8\xff\xff\xf8\xff\xff\xf8'\
+b'\xff\xff\xf8\xff\xff\xf8\xfc\x00\x00\xfc\x00\x00\xfc\x00\x00\xfc'\
+b'\x00\x00\xfc\x00\x00\xfc\x00\x00\xfc\x00\x00\xfc\x00\x00\xfc\x00'\
+b'\x00\xfc\x00\x00\xfc\x00\x00\xfc\x00\x00\xfc\x00\x00\xfc\x00\x00'\
+b'\xfc\x00\x00\xfc\x00\x00\xfc\x00\x00\xfc\x00\x00\xfc\x00\x00\xfc'\
+b'\x00\x00\x18\x00\x00\x00\x10\x10\x07\xe0\x0f\xf8\x3f\xfc\x3f\xfe'\
+b'\x7c\x3e\x78\x1f\xf0\x0f\xf0\x0f\xf0\x0f\xf0\x0f\xf8\x1f\x7c\x3e'\
+b'\x7f\xfe\x3f\xfc\x1f\xf8\x07\xe0'
 
 _index =\
-b'\x00\x00\xc2\x00\xc2\x00\x84\x01\x84\x01\x46\x02\x46\x02\x08\x03'\
-b'\x08\x03\xca\x03\xca\x03\x8c\x04\x8c\x04\x4e\x05\x4e\x05\x10\x06'\
-b'\x10\x06\xd2\x06\xd2\x06\x94\x07\x94\x07\x56\x08\x00\x00\xc2\x00'\
-b'\x00\x00\xc2\x00\x00\x00\xc2\x00\x00\x00\xc2\x00\x00\x00\xc2\x00'\
-b'\x00\x00\xc2\x00\x00\x00\xc2\x00\x00\x00\xc2\x00\x00\x00\xc2\x00'\
-b'\x56\x08\x48\x09\x00\x00\xc2\x00\x00\x00\xc2\x00\x48\x09\x0a\x0a'\
-b'\x00\x00\xc2\x00\x00\x00\xc2\x00\x00\x00\xc2\x00\x00\x00\xc2\x00'\
-b'\x00\x00\xc2\x00\x00\x00\xc2\x00\x00\x00\xc2\x00\x00\x00\xc2\x00'\
-b'\x00\x00\xc2\x00\x00\x00\xc2\x00\x00\x00\xc2\x00\x00\x00\xc2\x00'\
-b'\x00\x00\xc2\x00\x00\x00\xc2\x00\x00\x00\xc2\x00\x00\x00\xc2\x00'\
-b'\x00\x00\xc2\x00\x00\x00\xc2\x00\x00\x00\xc2\x00\x00\x00\xc2\x00'\
-b'\x00\x00\xc2\x00\x00\x00\xc2\x00\x00\x00\xc2\x00\x00\x00\xc2\x00'\
-b'\x00\x00\xc2\x00\x00\x00\xc2\x00\x00\x00\xc2\x00\x00\x00\xc2\x00'\
-b'\x00\x00\xc2\x00\x00\x00\xc2\x00\x00\x00\xc2\x00\x00\x00\xc2\x00'\
-b'\x00\x00\xc2\x00\x00\x00\xc2\x00\x00\x00\xc2\x00\x00\x00\xc2\x00'\
-b'\x00\x00\xc2\x00\x00\x00\xc2\x00\x00\x00\xc2\x00\x00\x00\xc2\x00'\
-b'\x00\x00\xc2\x00\x00\x00\xc2\x00\x00\x00\xc2\x00\x00\x00\xc2\x00'\
-b'\x00\x00\xc2\x00\x00\x00\xc2\x00\x00\x00\xc2\x00\x00\x00\xc2\x00'\
-b'\x00\x00\xc2\x00\x00\x00\xc2\x00\x00\x00\xc2\x00\x00\x00\xc2\x00'\
-b'\x00\x00\xc2\x00\x00\x00\xc2\x00\x00\x00\xc2\x00\x00\x00\xc2\x00'\
-b'\x00\x00\xc2\x00\x00\x00\xc2\x00\x00\x00\xc2\x00\x00\x00\xc2\x00'\
-b'\x00\x00\xc2\x00\x00\x00\xc2\x00\x00\x00\xc2\x00\x00\x00\xc2\x00'\
-b'\x00\x00\xc2\x00\x00\x00\xc2\x00\x00\x00\xc2\x00\x00\x00\xc2\x00'\
-b'\x00\x00\xc2\x00\x00\x00\xc2\x00\x00\x00\xc2\x00\x00\x00\xc2\x00'\
-b'\x00\x00\xc2\x00\x00\x00\xc2\x00\x00\x00\xc2\x00\x00\x00\xc2\x00'\
-b'\x00\x00\xc2\x00\x00\x00\xc2\x00\x00\x00\xc2\x00\x00\x00\xc2\x00'\
-b'\x00\x00\xc2\x00\x00\x00\xc2\x00\x00\x00\xc2\x00\x00\x00\xc2\x00'\
-b'\x00\x00\xc2\x00\x00\x00\xc2\x00\x00\x00\xc2\x00\x00\x00\xc2\x00'\
-b'\x00\x00\xc2\x00\x00\x00\xc2\x00\x00\x00\xc2\x00\x00\x00\xc2\x00'\
-b'\x00\x00\xc2\x00\x00\x00\xc2\x00\x00\x00\xc2\x00\x00\x00\xc2\x00'\
-b'\x00\x00\xc2\x00\x00\x00\xc2\x00\x00\x00\xc2\x00\x00\x00\xc2\x00'\
-b'\x00\x00\xc2\x00\x00\x00\xc2\x00\x00\x00\xc2\x00\x00\x00\xc2\x00'\
-b'\x00\x00\xc2\x00\x0a\x0a\x9c\x0a'
+b'\x00\x00\x93\x00\x93\x00\x29\x01\x29\x01\x8b\x01\x8b\x01\x4d\x02'\
+b'\x4d\x02\x13\x03\x13\x03\xd1\x03\xd1\x03\x64\x04\x64\x04\x26\x05'\
+b'\x26\x05\xe4\x05\xe4\x05\x7a\x06\x7a\x06\x3c\x07\x00\x00\x93\x00'\
+b'\x00\x00\x93\x00\x00\x00\x93\x00\x00\x00\x93\x00\x00\x00\x93\x00'\
+b'\x00\x00\x93\x00\x00\x00\x93\x00\x00\x00\x93\x00\x00\x00\x93\x00'\
+b'\x3c\x07\x02\x08\x00\x00\x93\x00\x00\x00\x93\x00\x02\x08\x92\x08'\
+b'\x00\x00\x93\x00\x00\x00\x93\x00\x00\x00\x93\x00\x00\x00\x93\x00'\
+b'\x00\x00\x93\x00\x00\x00\x93\x00\x00\x00\x93\x00\x00\x00\x93\x00'\
+b'\x00\x00\x93\x00\x00\x00\x93\x00\x00\x00\x93\x00\x00\x00\x93\x00'\
+b'\x00\x00\x93\x00\x00\x00\x93\x00\x00\x00\x93\x00\x00\x00\x93\x00'\
+b'\x00\x00\x93\x00\x00\x00\x93\x00\x00\x00\x93\x00\x00\x00\x93\x00'\
+b'\x00\x00\x93\x00\x00\x00\x93\x00\x00\x00\x93\x00\x00\x00\x93\x00'\
+b'\x00\x00\x93\x00\x00\x00\x93\x00\x00\x00\x93\x00\x00\x00\x93\x00'\
+b'\x00\x00\x93\x00\x00\x00\x93\x00\x00\x00\x93\x00\x00\x00\x93\x00'\
+b'\x00\x00\x93\x00\x00\x00\x93\x00\x00\x00\x93\x00\x00\x00\x93\x00'\
+b'\x00\x00\x93\x00\x00\x00\x93\x00\x00\x00\x93\x00\x00\x00\x93\x00'\
+b'\x00\x00\x93\x00\x00\x00\x93\x00\x00\x00\x93\x00\x00\x00\x93\x00'\
+b'\x00\x00\x93\x00\x00\x00\x93\x00\x00\x00\x93\x00\x00\x00\x93\x00'\
+b'\x00\x00\x93\x00\x00\x00\x93\x00\x00\x00\x93\x00\x00\x00\x93\x00'\
+b'\x00\x00\x93\x00\x00\x00\x93\x00\x00\x00\x93\x00\x00\x00\x93\x00'\
+b'\x00\x00\x93\x00\x00\x00\x93\x00\x00\x00\x93\x00\x00\x00\x93\x00'\
+b'\x00\x00\x93\x00\x00\x00\x93\x00\x00\x00\x93\x00\x00\x00\x93\x00'\
+b'\x00\x00\x93\x00\x00\x00\x93\x00\x00\x00\x93\x00\x00\x00\x93\x00'\
+b'\x00\x00\x93\x00\x00\x00\x93\x00\x00\x00\x93\x00\x00\x00\x93\x00'\
+b'\x00\x00\x93\x00\x00\x00\x93\x00\x00\x00\x93\x00\x00\x00\x93\x00'\
+b'\x00\x00\x93\x00\x00\x00\x93\x00\x00\x00\x93\x00\x00\x00\x93\x00'\
+b'\x00\x00\x93\x00\x00\x00\x93\x00\x00\x00\x93\x00\x00\x00\x93\x00'\
+b'\x00\x00\x93\x00\x00\x00\x93\x00\x00\x00\x93\x00\x00\x00\x93\x00'\
+b'\x00\x00\x93\x00\x00\x00\x93\x00\x00\x00\x93\x00\x00\x00\x93\x00'\
+b'\x00\x00\x93\x00\x00\x00\x93\x00\x00\x00\x93\x00\x00\x00\x93\x00'\
+b'\x00\x00\x93\x00\x00\x00\x93\x00\x00\x00\x93\x00\x00\x00\x93\x00'\
+b'\x00\x00\x93\x00\x00\x00\x93\x00\x00\x00\x93\x00\x00\x00\x93\x00'\
+b'\x00\x00\x93\x00\x92\x08\xb8\x08'
+
+_widths =\
+b'\x1b\x20\x20\x20\x20\x20\x20\x20\x20\x20\x20\x1b\x1b\x1b\x1b\x1b'\
+b'\x1b\x1b\x1b\x1b\x25\x1b\x1b\x1f\x1b\x1b\x1b\x1b\x1b\x1b\x1b\x1b'\
+b'\x1b\x1b\x1b\x1b\x1b\x1b\x1b\x1b\x1b\x1b\x1b\x1b\x1b\x1b\x1b\x1b'\
+b'\x1b\x1b\x1b\x1b\x1b\x1b\x1b\x1b\x1b\x1b\x1b\x1b\x1b\x1b\x1b\x1b'\
+b'\x1b\x1b\x1b\x1b\x1b\x1b\x1b\x1b\x1b\x1b\x1b\x1b\x1b\x1b\x1b\x1b'\
+b'\x1b\x1b\x1b\x1b\x1b\x1b\x1b\x1b\x1b\x1b\x1b\x1b\x1b\x1b\x1b\x1b'\
+b'\x1b\x1b\x1b\x1b\x1b\x1b\x1b\x1b\x1b\x1b\x1b\x1b\x1b\x1b\x1b\x1b'\
+b'\x1b\x1b\x1b\x1b\x1b\x1b\x1b\x1b\x1b\x1b\x1b\x1b\x1b\x1b\x1b\x1b'\
+b'\x1b\x18'
 
 _mvfont = memoryview(_font)
 
-def get_ch(ch):
+def get_cropped(ch):
     ordch = ord(ch)
     ordch = ordch + 1 if ordch >= 48 and ordch <= 176 else 63
     idx_offs = 4 * (ordch - 48)
     offset = int.from_bytes(_index[idx_offs : idx_offs + 2], 'little')
     next_offs = int.from_bytes(_index[idx_offs + 2 : idx_offs + 4], 'little')
     width = int.from_bytes(_font[offset:offset + 2], 'little')
-    return _mvfont[offset + 2:next_offs], 48, width
- 
+    left, top, crop_width, crop_height = _font[offset + 2:offset + 6]
+    return _mvfont[offset + 6:next_offs], left, top, crop_width, crop_height, width
+
+def _bit(x):
+    return 0x80 >> (x & 7)
+
+def get_ch(ch):
+    glyph, left, top, crop_width, crop_height, width = get_cropped(ch)
+    stride = (width + 7) // 8
+    crop_stride = (crop_width + 7) // 8
+    buf = bytearray(stride * 48)
+    for y in range(crop_height):
+        row = (top + y) * stride
+        for x in range(crop_width):
+            if glyph[y * crop_stride + (x >> 3)] & _bit(x):
+                buf[row + ((left + x) >> 3)] |= _bit(left + x)
+    return memoryview(buf), 48, width
+
+def char_width(ch):
+    ordch = ord(ch)
+    ordch = ordch + 1 if ordch >= 48 and ordch <= 176 else 63
+    return _widths[ordch - 48]
+
@@ -12,7 +12,7 @@ CONTROL_WIDTH = const(_WIDTH - MENU_WIDTH)
 WIFI_SSID = "yourWiFiSSID"
 WIFI_PASSWORD = "yourWiFiPassword"
 
-URL_GET_TEMP = "http://api.example.com/current_temp"
-URL_GET_SETPOINT = "http://api.example.com/temp_setpoint"
+URL_STATE = "http://api.example.com/api/controller_state?sensor=office"
+URL_SETPOINT = "http://api.example.com/temp_setpoint"
 
 TEMP_UNITS = "F"
@@ -80,6 +80,17 @@ b'\x00\x00\x0d\x00\x00\x00\x0d\x00\x00\x00\x0d\x00\x00\x00\x0d\x00'\
 b'\x00\x00\x0d\x00\x00\x00\x0d\x00\x00\x00\x0d\x00\x00\x00\x0d\x00'\
 b'\x00\x01\x0d\x01'
 
+_widths =\
+b'\x07\x0b\x07\x07\x07\x07\x07\x07\x07\x07\x07\x07\x08\x08\x08\x08'\
+b'\x08\x08\x08\x08\x08\x08\x07\x07\x07\x07\x07\x07\x07\x07\x07\x07'\
+b'\x07\x08\x08\x07\x09\x07\x07\x07\x07\x07\x07\x07\x07\x07\x08\x08'\
+b'\x07\x07\x07\x07\x07\x07\x07\x07\x07\x07\x07\x07\x07\x07\x07\x07'\
+b'\x07\x07\x07\x07\x07\x07\x07\x07\x07\x07\x07\x07\x07\x07\x07\x07'\
+b'\x07\x07\x07\x07\x07\x07\x07\x07\x07\x07\x07\x07\x07\x07\x07\x07'\
+b'\x07\x07\x07\x07\x07\x07\x07\x07\x07\x07\x07\x07\x07\x07\x07\x07'\
+b'\x07\x07\x07\x07\x07\x07\x07\x07\x07\x07\x07\x07\x07\x07\x07\x07'\
+b'\x07\x07\x07\x07\x07\x07\x07\x07\x07\x07\x07\x07\x07'
+
 _mvfont = memoryview(_font)
 
 def get_ch(ch):
@@ -91,3 +102,8 @@ def get_ch(ch):
     width = int.from_bytes(_font[offset:offset + 2], 'little')
     return _mvfont[offset + 2:next_offs], 11, width
  
+def char_width(ch):
+    ordch = ord(ch)
+    ordch = ordch + 1 if ordch >= 37 and ordch <= 176 else 63
+    return _widths[ordch - 37]
+
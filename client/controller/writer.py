@@ -31,10 +31,67 @@
 # A Writer supports rendering text to a Display instance in a given font.
 # Multiple Writer instances may be created, each rendering a font to the
 # same Display object.
+#
+# Each Writer keeps bounded least-recently-used caches of glyph FrameBuffers,
+# character widths, string widths and whole rendered strings, so redrawing
+# the same text doesn't copy glyphs and allocate FrameBuffers on every call.
+# Pass cache sizes of 0 to turn any of them off.
+#
+# Fonts written by font_to_py.py --crop store each glyph cropped to its
+# bounding box. Those are drawn by clearing the character cell and blitting
+# just the cropped pixels into place, so the blank margins are never built.
 
 import framebuf
 
 
+class Glyph(framebuf.FrameBuffer):
+    # A FrameBuffer that knows its size, so a display wrapper tracking what
+    # changed (partial_display.PartialDisplay) can tell what a blit covers.
+    # A cropped glyph also knows where it sits in its character cell.
+    def __init__(self, buf, width, height, mode, left=0, top=0, cell=None):
+        super().__init__(buf, width, height, mode)
+        self.width = width
+        self.height = height
+        self.left = left
+        self.top = top
+        self.cell_width, self.cell_height = cell or (width, height)
+        self.cropped = cell is not None
+
+
+class LRUCache:
+    # MicroPython dicts don't keep insertion order, so recency is a counter
+    # per entry and eviction scans for the oldest. Cheap at these sizes.
+    def __init__(self, size):
+        self.size = size
+        self._entries = {}
+        self._clock = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        self._clock += 1
+        entry[1] = self._clock
+        return entry[0]
+
+    def put(self, key, value):
+        if self.size <= 0:
+            return value
+        entries = self._entries
+        if key not in entries and len(entries) >= self.size:
+            oldest = min(entries, key=lambda k: entries[k][1])
+            del entries[oldest]
+        self._clock += 1
+        entries[key] = [value, self._clock]
+        return value
+
+    def clear(self):
+        self._entries = {}
+
+
 class Writer:
     text_row = 0  # attributes common to all Writer instances
     text_col = 0
@@ -51,7 +108,15 @@ class Writer:
         cls.row_clip = row_clip
         cls.col_clip = col_clip
 
-    def __init__(self, device, font, verbose=True):
+    def __init__(
+        self,
+        device,
+        font,
+        verbose=True,
+        glyph_cache=24,
+        width_cache=64,
+        string_cache=8,
+    ):
         self.device = device
         self.font = font
         # Allow to work with any font mapping
@@ -67,6 +132,13 @@ class Writer:
             )
         self.screenwidth = device.width  # In pixels
         self.screenheight = device.height
+        # Fonts made by newer font_to_py.py have a width table, which answers
+        # without decoding the glyph.
+        self.char_width = getattr(font, "char_width", None)
+        self.get_cropped = getattr(font, "get_cropped", None)
+        self.glyphs = LRUCache(glyph_cache)  # char -> Glyph
+        self.widths = LRUCache(width_cache)  # char -> width, string -> width
+        self.strings = LRUCache(string_cache)  # string -> Glyph of all of it
 
     def _newline(self):
         height = self.font.height()
@@ -79,42 +151,110 @@ class Writer:
                 Writer.text_row += margin
 
     def printstring(self, string):
+        # A string that fits on the line is one blit of a cached rendering,
+        # which draws exactly what blitting its characters one by one would.
+        rendered = self._render(string)
+        if (
+            rendered is not None
+            and Writer.text_col + rendered.width <= self.screenwidth
+            and Writer.text_row + rendered.height <= self.screenheight
+        ):
+            self.device.blit(rendered, Writer.text_col, Writer.text_row)
+            Writer.text_col += rendered.width
+            return
         for char in string:
             self._printchar(char)
 
+    def _render(self, string):
+        if self.strings.size <= 0 or not string or "\n" in string:
+            return None
+        rendered = self.strings.get(string)
+        if rendered is None:
+            width = self.stringlen(string)
+            height = self.font.height()
+            # horizontally mapped rows are padded out to whole bytes
+            buf = bytearray(((width + 7) >> 3) * height)
+            rendered = Glyph(buf, width, height, self.map)
+            col = 0
+            # the buffer starts blank, so cropped glyphs need no clearing
+            for char in string:
+                glyph = self._glyph(char)
+                rendered.blit(glyph, col + glyph.left, glyph.top)
+                col += glyph.cell_width
+            self.strings.put(string, rendered)
+        return rendered
+
+    def _glyph(self, char, invert=False):
+        key = ("~", char) if invert else char
+        glyph = self.glyphs.get(key)
+        if glyph is None:
+            if self.get_cropped is not None:
+                data, left, top, width, height, char_width = self.get_cropped(char)
+                cell = (char_width, self.font.height())
+            else:
+                data, height, width = self.font.get_ch(char)
+                left = top = 0
+                cell = None
+            buf = bytearray(data)
+            if invert:
+                for i, v in enumerate(buf):
+                    buf[i] = 0xFF & ~v
+            glyph = Glyph(buf, width, height, self.map, left, top, cell)
+            self.glyphs.put(key, glyph)
+            self.widths.put(char, glyph.cell_width)
+        return glyph
+
     # Method using blitting. Efficient rendering for monochrome displays.
     # Tested on SSD1306. Invert is for black-on-white rendering.
     def _printchar(self, char, invert=False):
         if char == "\n":
             self._newline()
             return
-        glyph, char_height, char_width = self.font.get_ch(char)
-        if Writer.text_row + char_height > self.screenheight:
+        glyph = self._glyph(char, invert)
+        if Writer.text_row + glyph.cell_height > self.screenheight:
             if Writer.row_clip:
                 return
             self._newline()
-        if Writer.text_col + char_width > self.screenwidth:
+        if Writer.text_col + glyph.cell_width > self.screenwidth:
             if Writer.col_clip:
                 return
             else:
                 self._newline()
-        buf = bytearray(glyph)
-        if invert:
-            for i, v in enumerate(buf):
-                buf[i] = 0xFF & ~v
-        fbc = framebuf.FrameBuffer(buf, char_width, char_height, self.map)
-        self.device.blit(fbc, Writer.text_col, Writer.text_row)
-        Writer.text_col += char_width
+        if glyph.cropped:
+            # a whole glyph would paint its blank margins too
+            self.device.fill_rect(
+                Writer.text_col,
+                Writer.text_row,
+                glyph.cell_width,
+                glyph.cell_height,
+                1 if invert else 0,
+            )
+        self.device.blit(
+            glyph, Writer.text_col + glyph.left, Writer.text_row + glyph.top
+        )
+        Writer.text_col += glyph.cell_width
 
     def stringlen(self, string):
-        l = 0
-        for char in string:
-            l += self._charlen(char)
+        # Strings share the width cache with characters, which can't clash
+        # since a one character string is as wide as the character.
+        l = self.widths.get(string)
+        if l is None:
+            l = 0
+            for char in string:
+                l += self._charlen(char)
+            self.widths.put(string, l)
         return l
 
     def _charlen(self, char):
         if char == "\n":
-            char_width = 0
-        else:
-            _, _, char_width = self.font.get_ch(char)
+            return 0
+        if self.char_width is not None:
+            return self.char_width(char)
+        char_width = self.widths.get(char)
+        if char_width is None:
+            if self.get_cropped is not None:
+                char_width = self.get_cropped(char)[5]
+            else:
+                _, _, char_width = self.font.get_ch(char)
+            self.widths.put(char, char_width)
         return char_width
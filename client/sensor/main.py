@@ -7,6 +7,9 @@ import urequests
 import ssd1306
 import sys
 import time
+import socket
+import packet
+import rtc_buffer
 
 
 def get_temperature_and_humidity():
@@ -57,7 +60,96 @@ def connect_wifi():
     print("Network config:", sta_if.ifconfig())
 
 
+def upload_packed(readings):
+    """
+    send (age, temperature, humidity) readings in the compact binary format,
+    which needs far less heap to build than the JSON body
+    """
+    body = packet.encode(config.SENSOR_ID, config.SENSOR_NAME, readings)
+    response = urequests.post(
+        config.BINARY_WEBHOOK_URL,
+        data=body,
+        headers={"Content-Type": packet.CONTENT_TYPE},
+    )
+    if response.status_code < 400:
+        print("Successful upload of {} readings".format(len(readings)))
+        response.close()
+    else:
+        print("Failed binary upload:", response.text)
+        response.close()
+        raise RuntimeError("Failed binary upload")
+
+
+def use_udp():
+    return getattr(config, "UPLOAD_TRANSPORT", "http") == "udp"
+
+
+BOOT_COUNT_FILE = "boot_count"
+
+
+def new_sequence():
+    """
+    the first UDP sequence number after a cold boot. the server only accepts
+    numbers above the ones it has seen, so the top 16 bits are a boot counter
+    kept in flash and the bottom 16 count datagrams sent since
+    """
+    try:
+        with open(BOOT_COUNT_FILE) as boot_file:
+            boots = int(boot_file.read())
+    except (OSError, ValueError):
+        boots = 0
+    boots += 1
+    with open(BOOT_COUNT_FILE, "w") as boot_file:
+        boot_file.write(str(boots))
+    return (boots & 0xFFFF) << 16
+
+
+def next_sequence(sequence):
+    # running out of the bottom 16 bits counts as a boot, so the flash
+    # counter stays ahead of every number already sent
+    sequence += 1
+    if sequence & 0xFFFF == 0:
+        sequence = new_sequence()
+    return sequence
+
+
+def upload_udp(readings, sequence):
+    """
+    send (age, temperature, humidity) readings in one signed datagram, with
+    no connection setup and no response to wait for
+    """
+    body = packet.sign(
+        sequence,
+        packet.encode(config.SENSOR_ID, config.SENSOR_NAME, readings),
+        config.UDP_SECRET.encode(),
+    )
+    address = socket.getaddrinfo(config.UDP_HOST, config.UDP_PORT)[0][-1]
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    try:
+        sock.sendto(body, address)
+    finally:
+        sock.close()
+    print("Sent {} readings as datagram {}".format(len(readings), sequence))
+
+
+def send_udp(temperature, humidity):
+    """upload one reading over UDP, keeping the sequence number in RTC memory"""
+    rtc = machine.RTC()
+    sequence = None
+    if machine.reset_cause() == machine.DEEPSLEEP_RESET:
+        _, _, sequence = rtc_buffer.unpack(rtc.memory())
+    if sequence is None:
+        sequence = new_sequence()
+    # count the number as used even if sending fails
+    rtc.memory(rtc_buffer.pack(0, [], next_sequence(sequence)))
+    upload_udp([(0, temperature, humidity)], sequence)
+
+
 def upload_data(temperature, humidity):
+    if getattr(config, "UPLOAD_FORMAT", "json") == "binary":
+        upload_packed([(0, temperature, humidity)])
+        return
+
     url = config.WEBHOOK_URL
     payload = {
         "sensor_name": config.SENSOR_NAME,
@@ -76,6 +168,81 @@ def upload_data(temperature, humidity):
         raise RuntimeError("Failed update")
 
 
+def upload_batch(samples):
+    now = time.time()
+    if getattr(config, "UPLOAD_FORMAT", "json") == "binary":
+        upload_packed(
+            [
+                (now - taken, temperature, humidity)
+                for taken, temperature, humidity in samples
+            ]
+        )
+        return
+
+    url = config.BULK_WEBHOOK_URL
+    payload = {
+        "sensor_name": config.SENSOR_NAME,
+        "sensor_id": config.SENSOR_ID,
+        "readings": [
+            {
+                "age": max(0, now - taken),
+                "temperature": temperature,
+                "humidity": humidity,
+            }
+            for taken, temperature, humidity in samples
+        ],
+    }
+
+    response = urequests.post(url, json=payload)
+    if response.status_code < 400:
+        print("Successful upload of {} samples".format(len(samples)))
+        response.close()
+    else:
+        print("Failed batch upload:", response.text)
+        response.close()
+        raise RuntimeError("Failed batch upload")
+
+
+def buffer_and_upload(temperature, humidity):
+    """
+    keep the sample in RTC memory across deep sleep, and only bring Wi-Fi up
+    to upload the whole buffer every `config.UPLOAD_EVERY` wakes
+    """
+    rtc = machine.RTC()
+    sequence = None
+    if machine.reset_cause() == machine.DEEPSLEEP_RESET:
+        wakes, samples, sequence = rtc_buffer.unpack(rtc.memory())
+    else:
+        # the clock restarted, so buffered sample times are meaningless
+        wakes, samples = 0, []
+    if sequence is None:
+        sequence = new_sequence()
+
+    max_samples = rtc_buffer.capacity()
+    rtc_buffer.add_sample(samples, (time.time(), temperature, humidity), max_samples)
+    wakes += 1
+    # save before trying the network so a failed upload loses nothing
+    rtc.memory(rtc_buffer.pack(wakes, samples, sequence))
+
+    if not rtc_buffer.upload_due(wakes, len(samples), config.UPLOAD_EVERY, max_samples):
+        print("Buffered sample {} of {}".format(wakes, config.UPLOAD_EVERY))
+        return
+
+    connect_wifi()
+    if use_udp():
+        now = time.time()
+        upload_udp(
+            [
+                (now - taken, temperature, humidity)
+                for taken, temperature, humidity in samples
+            ],
+            sequence,
+        )
+    else:
+        upload_batch(samples)
+    rtc.memory(rtc_buffer.pack(0, [], next_sequence(sequence)))
+
+
 def is_debug():
     debug = machine.Pin(config.DEBUG_PIN, machine.Pin.IN, machine.Pin.PULL_UP)
     if debug.value() == 0:
@@ -111,11 +278,17 @@ def run():
             print("woke from deep sleep")
         else:
             print("power on or hard reset")
-        connect_wifi()
         temperature, humidity = get_temperature_and_humidity()
         if is_debug():
             display_temperature_and_humidity(temperature, humidity)
-        upload_data(temperature, humidity)
+        if getattr(config, "UPLOAD_EVERY", 1) > 1:
+            buffer_and_upload(temperature, humidity)
+        else:
+            connect_wifi()
+            if use_udp():
+                send_udp(temperature, humidity)
+            else:
+                upload_data(temperature, humidity)
     except Exception as exc:
         sys.print_exception(exc)
         show_error()
@@ -0,0 +1,78 @@
+# Compact binary upload payload, an alternative to the JSON bodies for
+# /sensor/add_binary. Decoded on the server by server/app/packet.py.
+#
+# Layout (little endian), version 1:
+#   header:  version (B), length of sensor name (B), sensor id (H)
+#   name:    sensor name, utf-8
+#   reading: seconds since taken (I), temperature * 10 (h), humidity * 10 (H)
+#            repeated once per reading
+#
+# The sensor's clock isn't synced, so readings carry their age when sent
+# rather than a timestamp. A missing measurement is stored as NO_VALUE.
+#
+# Sent over UDP, a payload is wrapped in a datagram:
+#   sequence number (I), payload, HMAC-SHA256 of both (first MAC_SIZE bytes)
+
+try:
+    import ustruct as struct
+except ImportError:
+    import struct
+
+try:
+    import uhashlib as hashlib
+except ImportError:
+    import hashlib
+
+VERSION = 1
+HEADER = "<BBH"
+READING = "<IhH"
+HEADER_SIZE = struct.calcsize(HEADER)
+READING_SIZE = struct.calcsize(READING)
+NO_VALUE = -32768
+CONTENT_TYPE = "application/octet-stream"
+SEQUENCE = "<I"
+MAC_SIZE = 16
+
+
+def _scale(value, unsigned=False):
+    if value is None:
+        return 0xFFFF if unsigned else NO_VALUE
+    return int(round(value * 10))
+
+
+def encode(sensor_id, sensor_name, readings):
+    """encode a list of (age, temperature, humidity) for one sensor"""
+    name = sensor_name.encode()
+    offset = HEADER_SIZE + len(name)
+    buf = bytearray(offset + READING_SIZE * len(readings))
+    struct.pack_into(HEADER, buf, 0, VERSION, len(name), sensor_id)
+    buf[HEADER_SIZE:offset] = name
+    for age, temperature, humidity in readings:
+        struct.pack_into(
+            READING,
+            buf,
+            offset,
+            max(0, int(age)),
+            _scale(temperature),
+            _scale(humidity, unsigned=True),
+        )
+        offset += READING_SIZE
+    return bytes(buf)
+
+
+def hmac_sha256(key, message):
+    # MicroPython has no hmac module, this is RFC 2104 over uhashlib
+    if len(key) > 64:
+        key = hashlib.sha256(key).digest()
+    key = key + b"\x00" * (64 - len(key))
+    inner = hashlib.sha256(bytes(byte ^ 0x36 for byte in key))
+    inner.update(message)
+    outer = hashlib.sha256(bytes(byte ^ 0x5C for byte in key))
+    outer.update(inner.digest())
+    return outer.digest()
+
+
+def sign(sequence, payload, key):
+    """a UDP datagram carrying `payload`, numbered and authenticated"""
+    message = struct.pack(SEQUENCE, sequence & 0xFFFFFFFF) + payload
+    return message + hmac_sha256(key, message)[:MAC_SIZE]
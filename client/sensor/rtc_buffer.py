@@ -0,0 +1,98 @@
+# Packs DHT22 samples into RTC user memory so they survive deep sleep.
+#
+# Layout (little endian):
+#   header: magic (B), wakes since last upload (B), sample count (H),
+#           sequence number of the next UDP upload (I)
+#   sample: time.time() when taken (I), temperature * 10 (h), humidity * 10 (H)
+#
+# A missing measurement is stored as NO_VALUE.
+
+try:
+    import ustruct as struct
+except ImportError:
+    import struct
+
+MAGIC = 0xB6
+HEADER = "<BBHI"
+SAMPLE = "<IhH"
+HEADER_SIZE = struct.calcsize(HEADER)
+SAMPLE_SIZE = struct.calcsize(SAMPLE)
+NO_VALUE = -32768
+# ESP8266 RTC user memory size in bytes
+RTC_MEMORY_SIZE = 492
+
+
+def capacity(memory_size=RTC_MEMORY_SIZE):
+    return (memory_size - HEADER_SIZE) // SAMPLE_SIZE
+
+
+def _scale(value, unsigned=False):
+    if value is None:
+        return 0xFFFF if unsigned else NO_VALUE
+    return int(round(value * 10))
+
+
+def _unscale(value, unsigned=False):
+    if value == (0xFFFF if unsigned else NO_VALUE):
+        return None
+    return value / 10
+
+
+def pack(wakes, samples, sequence=0):
+    """
+    encode the wake counter, a list of (time, temperature, humidity) and the
+    UDP sequence number
+    """
+    buf = bytearray(HEADER_SIZE + SAMPLE_SIZE * len(samples))
+    struct.pack_into(
+        HEADER, buf, 0, MAGIC, min(wakes, 255), len(samples), sequence & 0xFFFFFFFF
+    )
+    offset = HEADER_SIZE
+    for taken, temperature, humidity in samples:
+        struct.pack_into(
+            SAMPLE,
+            buf,
+            offset,
+            taken,
+            _scale(temperature),
+            _scale(humidity, unsigned=True),
+        )
+        offset += SAMPLE_SIZE
+    return bytes(buf)
+
+
+def unpack(data):
+    """
+    decode what `pack` wrote. anything else (e.g. the random contents of RTC
+    memory after power on) decodes as no wakes, no samples and no sequence
+    number (None)
+    """
+    if len(data) < HEADER_SIZE:
+        return 0, [], None
+    magic, wakes, count, sequence = struct.unpack_from(HEADER, data, 0)
+    if magic != MAGIC or len(data) < HEADER_SIZE + count * SAMPLE_SIZE:
+        return 0, [], None
+
+    samples = []
+    offset = HEADER_SIZE
+    for _ in range(count):
+        taken, temperature, humidity = struct.unpack_from(SAMPLE, data, offset)
+        samples.append(
+            (taken, _unscale(temperature), _unscale(humidity, unsigned=True))
+        )
+        offset += SAMPLE_SIZE
+    return wakes, samples, sequence
+
+
+def add_sample(samples, sample, max_samples):
+    """append a sample, dropping the oldest ones if the buffer is full"""
+    samples.append(sample)
+    while len(samples) > max_samples:
+        samples.pop(0)
+    return samples
+
+
+def upload_due(wakes, sample_count, upload_every, max_samples):
+    """whether to bring Wi-Fi up this wake and send everything buffered"""
+    # leave a free slot so a failed upload doesn't immediately lose a sample
+    return wakes >= upload_every or sample_count >= max_samples - 1
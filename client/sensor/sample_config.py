@@ -2,6 +2,8 @@
 WIFI_SSID = "your SSID"
 WIFI_PASSWORD = "your Wi-Fi password"
 WEBHOOK_URL = "http://example.com/api/update_temperature"
+BULK_WEBHOOK_URL = "http://example.com/sensor/add_readings"
+BINARY_WEBHOOK_URL = "http://example.com/sensor/add_binary"
 
 DHT_PIN = 4  # D2
 LED_PIN = 2  # D4
@@ -10,5 +12,19 @@ DISPLAY_SCL_PIN = 0  # D3
 DISPLAY_SDA_PIN = 12  # D6
 
 LOG_INTERVAL = 60
+# keep samples in RTC memory and only connect to Wi-Fi every N wakes.
+# 1 uploads every sample as soon as it's taken
+UPLOAD_EVERY = 1
+# "json", or "binary" for the compact payload posted to BINARY_WEBHOOK_URL
+UPLOAD_FORMAT = "json"
+# "http", or "udp" to send signed datagrams to the server's UDP listener
+# (flask listen-udp) without waiting for a reply. UDP_SECRET must match the
+# server's
+UPLOAD_TRANSPORT = "http"
+UDP_HOST = "example.com"
+UDP_PORT = 5005
+UDP_SECRET = "change me"
 
 SENSOR_NAME = "sensor1"
+# a number 0-65535, unique to this sensor
+SENSOR_ID = 1
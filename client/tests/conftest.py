@@ -0,0 +1,234 @@
+# Host-side stand-ins for the MicroPython modules the sensor firmware uses,
+# so client/sensor/main.py can be run on a PC:
+#
+#     cd client && python -m pytest -q tests
+#
+# A Board holds what survives between wakes on the real thing (RTC memory,
+# the files in flash, the clock) and records what the firmware did with the
+# network. board.wake() runs main.py from the top, the way the ESP8266 does
+# every time it comes out of deep sleep.
+#
+# The controller's display code is tested against fake_ssd1306, installed as
+# framebuf by the framebuf fixture.
+
+import os
+import runpy
+import sys
+import types
+
+import pytest
+
+import fake_ssd1306
+
+SENSOR_DIR = os.path.join(os.path.dirname(__file__), os.pardir, "sensor")
+CONTROLLER_DIR = os.path.join(os.path.dirname(__file__), os.pardir, "controller")
+MAIN = os.path.join(SENSOR_DIR, "main.py")
+
+PWRON_RESET = 0
+DEEPSLEEP_RESET = 5
+
+sys.path.insert(0, SENSOR_DIR)
+# after the sensor, whose main.py the Board runs
+sys.path.append(CONTROLLER_DIR)
+
+
+class Response:
+    def __init__(self, status_code):
+        self.status_code = status_code
+        self.text = "status {}".format(status_code)
+
+    def close(self):
+        pass
+
+
+class Board:
+    def __init__(self, monkeypatch, **settings):
+        self.monkeypatch = monkeypatch
+        self.rtc_memory = b""
+        self.reset_cause = PWRON_RESET
+        self.clock = 1000000
+        self.measurements = []
+        self.status_code = 200
+        self.posts = []
+        self.datagrams = []
+        self.deepsleeps = 0
+        # exceptions main.run() caught and printed
+        self.errors = []
+        self.config = dict(
+            WIFI_SSID="ssid",
+            WIFI_PASSWORD="password",
+            WEBHOOK_URL="http://server/api/update_temperature",
+            BULK_WEBHOOK_URL="http://server/sensor/add_readings",
+            BINARY_WEBHOOK_URL="http://server/sensor/add_binary",
+            DHT_PIN=4,
+            LED_PIN=2,
+            DEBUG_PIN=14,
+            DISPLAY_SCL_PIN=0,
+            DISPLAY_SDA_PIN=12,
+            LOG_INTERVAL=60,
+            UPLOAD_EVERY=1,
+            UPLOAD_FORMAT="json",
+            UPLOAD_TRANSPORT="http",
+            UDP_HOST="server",
+            UDP_PORT=5005,
+            UDP_SECRET="secret",
+            SENSOR_NAME="porch",
+            SENSOR_ID=7,
+        )
+        self.config.update(settings)
+
+    def wake(self, temperature=20.5, humidity=45.0, deep_sleep=True):
+        """
+        run main.py once, taking one measurement. `deep_sleep` False is a
+        power on instead of a wake from deep sleep
+        """
+        self.reset_cause = DEEPSLEEP_RESET if deep_sleep else PWRON_RESET
+        self.measurements.append((temperature, humidity))
+        for name, module in self._modules().items():
+            self.monkeypatch.setitem(sys.modules, name, module)
+        self.monkeypatch.setattr(
+            sys, "print_exception", self.errors.append, raising=False
+        )
+        runpy.run_path(MAIN, run_name="main")
+        self.clock += self.config["LOG_INTERVAL"]
+
+    def _modules(self):
+        board = self
+
+        machine = types.ModuleType("machine")
+        machine.DEEPSLEEP = 4
+        machine.DEEPSLEEP_RESET = DEEPSLEEP_RESET
+
+        class RTC:
+            ALARM0 = 0
+
+            def memory(self, data=None):
+                if data is None:
+                    return board.rtc_memory
+                board.rtc_memory = bytes(data)
+
+            def irq(self, trigger, wake):
+                pass
+
+            def alarm(self, alarm, milliseconds):
+                pass
+
+        class Pin:
+            IN = 0
+            OUT = 1
+            PULL_UP = 1
+
+            def __init__(self, number, mode=None, pull=None):
+                pass
+
+            def value(self):
+                # the debug pin is pulled up, i.e. not in debug mode
+                return 1
+
+            def on(self):
+                pass
+
+            def off(self):
+                pass
+
+        def deepsleep():
+            board.deepsleeps += 1
+
+        machine.RTC = RTC
+        machine.Pin = Pin
+        machine.reset_cause = lambda: board.reset_cause
+        machine.deepsleep = deepsleep
+
+        dht = types.ModuleType("dht")
+
+        class DHT22:
+            def __init__(self, pin):
+                pass
+
+            def measure(self):
+                pass
+
+            def temperature(self):
+                return board.measurements[-1][0]
+
+            def humidity(self):
+                return board.measurements[-1][1]
+
+        dht.DHT22 = DHT22
+
+        network = types.ModuleType("network")
+        network.AP_IF = 1
+        network.STA_IF = 0
+
+        class WLAN:
+            def __init__(self, interface):
+                pass
+
+            def active(self, active=None):
+                pass
+
+            def isconnected(self):
+                return True
+
+            def ifconfig(self):
+                return ("10.0.0.2", "255.255.255.0", "10.0.0.1", "10.0.0.1")
+
+        network.WLAN = WLAN
+
+        urequests = types.ModuleType("urequests")
+
+        def post(url, json=None, data=None, headers=None):
+            board.posts.append((url, json if json is not None else data))
+            return Response(board.status_code)
+
+        urequests.post = post
+
+        socket = types.ModuleType("socket")
+        socket.AF_INET = 2
+        socket.SOCK_DGRAM = 2
+
+        class Socket:
+            def __init__(self, family, kind):
+                pass
+
+            def sendto(self, data, address):
+                board.datagrams.append(bytes(data))
+
+            def close(self):
+                pass
+
+        socket.socket = Socket
+        socket.getaddrinfo = lambda host, port: [(2, 2, 0, "", (host, port))]
+
+        time = types.ModuleType("time")
+        # MicroPython's time.time() is whole seconds
+        time.time = lambda: board.clock
+        time.sleep = lambda seconds: None
+
+        config = types.ModuleType("config")
+        config.__dict__.update(board.config)
+
+        return {
+            "machine": machine,
+            "dht": dht,
+            "network": network,
+            "urequests": urequests,
+            "ssd1306": types.ModuleType("ssd1306"),
+            "socket": socket,
+            "time": time,
+            "config": config,
+        }
+
+
+@pytest.fixture
+def make_board(monkeypatch, tmp_path):
+    """Board(**config settings), with flash in a temporary directory"""
+    monkeypatch.chdir(tmp_path)
+    return lambda **settings: Board(monkeypatch, **settings)
+
+
+@pytest.fixture
+def framebuf(monkeypatch):
+    """fake_ssd1306 standing in for the framebuf module"""
+    monkeypatch.setitem(sys.modules, "framebuf", fake_ssd1306)
+    return fake_ssd1306
@@ -0,0 +1,122 @@
+# Host-side stand-ins for the framebuf module and the ssd1306 driver, for
+# checking PartialDisplay and Writer on a PC. Not needed on the board.
+#
+# FrameBuffer implements the monochrome formats of framebuf.FrameBuffer in
+# plain Python, so this module can be installed as `framebuf` (see the
+# framebuf fixture in conftest.py). FakeSSD1306 is a MONO_VLSB FrameBuffer
+# like the real driver. Its write_cmd and write_data follow the panel's
+# column/page addressing into `panel`, a copy of what the real display would
+# be showing, and count the bytes sent.
+
+SET_COL_ADDR = 0x21
+SET_PAGE_ADDR = 0x22
+
+MONO_VLSB = 0
+MONO_HLSB = 3
+MONO_HMSB = 4
+
+
+class FrameBuffer:
+    # how many have been made, to see what a Writer allocates
+    created = 0
+
+    def __init__(self, buf, width, height, mode):
+        FrameBuffer.created += 1
+        self.buffer = buf
+        self.width = width
+        self.height = height
+        self.mode = mode
+        self.stride = (width + 7) // 8
+
+    def _locate(self, x, y):
+        if self.mode == MONO_VLSB:
+            return (y >> 3) * self.width + x, 1 << (y & 7)
+        if self.mode == MONO_HLSB:
+            return y * self.stride + (x >> 3), 0x80 >> (x & 7)
+        return y * self.stride + (x >> 3), 1 << (x & 7)
+
+    def pixel(self, x, y, c=None):
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            return 0 if c is None else None
+        index, bit = self._locate(x, y)
+        if c is None:
+            return 1 if self.buffer[index] & bit else 0
+        if c:
+            self.buffer[index] |= bit
+        else:
+            self.buffer[index] &= ~bit
+
+    def fill_rect(self, x, y, w, h, c):
+        for yy in range(y, y + h):
+            for xx in range(x, x + w):
+                self.pixel(xx, yy, c)
+
+    def fill(self, c):
+        self.fill_rect(0, 0, self.width, self.height, c)
+
+    def hline(self, x, y, w, c):
+        self.fill_rect(x, y, w, 1, c)
+
+    def vline(self, x, y, h, c):
+        self.fill_rect(x, y, 1, h, c)
+
+    def rect(self, x, y, w, h, c):
+        self.hline(x, y, w, c)
+        self.hline(x, y + h - 1, w, c)
+        self.vline(x, y, h, c)
+        self.vline(x + w - 1, y, h, c)
+
+    def blit(self, fbuf, x, y, key=-1):
+        for yy in range(fbuf.height):
+            for xx in range(fbuf.width):
+                c = fbuf.pixel(xx, yy)
+                if c != key:
+                    self.pixel(x + xx, y + yy, c)
+
+
+class FakeSSD1306(FrameBuffer):
+    def __init__(self, width=128, height=64):
+        self.pages = height // 8
+        super().__init__(bytearray(self.pages * width), width, height, MONO_VLSB)
+        self.panel = bytearray(self.pages * width)
+        self.bytes_sent = 0
+        self._command = []
+        self._window = (0, width - 1, 0, self.pages - 1)
+        self._column = 0
+        self._page = 0
+
+    def write_cmd(self, cmd):
+        self._command.append(cmd)
+        self.bytes_sent += 1
+        if len(self._command) == 3 and self._command[0] == SET_COL_ADDR:
+            _, x0, x1 = self._command
+            self._window = (x0, x1) + self._window[2:]
+            self._column = x0
+            self._command = []
+        elif len(self._command) == 3 and self._command[0] == SET_PAGE_ADDR:
+            _, p0, p1 = self._command
+            self._window = self._window[:2] + (p0, p1)
+            self._page = p0
+            self._command = []
+        elif self._command[0] not in (SET_COL_ADDR, SET_PAGE_ADDR):
+            self._command = []
+
+    def write_data(self, buf):
+        x0, x1, p0, p1 = self._window
+        for byte in bytes(buf):
+            self.panel[self._page * self.width + self._column] = byte
+            self.bytes_sent += 1
+            # horizontal addressing: wrap to the next page, then the first
+            self._column += 1
+            if self._column > x1:
+                self._column = x0
+                self._page = p0 if self._page == p1 else self._page + 1
+
+    def show(self):
+        self.write_cmd(SET_COL_ADDR)
+        self.write_cmd(0)
+        self.write_cmd(self.width - 1)
+        self.write_cmd(SET_PAGE_ADDR)
+        self.write_cmd(0)
+        self.write_cmd(self.pages - 1)
+        self.write_data(self.buffer)
@@ -0,0 +1,145 @@
+import struct
+
+import packet
+import rtc_buffer
+
+
+def test_upload_every_wake(make_board):
+    board = make_board()
+    board.wake(21.0, 40.0, deep_sleep=False)
+    assert board.posts == [
+        (
+            board.config["WEBHOOK_URL"],
+            {
+                "sensor_name": "porch",
+                "sensor_id": 7,
+                "temperature": 21.0,
+                "humidity": 40.0,
+            },
+        )
+    ]
+    assert board.deepsleeps == 1
+    assert board.errors == []
+
+
+def test_buffer_until_upload_due(make_board):
+    board = make_board(UPLOAD_EVERY=3)
+    board.wake(20.0, 40.0, deep_sleep=False)
+    board.wake(20.5, 41.0)
+    assert board.posts == []
+    assert rtc_buffer.unpack(board.rtc_memory)[:2] == (
+        2,
+        [(1000000, 20.0, 40.0), (1000060, 20.5, 41.0)],
+    )
+
+    board.wake(21.0, 42.0)
+    ((url, body),) = board.posts
+    assert url == board.config["BULK_WEBHOOK_URL"]
+    assert body["readings"] == [
+        {"age": 120, "temperature": 20.0, "humidity": 40.0},
+        {"age": 60, "temperature": 20.5, "humidity": 41.0},
+        {"age": 0, "temperature": 21.0, "humidity": 42.0},
+    ]
+    assert rtc_buffer.unpack(board.rtc_memory)[:2] == (0, [])
+    assert board.deepsleeps == 3
+
+
+def test_failed_upload_keeps_the_samples(make_board):
+    board = make_board(UPLOAD_EVERY=2)
+    board.wake(deep_sleep=False)
+    board.status_code = 500
+    board.wake()
+    assert len(board.errors) == 1
+    assert len(rtc_buffer.unpack(board.rtc_memory)[1]) == 2
+
+    board.status_code = 200
+    board.wake()
+    assert [len(body["readings"]) for _, body in board.posts] == [2, 3]
+    assert rtc_buffer.unpack(board.rtc_memory)[:2] == (0, [])
+
+
+def test_power_on_drops_buffered_samples(make_board):
+    board = make_board(UPLOAD_EVERY=5)
+    board.wake(deep_sleep=False)
+    board.wake()
+    board.wake(deep_sleep=False)
+    assert len(rtc_buffer.unpack(board.rtc_memory)[1]) == 1
+
+
+def test_full_buffer_uploads_early(make_board):
+    board = make_board(UPLOAD_EVERY=255)
+    board.wake(deep_sleep=False)
+    for _ in range(rtc_buffer.capacity() - 2):
+        board.wake()
+    assert len(board.posts) == 1
+    assert len(board.posts[0][1]["readings"]) == rtc_buffer.capacity() - 1
+
+
+def test_binary_upload(make_board):
+    board = make_board(UPLOAD_EVERY=2, UPLOAD_FORMAT="binary")
+    board.wake(20.0, None, deep_sleep=False)
+    board.wake(-3.5, 50.5)
+    ((url, body),) = board.posts
+    assert url == board.config["BINARY_WEBHOOK_URL"]
+    version, name_length, sensor_id = struct.unpack_from(packet.HEADER, body)
+    assert (version, sensor_id) == (packet.VERSION, 7)
+    start = packet.HEADER_SIZE + name_length
+    assert body[packet.HEADER_SIZE : start] == b"porch"
+    assert list(struct.iter_unpack(packet.READING, body[start:])) == [
+        (60, 200, 0xFFFF),
+        (0, -35, 505),
+    ]
+
+
+def sequence(datagram):
+    return struct.unpack_from(packet.SEQUENCE, datagram)[0]
+
+
+def test_udp_sequence_numbers(make_board):
+    board = make_board(UPLOAD_TRANSPORT="udp")
+    board.wake(deep_sleep=False)
+    board.wake()
+    board.wake()
+    # a cold boot starts from the next boot count in flash
+    board.wake(deep_sleep=False)
+    board.wake()
+    assert [sequence(d) for d in board.datagrams] == [
+        1 << 16,
+        (1 << 16) + 1,
+        (1 << 16) + 2,
+        2 << 16,
+        (2 << 16) + 1,
+    ]
+    message, mac = (
+        board.datagrams[0][: -packet.MAC_SIZE],
+        board.datagrams[0][-packet.MAC_SIZE :],
+    )
+    assert packet.hmac_sha256(b"secret", message)[: packet.MAC_SIZE] == mac
+
+
+def test_udp_buffered_upload(make_board):
+    board = make_board(UPLOAD_TRANSPORT="udp", UPLOAD_EVERY=2)
+    for wake in range(4):
+        board.wake(deep_sleep=wake > 0)
+    assert [sequence(d) for d in board.datagrams] == [1 << 16, (1 << 16) + 1]
+    payload = board.datagrams[1][struct.calcsize(packet.SEQUENCE) : -packet.MAC_SIZE]
+    start = packet.HEADER_SIZE + len("porch")
+    assert [
+        age for age, _, _ in struct.iter_unpack(packet.READING, payload[start:])
+    ] == [60, 0]
+
+
+def test_sequence_counter_rolls_into_the_boot_count(make_board):
+    board = make_board(UPLOAD_TRANSPORT="udp")
+    board.wake(deep_sleep=False)
+    # pretend this boot has already sent all but one of its numbers
+    board.rtc_memory = rtc_buffer.pack(0, [], (1 << 16) + 0xFFFF)
+    board.wake()
+    board.wake()
+    board.wake(deep_sleep=False)
+    assert [sequence(d) for d in board.datagrams] == [
+        1 << 16,
+        (1 << 16) + 0xFFFF,
+        2 << 16,
+        3 << 16,
+    ]
@@ -0,0 +1,53 @@
+import random
+
+from fake_ssd1306 import FakeSSD1306
+from partial_display import PartialDisplay
+
+
+def full_show_cost():
+    full = FakeSSD1306()
+    full.show()
+    return full.bytes_sent
+
+
+def test_panel_matches_the_buffer_after_random_draws():
+    rng = random.Random(1)
+    fake = FakeSSD1306()
+    display = PartialDisplay(fake)
+    display.show()
+    glyph = FakeSSD1306(24, 16)
+    glyph.fill_rect(2, 3, 10, 9, 1)
+
+    shows = 500
+    for _ in range(shows):
+        for _ in range(rng.randint(1, 3)):
+            op = rng.choice(("fill_rect", "rect", "blit"))
+            x, y = rng.randint(-10, 127), rng.randint(-10, 63)
+            if op == "blit":
+                display.blit(glyph, x, y)
+            else:
+                w, h = rng.randint(1, 48), rng.randint(1, 32)
+                getattr(display, op)(x, y, w, h, rng.randint(0, 1))
+        display.show()
+        assert fake.panel == fake.buffer
+
+    assert fake.bytes_sent // (shows + 1) < full_show_cost()
+
+
+def test_rotary_tick_sends_less_than_a_full_show():
+    # two large digits and the control box, as the controller redraws them
+    fake = FakeSSD1306()
+    display = PartialDisplay(fake)
+    digit = FakeSSD1306(32, 48)
+    digit.fill_rect(4, 4, 24, 40, 1)
+    display.rect(32, 0, 96, 64, 1)
+    display.show()
+
+    before = fake.bytes_sent
+    display.blit(digit, 48, 8)
+    display.blit(digit, 80, 8)
+    display.rect(32, 0, 96, 64, 1)
+    display.show()
+    assert fake.panel == fake.buffer
+    assert fake.bytes_sent - before < full_show_cost()
+
@@ -0,0 +1,60 @@
+import struct
+
+import rtc_buffer
+
+
+def test_capacity_fills_rtc_memory():
+    assert rtc_buffer.capacity() == 60
+    full = rtc_buffer.pack(0, [(0, 0.0, 0.0)] * rtc_buffer.capacity())
+    assert len(full) <= rtc_buffer.RTC_MEMORY_SIZE
+
+
+def test_empty_round_trip():
+    assert rtc_buffer.unpack(rtc_buffer.pack(0, [], 0x10002)) == (0, [], 0x10002)
+
+
+def test_full_round_trip():
+    samples = [
+        (1000000 + 60 * i, -12.5 + i, None if i % 7 == 0 else 40.0 + i / 2)
+        for i in range(rtc_buffer.capacity())
+    ]
+    samples[3] = (samples[3][0], None, samples[3][2])
+    data = rtc_buffer.pack(12, samples, 0xFFFF0001)
+    assert rtc_buffer.unpack(data) == (12, samples, 0xFFFF0001)
+
+
+def test_wakes_saturate_at_a_byte():
+    wakes, _, _ = rtc_buffer.unpack(rtc_buffer.pack(300, []))
+    assert wakes == 255
+
+
+def test_corrupt_header():
+    data = bytearray(rtc_buffer.pack(2, [(1000000, 20.0, 45.0)], 5))
+    data[0] ^= 0xFF
+    assert rtc_buffer.unpack(bytes(data)) == (0, [], None)
+
+
+def test_count_past_the_end():
+    data = bytearray(rtc_buffer.pack(2, [(1000000, 20.0, 45.0)], 5))
+    struct.pack_into("<H", data, 2, 2)
+    assert rtc_buffer.unpack(bytes(data)) == (0, [], None)
+
+
+def test_memory_after_power_on():
+    assert rtc_buffer.unpack(b"") == (0, [], None)
+    assert rtc_buffer.unpack(b"\x00\x01\x02") == (0, [], None)
+    assert rtc_buffer.unpack(bytes(rtc_buffer.RTC_MEMORY_SIZE)) == (0, [], None)
+
+
+def test_add_sample_drops_the_oldest():
+    samples = []
+    for taken in range(5):
+        rtc_buffer.add_sample(samples, (taken, 20.0, 45.0), 3)
+    assert [taken for taken, _, _ in samples] == [2, 3, 4]
+
+
+def test_upload_due():
+    assert not rtc_buffer.upload_due(2, 2, 3, 60)
+    assert rtc_buffer.upload_due(3, 3, 3, 60)
+    # one slot short of full, whatever the wake count
+    assert rtc_buffer.upload_due(1, 59, 100, 60)
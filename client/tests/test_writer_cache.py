@@ -0,0 +1,47 @@
+import pytest
+
+
+@pytest.fixture
+def draw(framebuf):
+    import roboto48
+    import small_font
+    import writer
+
+    def draw(caches, redraws=20):
+        """
+        redraw the controller's screen, returning the buffer and how many
+        FrameBuffers were made on the way
+        """
+        screen = framebuf.FakeSSD1306()
+        options = {} if caches else dict(glyph_cache=0, width_cache=0, string_cache=0)
+        large = writer.Writer(
+            screen, roboto48, verbose=False, **(options or dict(string_cache=4))
+        )
+        small = writer.Writer(screen, small_font, verbose=False, **options)
+        before = framebuf.FrameBuffer.created
+        for i in range(redraws):
+            temp = "{}°".format(60 + i % 5)
+            large.set_textpos(32 + (96 - large.stringlen(temp)) // 2, 8)
+            large.printstring(temp)
+            for row, label in enumerate(("SET", "{}F".format(70 + i % 3), "RH", "45%")):
+                small.set_textpos(1 + (32 - small.stringlen(label)) // 2, row * 16)
+                small.printstring(label)
+            # wraps onto the next line, so it takes the per-character path
+            small.set_textpos(100, 40)
+            small.printstring("0123456789")
+        return screen.buffer, framebuf.FrameBuffer.created - before
+
+    return draw
+
+
+def test_cached_rendering_matches_uncached(draw):
+    plain, _ = draw(caches=False)
+    cached, _ = draw(caches=True)
+    assert cached == plain
+
+
+def test_caches_make_fewer_framebuffers(draw):
+    _, plain_created = draw(caches=False)
+    _, cached_created = draw(caches=True)
+    assert cached_created < plain_created
+
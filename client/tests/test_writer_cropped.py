@@ -0,0 +1,102 @@
+# A cropped font drawn by Writer against its glyphs put back in whole
+# character cells pixel by pixel, over a screen that isn't blank.
+
+import pytest
+
+from fake_ssd1306 import MONO_HLSB, FakeSSD1306, FrameBuffer
+
+# x isn't in the font, so it's the error glyph
+CHARS = "0123456789CF°x"
+
+
+class Uncropped:
+    def __init__(self, font):
+        self.font = font
+        self.height = font.height
+        self.hmap = font.hmap
+        self.reverse = font.reverse
+
+    def get_ch(self, char):
+        data, left, top, crop_width, crop_height, width = self.font.get_cropped(char)
+        height = self.font.height()
+        crop = FrameBuffer(bytearray(data), crop_width, crop_height, MONO_HLSB)
+        cell = FrameBuffer(
+            bytearray((width + 7) // 8 * height), width, height, MONO_HLSB
+        )
+        for y in range(crop_height):
+            for x in range(crop_width):
+                cell.pixel(left + x, top + y, crop.pixel(x, y))
+        return cell.buffer, height, width
+
+
+class Shifted:
+    # roboto48's glyphs all start at the left of their cells
+    def __init__(self, font, by):
+        self.font = font
+        self.by = by
+        self.height = font.height
+        self.hmap = font.hmap
+        self.reverse = font.reverse
+
+    def get_cropped(self, char):
+        data, left, top, crop_width, crop_height, width = self.font.get_cropped(char)
+        return data, left + self.by, top, crop_width, crop_height, width + self.by
+
+
+@pytest.fixture
+def writer(framebuf):
+    import writer
+
+    return writer
+
+
+@pytest.fixture(params=[0, 3], ids=["as generated", "shifted right"])
+def font(request, framebuf):
+    import roboto48
+
+    return Shifted(roboto48, request.param) if request.param else roboto48
+
+
+def draw_chars(writer, font, invert):
+    screen = FakeSSD1306()
+    text = writer.Writer(screen, font, verbose=False, glyph_cache=0)
+    drawn = []
+    for char in CHARS:
+        for col in range(8):
+            screen.fill(0)
+            for x in range(0, screen.width, 3):
+                screen.vline(x, 0, screen.height, 1)
+            text.set_textpos(col, 8)
+            text._printchar(char, invert)
+            drawn.append(bytes(screen.buffer))
+    return drawn
+
+
+def render_strings(writer, font):
+    screen = FakeSSD1306()
+    text = writer.Writer(screen, font, verbose=False)
+    drawn = []
+    for i in range(len(CHARS)):
+        screen.fill(0)
+        text.set_textpos(i % 8, 8)
+        text.printstring(CHARS[i : i + 3])
+        drawn.append(bytes(screen.buffer))
+    return drawn
+
+
+@pytest.mark.parametrize("invert", [False, True], ids=["normal", "inverted"])
+def test_cropped_glyphs_draw_like_whole_cells(writer, font, invert):
+    assert draw_chars(writer, font, invert) == draw_chars(
+        writer, Uncropped(font), invert
+    )
+
+
+def test_cropped_strings_render_like_whole_cells(writer, font):
+    assert render_strings(writer, font) == render_strings(writer, Uncropped(font))
+
+
+def test_strings_are_as_wide_either_way(writer, font):
+    cropped = writer.Writer(FakeSSD1306(), font, verbose=False)
+    whole = writer.Writer(FakeSSD1306(), Uncropped(font), verbose=False)
+    for i in range(len(CHARS)):
+        assert cropped.stringlen(CHARS[i : i + 3]) == whole.stringlen(CHARS[i : i + 3])
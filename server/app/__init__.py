@@ -4,4 +4,6 @@ from config import Config
 app = Flask(__name__)
 app.config.from_object(Config)
 
-from app import routes
+from app import commands, routes, shutdown
+
+shutdown.exit_on_sigterm()
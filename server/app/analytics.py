@@ -0,0 +1,418 @@
+"""
+columnar, vectorised analysis of the reading history with NumPy.
+
+readings are loaded into a ReadingFrame of parallel arrays (int64 epoch
+timestamps, float32 temperature and humidity, and integer codes into a list
+of sensor names) so filtering, resampling and derived values are computed a
+whole column at a time instead of row by row.
+
+numpy is optional for the server; everything here raises RuntimeError
+without it.
+"""
+
+import os
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from app.archive import Archive
+from app.store import CSVStore, get_reading_store
+from app.timeutil import to_epoch
+
+LOAD_BLOCK_SIZE = 16 * 1024 * 1024
+# longer lines can't be readings, and would make every field array as wide
+MAX_LINE_LENGTH = 256
+NOT_A_TIME = np.iinfo(np.int64).min if np is not None else None
+
+
+def _require_numpy():
+    if np is None:
+        raise RuntimeError("the analytics module needs numpy installed")
+
+
+class ReadingFrame:
+    """a set of readings as parallel column arrays"""
+
+    def __init__(self, timestamps, sensor_codes, sensor_names, temperature, humidity):
+        self.timestamps = timestamps
+        self.sensor_codes = sensor_codes
+        self.sensor_names = sensor_names
+        self.temperature = temperature
+        self.humidity = humidity
+
+    def __len__(self):
+        return len(self.timestamps)
+
+    @classmethod
+    def empty(cls):
+        _require_numpy()
+        return cls(
+            np.empty(0, dtype=np.int64),
+            np.empty(0, dtype=np.int32),
+            [],
+            np.empty(0, dtype=np.float32),
+            np.empty(0, dtype=np.float32),
+        )
+
+    @classmethod
+    def concatenate(cls, frames):
+        """join frames, re-coding sensors against one combined name list"""
+        _require_numpy()
+        frames = [frame for frame in frames if len(frame)]
+        if not frames:
+            return cls.empty()
+        names = sorted({name for frame in frames for name in frame.sensor_names})
+        lookup = {name: code for code, name in enumerate(names)}
+        codes = []
+        for frame in frames:
+            remap = np.array(
+                [lookup[name] for name in frame.sensor_names], dtype=np.int32
+            )
+            codes.append(remap[frame.sensor_codes])
+        return cls(
+            np.concatenate([frame.timestamps for frame in frames]),
+            np.concatenate(codes),
+            names,
+            np.concatenate([frame.temperature for frame in frames]),
+            np.concatenate([frame.humidity for frame in frames]),
+        )
+
+    def sensor_code(self, sensor_name):
+        try:
+            return self.sensor_names.index(sensor_name)
+        except ValueError:
+            return -1
+
+    def mask(self, sensor_name=None, start=None, end=None):
+        """boolean mask of the rows matching the filters"""
+        selected = np.ones(len(self), dtype=bool)
+        if sensor_name is not None:
+            selected &= self.sensor_codes == self.sensor_code(sensor_name)
+        if start is not None:
+            selected &= self.timestamps >= start
+        if end is not None:
+            selected &= self.timestamps < end
+        return selected
+
+    def select(self, sensor_name=None, start=None, end=None):
+        selected = self.mask(sensor_name, start, end)
+        return ReadingFrame(
+            self.timestamps[selected],
+            self.sensor_codes[selected],
+            self.sensor_names,
+            self.temperature[selected],
+            self.humidity[selected],
+        )
+
+
+def _to_float32(column):
+    """
+    the column as float32, with empty fields (missing measurements) as NaN,
+    and a mask of the fields that parsed
+    """
+    column = np.array(column, dtype="S")
+    column = column.astype(f"S{max(column.itemsize, 3)}")
+    column[column == b""] = b"nan"
+    try:
+        return column.astype(np.float32), np.ones(len(column), dtype=bool)
+    except ValueError:
+        pass
+    # something in there isn't a number, fall back to one field at a time
+    values = np.full(len(column), np.nan, dtype=np.float32)
+    parsed = np.ones(len(column), dtype=bool)
+    for i, field in enumerate(column):
+        try:
+            values[i] = float(field)
+        except ValueError:
+            parsed[i] = False
+    return values, parsed
+
+
+def _to_epochs(column):
+    """
+    epoch seconds from a column of stripped timestamps, either epoch seconds
+    or TIME_FORMAT strings in rows written before those, and a mask of the
+    ones that parsed
+    """
+    epochs = np.full(len(column), NOT_A_TIME, dtype=np.int64)
+    # more digits than that wouldn't fit in an int64
+    digits = np.char.isdigit(column) & (np.char.str_len(column) <= 18)
+    epochs[digits] = column[digits].astype(np.int64)
+    legacy = np.flatnonzero(np.char.find(column, b"-") >= 0)
+    try:
+        epochs[legacy] = column[legacy].astype("datetime64[s]").astype(np.int64)
+    except ValueError:
+        # something in there isn't a time, fall back to one field at a time
+        for i in legacy:
+            try:
+                epochs[i] = np.datetime64(column[i].decode(), "s").astype(np.int64)
+            except ValueError:
+                epochs[i] = NOT_A_TIME
+    # empty fields come out as NaT
+    return epochs, epochs != NOT_A_TIME
+
+
+def _frame(epochs, names, temperatures, humidities):
+    """
+    a ReadingFrame from epoch seconds and bytes columns, leaving out the rows
+    whose measurements aren't numbers
+    """
+    temperature, temperature_parsed = _to_float32(temperatures)
+    humidity, humidity_parsed = _to_float32(humidities)
+    keep = temperature_parsed & humidity_parsed
+    if not keep.all():
+        epochs, names = epochs[keep], np.array(names, dtype="S")[keep]
+        temperature, humidity = temperature[keep], humidity[keep]
+    if not len(epochs):
+        return ReadingFrame.empty()
+    sensor_names, sensor_codes = np.unique(
+        np.array(names, dtype="S"), return_inverse=True
+    )
+    return ReadingFrame(
+        epochs,
+        sensor_codes.astype(np.int32),
+        [name.decode() for name in sensor_names],
+        temperature,
+        humidity,
+    )
+
+
+def _fields(data, begin, end):
+    """
+    cut data[begin[i]:end[i]] out of a uint8 buffer for every i at once, as a
+    fixed-width bytes array (numpy drops the zero padding on the right)
+    """
+    width = int((end - begin).max()) if len(begin) else 0
+    if width <= 0:
+        return np.zeros(len(begin), dtype="S1")
+    positions = begin[:, None] + np.arange(width)
+    cells = np.take(data, positions, mode="clip")
+    cells[positions >= end[:, None]] = 0
+    return cells.view(f"S{width}").ravel()
+
+
+def _strip(column):
+    return np.char.strip(column) if len(column) else column
+
+
+def _parse_block(block, boundary=None):
+    """
+    parse a run of complete CSV lines into a ReadingFrame without a Python
+    loop. lines that aren't readings are left out, as are rows from before
+    `boundary` (epoch seconds)
+    """
+    data = np.frombuffer(block, dtype=np.uint8)
+    newlines = np.flatnonzero(data == ord("\n"))
+    starts = np.r_[0, newlines[:-1] + 1]
+    ends = newlines - (data[newlines - 1] == ord("\r"))
+
+    # keep only the lines with exactly four fields and a sane length
+    commas = np.flatnonzero(data == ord(","))
+    first = np.searchsorted(commas, starts)
+    count = np.searchsorted(commas, ends) - first
+    keep = (count == 3) & (ends - starts <= MAX_LINE_LENGTH)
+    starts, ends, first = starts[keep], ends[keep], first[keep]
+    if not len(starts):
+        return ReadingFrame.empty()
+    c1, c2, c3 = commas[first], commas[first + 1], commas[first + 2]
+
+    epochs, keep = _to_epochs(_strip(_fields(data, starts, c1)))
+    if boundary is not None:
+        # left behind by a compaction that didn't finish
+        keep &= epochs >= boundary
+    if not keep.all():
+        epochs, starts, ends = epochs[keep], starts[keep], ends[keep]
+        c1, c2, c3 = c1[keep], c2[keep], c3[keep]
+    return _frame(
+        epochs,
+        _strip(_fields(data, c1 + 1, c2)),
+        _strip(_fields(data, c2 + 1, c3)),
+        _strip(_fields(data, c3 + 1, ends)),
+    )
+
+
+def load_csv(filename=None, block_size=LOAD_BLOCK_SIZE):
+    """
+    load a readings.csv file straight into a ReadingFrame. the file is read in
+    large blocks and each block is split into columns with array operations,
+    so no Python object is created per row. rows that don't parse are
+    skipped. without a `filename` this is the CSV store's whole history,
+    archived readings included
+    """
+    _require_numpy()
+    frames = []
+    boundary = None
+    if filename is None:
+        filename = CSVStore.filename
+        frames.append(load_archive())
+        boundary = Archive.boundary()
+        if not os.path.exists(filename):
+            return frames[0]
+    with open(filename, "rb") as csv_file:
+        carry = b""
+        while True:
+            chunk = csv_file.read(block_size)
+            if not chunk:
+                break
+            block = carry + chunk
+            cut = block.rfind(b"\n") + 1
+            # a partly written last line is left out, as everywhere else
+            block, carry = block[:cut], block[cut:]
+            if block:
+                frames.append(_parse_block(block, boundary))
+    return ReadingFrame.concatenate(frames)
+
+
+def load_archive(sensor_name=None, start=None, end=None):
+    """
+    load archived readings into a ReadingFrame. the segments are already
+    columnar, so this is a time-range slice of each mapped segment
+    """
+    _require_numpy()
+    sensors = Archive.index()["sensors"]
+    if sensor_name is not None and sensor_name not in sensors:
+        return ReadingFrame.empty()
+    frames = []
+    for segment in Archive.segments(start, end):
+        records = Archive.records(segment)
+        timestamps = records["timestamp"]
+        low = np.searchsorted(timestamps, start) if start is not None else 0
+        high = np.searchsorted(timestamps, end) if end is not None else len(records)
+        records = records[low:high]
+        if sensor_name is not None:
+            records = records[records["sensor_id"] == sensors.index(sensor_name)]
+        frames.append(
+            ReadingFrame(
+                records["timestamp"].astype(np.int64),
+                records["sensor_id"].astype(np.int32),
+                sensors,
+                records["temperature"].astype(np.float32),
+                records["humidity"].astype(np.float32),
+            )
+        )
+    return ReadingFrame.concatenate(frames)
+
+
+def load_readings(sensor_name=None, start=None, end=None, store=None):
+    """load readings from any ReadingStore through its iter_readings"""
+    _require_numpy()
+    store = store or get_reading_store()
+    timestamps, names, temperatures, humidities = [], [], [], []
+    for reading in store.iter_readings(sensor_name, start, end):
+        timestamps.append(to_epoch(reading["timestamp"]))
+        names.append(reading["sensor_name"].encode())
+        temperatures.append(reading["temperature"].encode())
+        humidities.append(reading["humidity"].encode())
+    if not timestamps:
+        return ReadingFrame.empty()
+    return _frame(np.array(timestamps, dtype=np.int64), names, temperatures, humidities)
+
+
+def _group_reduce(keys, values):
+    """
+    NaN-aware count/min/max/mean of `values` for each run of equal `keys`.
+    `keys` must be sorted; returns the run starts along with the results
+    """
+    starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+    present = ~np.isnan(values)
+    counts = np.add.reduceat(present.astype(np.int64), starts)
+    sums = np.add.reduceat(np.where(present, values, 0).astype(np.float64), starts)
+    minimums = np.minimum.reduceat(np.where(present, values, np.inf), starts)
+    maximums = np.maximum.reduceat(np.where(present, values, -np.inf), starts)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        means = sums / counts
+    missing = counts == 0
+    minimums[missing] = np.nan
+    maximums[missing] = np.nan
+    return starts, counts, minimums, maximums, means
+
+
+def resample(frame, seconds):
+    """
+    per-sensor buckets of `seconds` with min/max/mean/count of temperature
+    and humidity, as a dict of arrays sorted by sensor then bucket
+    """
+    _require_numpy()
+    if not len(frame):
+        return {"sensor_name": [], "bucket": np.empty(0, dtype=np.int64)}
+
+    buckets = frame.timestamps - frame.timestamps % seconds
+    order = np.lexsort((buckets, frame.sensor_codes))
+    codes = frame.sensor_codes[order]
+    buckets = buckets[order]
+    # one int64 key per (sensor, bucket) so runs can be found in one pass
+    keys = codes.astype(np.int64) * (1 << 40) + (buckets // seconds)
+
+    result = {}
+    for column in ("temperature", "humidity"):
+        values = getattr(frame, column)[order]
+        starts, counts, minimums, maximums, means = _group_reduce(keys, values)
+        result[f"{column}_count"] = counts
+        result[f"{column}_min"] = minimums
+        result[f"{column}_max"] = maximums
+        result[f"{column}_mean"] = means
+    result["sensor_name"] = [frame.sensor_names[code] for code in codes[starts]]
+    result["bucket"] = buckets[starts]
+    result["count"] = np.diff(np.r_[starts, len(keys)])
+    return result
+
+
+def rolling_mean(values, window):
+    """
+    trailing mean over `window` samples, ignoring NaNs. the first
+    `window - 1` entries average over however many samples there are so far
+    """
+    _require_numpy()
+    values = np.asarray(values, dtype=np.float64)
+    present = ~np.isnan(values)
+    sums = np.cumsum(np.where(present, values, 0))
+    counts = np.cumsum(present)
+    sums[window:] = sums[window:] - sums[:-window]
+    counts[window:] = counts[window:] - counts[:-window]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return sums / counts
+
+
+def dew_point(temperature, humidity):
+    """dew point in °C from temperature in °C and relative humidity in %"""
+    _require_numpy()
+    # Magnus formula, Sonntag (1990) constants
+    a, b = 17.62, 243.12
+    temperature = np.asarray(temperature, dtype=np.float64)
+    humidity = np.asarray(humidity, dtype=np.float64)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        gamma = np.log(humidity / 100) + a * temperature / (b + temperature)
+    return b * gamma / (a - gamma)
+
+
+def heat_index(temperature, humidity):
+    """heat index in °C from temperature in °C and relative humidity in %"""
+    _require_numpy()
+    t = np.asarray(temperature, dtype=np.float64) * 9 / 5 + 32
+    rh = np.asarray(humidity, dtype=np.float64)
+
+    # NWS: Steadman's simple formula, switching to the Rothfusz regression
+    # (with its adjustments) once that averages to 80°F or more
+    simple = 0.5 * (t + 61.0 + (t - 68.0) * 1.2 + rh * 0.094)
+    full = (
+        -42.379
+        + 2.04901523 * t
+        + 10.14333127 * rh
+        - 0.22475541 * t * rh
+        - 0.00683783 * t * t
+        - 0.05481717 * rh * rh
+        + 0.00122874 * t * t * rh
+        + 0.00085282 * t * rh * rh
+        - 0.00000199 * t * t * rh * rh
+    )
+    with np.errstate(invalid="ignore"):
+        dry = (rh < 13) & (t >= 80) & (t <= 112)
+        full = np.where(
+            dry, full - (13 - rh) / 4 * np.sqrt((17 - np.abs(t - 95)) / 17), full
+        )
+        humid = (rh > 85) & (t >= 80) & (t <= 87)
+        full = np.where(humid, full + (rh - 85) / 10 * (87 - t) / 5, full)
+        index = np.where((simple + t) / 2 >= 80, full, simple)
+    return (index - 32) * 5 / 9
@@ -0,0 +1,306 @@
+"""
+cold storage for readings that are old enough not to change any more.
+
+readings are kept as fixed-width little-endian binary records (RECORD) in one
+segment file per month, sorted by time, and read by memory-mapping a segment
+and viewing it as a NumPy record array, so nothing is parsed or copied until
+a record is actually handed out.
+
+`index.json` next to the segments holds everything else: the sensor names the
+record ids point into, how many bytes of each segment are committed, the
+newest archived reading per sensor and the boundary, the time before which
+every reading lives in the archive and at or after which every reading lives
+in readings.csv. it is replaced atomically after the segments are written,
+so a compaction that dies half way leaves nothing visible behind.
+
+numpy is optional for the server as long as nothing has been archived; the
+archive itself raises RuntimeError without it.
+"""
+
+import datetime
+import json
+import mmap
+import os
+import threading
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from app import app
+from app.timeutil import from_epoch
+
+ARCHIVE_DIR = "./archive"
+INDEX_FILE = "index.json"
+SCAN_BLOCK = 4096
+
+# timestamp (epoch seconds), sensor id, temperature, humidity. missing
+# measurements are NaN
+RECORD = (
+    np.dtype(
+        [
+            ("timestamp", "<i8"),
+            ("sensor_id", "<u2"),
+            ("temperature", "<f4"),
+            ("humidity", "<f4"),
+        ]
+    )
+    if np is not None
+    else None
+)
+
+
+def _require_numpy():
+    if np is None:
+        raise RuntimeError("the reading archive needs numpy installed")
+
+
+def segment_for(timestamp):
+    """name of the segment holding a reading taken at `timestamp`"""
+    return datetime.datetime.utcfromtimestamp(timestamp).strftime("%Y-%m")
+
+
+def _text(value):
+    # shortest string that reads back as the same float32, "" if missing
+    if np.isnan(value):
+        return ""
+    return np.format_float_positional(value, trim="-")
+
+
+def _measurement(value):
+    if value is None or str(value).strip() == "":
+        return np.nan
+    return float(value)
+
+
+class Archive:
+    directory = ARCHIVE_DIR
+
+    # index.json as of its (inode, size, mtime) signature, and the mapped
+    # segments as {segment: (committed length, record array)}
+    _index = None
+    _signature = None
+    _views = {}
+    _lock = threading.Lock()
+
+    @classmethod
+    def path(cls, segment):
+        return os.path.join(cls.directory, f"readings_{segment}.bin")
+
+    @classmethod
+    def index(cls):
+        """the current index.json, re-read only when it has been replaced"""
+        filename = os.path.join(cls.directory, INDEX_FILE)
+        try:
+            stat = os.stat(filename)
+        except FileNotFoundError:
+            return {"boundary": None, "sensors": [], "segments": {}, "latest": {}}
+
+        signature = stat.st_ino, stat.st_size, stat.st_mtime_ns
+        with cls._lock:
+            if signature != cls._signature:
+                with open(filename, "r") as index_file:
+                    cls._index = json.load(index_file)
+                cls._signature = signature
+            return cls._index
+
+    @classmethod
+    def boundary(cls):
+        """epoch seconds before which readings are archived, None if none are"""
+        return cls.index()["boundary"]
+
+    @classmethod
+    def records(cls, segment):
+        """
+        zero-copy, read-only record array over the committed part of a
+        segment. the mapping stays alive for as long as the array does
+        """
+        _require_numpy()
+        length = cls.index()["segments"].get(segment, 0)
+        with cls._lock:
+            cached = cls._views.get(segment)
+            if cached is not None and cached[0] == length:
+                return cached[1]
+            if length == 0:
+                view = np.empty(0, dtype=RECORD)
+            else:
+                with open(cls.path(segment), "rb") as segment_file:
+                    mapped = mmap.mmap(
+                        segment_file.fileno(), length, access=mmap.ACCESS_READ
+                    )
+                view = np.frombuffer(mapped, dtype=RECORD)
+            cls._views[segment] = (length, view)
+            return view
+
+    @classmethod
+    def segments(cls, start=None, end=None):
+        """segments that can hold readings taken in [start, end), oldest first"""
+        first = segment_for(start) if start is not None else None
+        last = segment_for(end) if end is not None else None
+        return [
+            segment
+            for segment in sorted(cls.index()["segments"])
+            if (first is None or segment >= first) and (last is None or segment <= last)
+        ]
+
+    @staticmethod
+    def parse_cursor(cursor):
+        """`(segment, record index)` from a cursor handed out by `scan`"""
+        try:
+            prefix, segment, position = cursor.split(":")
+            if prefix != "a" or not position.isdigit():
+                raise ValueError
+            datetime.datetime.strptime(segment, "%Y-%m")
+        except ValueError:
+            raise ValueError(f"invalid cursor {cursor!r}") from None
+        return segment, int(position)
+
+    @classmethod
+    def scan(cls, sensor_name=None, start=None, end=None, cursor=None):
+        """
+        yield `(next_cursor, reading)` for every archived reading matching the
+        filters, in time order, resuming after `cursor` if one is given
+        """
+        # a bad cursor is an error even when there's nothing archived yet
+        resume_segment, resume_position = (
+            cls.parse_cursor(cursor) if cursor is not None else (None, 0)
+        )
+        index = cls.index()
+        if not index["segments"]:
+            return
+        sensors = index["sensors"]
+        if sensor_name is not None:
+            if sensor_name not in sensors:
+                return
+            sensor_id = sensors.index(sensor_name)
+
+        for segment in cls.segments(start, end):
+            if resume_segment is not None and segment < resume_segment:
+                continue
+            records = cls.records(segment)
+            timestamps = records["timestamp"]
+            low = np.searchsorted(timestamps, start) if start is not None else 0
+            high = np.searchsorted(timestamps, end) if end is not None else len(records)
+            if segment == resume_segment:
+                low = max(low, resume_position)
+            positions = np.arange(low, high)
+            if sensor_name is not None:
+                positions = positions[records["sensor_id"][low:high] == sensor_id]
+
+            # only a block of records at a time is copied out of the mapping
+            for block in range(0, len(positions), SCAN_BLOCK):
+                selected = positions[block : block + SCAN_BLOCK]
+                for position, record in zip(selected.tolist(), records[selected]):
+                    yield f"a:{segment}:{position + 1}", {
+                        "timestamp": from_epoch(int(record["timestamp"])),
+                        "sensor_name": sensors[record["sensor_id"]],
+                        "temperature": _text(record["temperature"]),
+                        "humidity": _text(record["humidity"]),
+                    }
+
+    @classmethod
+    def latest(cls, sensor_name):
+        """newest archived reading for a sensor (any sensor if None), or None"""
+        latest = cls.index()["latest"]
+        if sensor_name is None:
+            if not latest:
+                return None
+            sensor_name = max(latest, key=lambda name: latest[name][0])
+        elif sensor_name not in latest:
+            return None
+        timestamp, temperature, humidity = latest[sensor_name]
+        return {
+            "location": sensor_name,
+            "timestamp": from_epoch(timestamp),
+            "epoch": timestamp,
+            "temperature": temperature,
+            "humidity": humidity,
+        }
+
+    @classmethod
+    def append(cls, readings, boundary):
+        """
+        archive `(epoch_timestamp, sensor_name, temperature, humidity)` tuples,
+        all taken between the current boundary and the new `boundary`, and
+        move the boundary up. the caller has to keep other compactions out
+        """
+        _require_numpy()
+        index = cls.index()
+        index = {
+            "boundary": index["boundary"],
+            "sensors": list(index["sensors"]),
+            "segments": dict(index["segments"]),
+            "latest": dict(index["latest"]),
+        }
+        sensor_ids = {name: i for i, name in enumerate(index["sensors"])}
+        os.makedirs(cls.directory, exist_ok=True)
+
+        readings = sorted(readings, key=lambda reading: reading[0])
+        by_segment = {}
+        for reading in readings:
+            by_segment.setdefault(segment_for(reading[0]), []).append(reading)
+
+        for segment, rows in by_segment.items():
+            for timestamp, sensor_name, temperature, humidity in rows:
+                if sensor_name not in sensor_ids:
+                    sensor_ids[sensor_name] = len(index["sensors"])
+                    index["sensors"].append(sensor_name)
+            records = np.zeros(len(rows), dtype=RECORD)
+            records["timestamp"] = [row[0] for row in rows]
+            records["sensor_id"] = [sensor_ids[row[1]] for row in rows]
+            records["temperature"] = [_measurement(row[2]) for row in rows]
+            records["humidity"] = [_measurement(row[3]) for row in rows]
+            for record, (timestamp, sensor_name, _, _) in zip(records, rows):
+                index["latest"][sensor_name] = [
+                    timestamp,
+                    _text(record["temperature"]),
+                    _text(record["humidity"]),
+                ]
+
+            committed = index["segments"].get(segment, 0)
+            with open(cls.path(segment), "ab") as segment_file:
+                # drop whatever an interrupted compaction left past the end
+                segment_file.truncate(committed)
+                segment_file.write(records.tobytes())
+                segment_file.flush()
+                os.fsync(segment_file.fileno())
+            index["segments"][segment] = committed + records.nbytes
+
+        if index["boundary"] is None or boundary > index["boundary"]:
+            index["boundary"] = boundary
+        filename = os.path.join(cls.directory, INDEX_FILE)
+        with open(filename + ".tmp", "w") as index_file:
+            json.dump(index, index_file)
+            index_file.flush()
+            os.fsync(index_file.fileno())
+        os.replace(filename + ".tmp", filename)
+
+
+class Compactor:
+    """
+    background thread calling `compact(max_age)` every `interval` seconds,
+    logging rather than raising when a run fails
+    """
+
+    def __init__(self, compact, max_age, interval):
+        self.compact = compact
+        self.max_age = max_age
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def close(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                archived = self.compact(self.max_age)
+            except Exception:
+                app.logger.exception("archive compaction failed")
+            else:
+                if archived:
+                    app.logger.info("archived %d readings", archived)
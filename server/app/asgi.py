@@ -0,0 +1,264 @@
+"""
+an asyncio (ASGI) front end for large sensor fleets, served by an ASGI server
+such as uvicorn:
+
+    uvicorn asgi:application
+
+the sensor upload endpoints, the controller state endpoint and the /api/watch
+long-poll are handled on the event loop, so thousands of open connections
+cost a coroutine each rather than a thread. the store is still synchronous,
+so every store call is handed to a pool of ASGI_IO_THREADS threads, which
+also bounds how many requests touch the disk at once.
+
+every other route is the Flask app, run in the same thread pool.
+"""
+
+import asyncio
+import functools
+import io
+import json
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qsl
+
+from app import app, events, handlers
+
+_executor = None
+
+
+def get_executor():
+    """the process-wide thread pool store I/O runs in, created on first use"""
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=app.config["ASGI_IO_THREADS"], thread_name_prefix="store-io"
+        )
+    return _executor
+
+
+async def run_io(func, *args):
+    """run a blocking call in the store I/O pool and wait for it"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_executor(), functools.partial(func, *args))
+
+
+class Request:
+    def __init__(self, scope, body):
+        self.scope = scope
+        self.body = body
+        self.method = scope["method"]
+        self.path = scope["path"]
+        self.args = dict(parse_qsl(scope.get("query_string", b"").decode()))
+        self.headers = {
+            name.decode("latin-1").lower(): value.decode("latin-1")
+            for name, value in scope.get("headers", [])
+        }
+
+    def json(self):
+        """the body decoded as JSON, or None if it isn't"""
+        try:
+            return json.loads(self.body)
+        except ValueError:
+            return None
+
+
+class PayloadTooLarge(Exception):
+    pass
+
+
+async def read_body(receive, limit):
+    body = bytearray()
+    while True:
+        message = await receive()
+        if message["type"] == "http.disconnect":
+            break
+        body += message.get("body", b"")
+        if len(body) > limit:
+            raise PayloadTooLarge()
+        if not message.get("more_body", False):
+            break
+    return bytes(body)
+
+
+async def send_response(send, status, body=b"", headers=()):
+    await send(
+        {
+            "type": "http.response.start",
+            "status": status,
+            "headers": [(name.encode(), value.encode()) for name, value in headers]
+            + [(b"content-length", str(len(body)).encode())],
+        }
+    )
+    await send({"type": "http.response.body", "body": body})
+
+
+async def send_json(send, status, payload, headers=()):
+    body = json.dumps(payload).encode() + b"\n"
+    await send_response(
+        send, status, body, [("content-type", "application/json")] + list(headers)
+    )
+
+
+async def send_result(send, result, headers=()):
+    """send what an app.handlers function returned"""
+    body, status = result
+    if body is None:
+        return await send_response(send, status, headers=headers)
+    await send_json(send, status, body, headers)
+
+
+async def add_reading(request, send):
+    await send_result(
+        send, await run_io(handlers.add_reading, request.json(), int(time.time()))
+    )
+
+
+async def add_readings(request, send):
+    await send_result(
+        send, await run_io(handlers.add_readings, request.json(), int(time.time()))
+    )
+
+
+async def add_binary(request, send):
+    await send_result(
+        send, await run_io(handlers.add_binary, request.body, int(time.time()))
+    )
+
+
+def _validators(version):
+    return [("etag", f'"{version}"'), ("cache-control", "no-cache")]
+
+
+async def controller_state(request, send):
+    state = await run_io(events.current_state, request.args.get("sensor") or None)
+    if handlers.etag_matches(request.headers.get("if-none-match"), state["version"]):
+        return await send_response(send, 304, headers=_validators(state["version"]))
+    await send_json(
+        send,
+        200,
+        handlers.controller_state(state, int(time.time())),
+        _validators(state["version"]),
+    )
+
+
+async def watch_state(request, send):
+    version = handlers.watched_version(
+        request.args.get("version"), request.headers.get("if-none-match")
+    )
+    try:
+        timeout = handlers.watch_timeout(request.args.get("timeout"))
+    except ValueError:
+        return await send_json(send, 400, handlers.failed("timeout must be a number"))
+
+    # a waiting client holds no thread, only this coroutine
+    state = await events.async_wait_for_change(
+        request.args.get("sensor") or None, version, timeout, run_io
+    )
+    if state is None:
+        return await send_response(send, 304, headers=_validators(version))
+    await send_json(send, 200, state, _validators(state["version"]))
+
+
+ROUTES = {
+    ("POST", "/sensor/add_reading"): add_reading,
+    ("POST", "/sensor/add_readings"): add_readings,
+    ("POST", "/sensor/add_binary"): add_binary,
+    ("GET", "/api/controller_state"): controller_state,
+    ("GET", "/api/watch"): watch_state,
+}
+
+
+def _wsgi_environ(request):
+    scope = request.scope
+    server = scope.get("server") or ("localhost", 80)
+    environ = {
+        "REQUEST_METHOD": request.method,
+        "SCRIPT_NAME": scope.get("root_path", ""),
+        "PATH_INFO": request.path,
+        "QUERY_STRING": scope.get("query_string", b"").decode("latin-1"),
+        "SERVER_NAME": str(server[0]),
+        "SERVER_PORT": str(server[1]),
+        "SERVER_PROTOCOL": f"HTTP/{scope.get('http_version', '1.1')}",
+        "REMOTE_ADDR": (scope.get("client") or ("", 0))[0],
+        "CONTENT_LENGTH": str(len(request.body)),
+        "wsgi.version": (1, 0),
+        "wsgi.url_scheme": scope.get("scheme", "http"),
+        "wsgi.input": io.BytesIO(request.body),
+        "wsgi.errors": sys.stderr,
+        "wsgi.multithread": True,
+        "wsgi.multiprocess": False,
+        "wsgi.run_once": False,
+    }
+    for name, value in request.headers.items():
+        if name == "content-type":
+            environ["CONTENT_TYPE"] = value
+        elif name != "content-length":
+            key = "HTTP_" + name.upper().replace("-", "_")
+            environ[key] = f"{environ[key]},{value}" if key in environ else value
+    return environ
+
+
+async def call_flask(request, send):
+    """run the request through the Flask app, body chunks and all, in the pool"""
+    started = {}
+
+    def start_response(status, headers, exc_info=None):
+        started["status"] = int(status.split(" ", 1)[0])
+        started["headers"] = headers
+
+    body = await run_io(app.wsgi_app, _wsgi_environ(request), start_response)
+    chunks = iter(body)
+    try:
+        # streamed responses (exports) produce their chunks as they're read
+        first = await run_io(next, chunks, None)
+        await send(
+            {
+                "type": "http.response.start",
+                "status": started["status"],
+                "headers": [
+                    (name.lower().encode("latin-1"), value.encode("latin-1"))
+                    for name, value in started["headers"]
+                ],
+            }
+        )
+        chunk = first
+        while chunk is not None:
+            await send({"type": "http.response.body", "body": chunk, "more_body": True})
+            chunk = await run_io(next, chunks, None)
+        await send({"type": "http.response.body", "body": b""})
+    finally:
+        if hasattr(body, "close"):
+            await run_io(body.close)
+
+
+async def lifespan(receive, send):
+    while True:
+        message = await receive()
+        if message["type"] == "lifespan.startup":
+            await send({"type": "lifespan.startup.complete"})
+        elif message["type"] == "lifespan.shutdown":
+            if _executor is not None:
+                _executor.shutdown(wait=True)
+            await send({"type": "lifespan.shutdown.complete"})
+            return
+
+
+async def application(scope, receive, send):
+    if scope["type"] == "lifespan":
+        return await lifespan(receive, send)
+    if scope["type"] != "http":
+        return
+
+    try:
+        body = await read_body(receive, app.config["ASGI_MAX_BODY"])
+    except PayloadTooLarge:
+        return await send_json(send, 413, handlers.failed("request body too large"))
+
+    request = Request(scope, body)
+    handler = ROUTES.get((request.method, request.path), call_flask)
+    try:
+        await handler(request, send)
+    except Exception:
+        app.logger.exception("error handling %s %s", request.method, request.path)
+        await send_json(send, 500, handlers.failed("internal server error"))
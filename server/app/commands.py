@@ -0,0 +1,104 @@
+import os
+
+import click
+
+from app import app, udp
+from app.archive import Archive
+from app.ingest import stored_measurement
+from app.registry import SensorRegistry
+from app.sqlite_store import SQLiteStore
+from app.store import CSV_FILE, CSVStore, get_reading_store
+from app.timeutil import to_epoch
+
+
+@app.cli.command("import-csv")
+@click.argument("filename", default=CSV_FILE)
+@click.option("--append", is_flag=True, help="import even if the database has readings")
+def import_csv(filename, append):
+    """
+    load an existing readings.csv into the SQLite database, along with the
+    readings archived from it
+    """
+    existing = (
+        SQLiteStore.connection().execute("SELECT COUNT(*) FROM readings").fetchone()[0]
+    )
+    if existing and not append:
+        raise click.ClickException(
+            f"database already holds {existing} readings, pass --append to import anyway"
+        )
+
+    archived, boundary = 0, None
+    if os.path.abspath(filename) == os.path.abspath(CSVStore.filename):
+        # older readings of this file have been moved into the archive
+        archived, boundary = SQLiteStore.import_archive(), Archive.boundary()
+    imported, skipped = SQLiteStore.import_csv(filename, boundary)
+    SQLiteStore.rebuild_rollups()
+    if archived:
+        click.echo(f"imported {archived} archived readings")
+    click.echo(f"imported {imported} readings from {filename}")
+    if skipped:
+        click.echo(f"skipped {skipped} lines that aren't readings")
+
+
+@app.cli.command("rebuild-rollups")
+def rebuild_rollups():
+    """recompute the aggregate rollups from the full reading history"""
+    get_reading_store().rebuild_rollups()
+    click.echo("rollups rebuilt")
+
+
+@app.cli.command("compact-archive")
+@click.option(
+    "--age",
+    type=int,
+    default=None,
+    help="archive readings older than this many seconds (default ARCHIVE_AFTER)",
+)
+def compact_archive(age):
+    """move old readings out of readings.csv into the binary archive"""
+    age = age or app.config["ARCHIVE_AFTER"]
+    if not age:
+        raise click.ClickException("pass --age or set ARCHIVE_AFTER")
+    try:
+        archived = CSVStore.compact(age)
+    except ValueError as e:
+        raise click.ClickException(str(e))
+    click.echo(f"archived {archived} readings")
+
+
+@app.cli.command("listen-udp")
+@click.option("--host", default=None, help="address to bind (default UDP_HOST)")
+@click.option("--port", type=int, default=None, help="port (default UDP_PORT)")
+def listen_udp(host, port):
+    """store readings sent by sensors over UDP until interrupted"""
+    secret = app.config["UDP_SECRET"]
+    if not secret:
+        raise click.ClickException("set UDP_SECRET to the key the sensors sign with")
+    host = host or app.config["UDP_HOST"]
+    port = port or app.config["UDP_PORT"]
+    listener = udp.UDPListener(
+        udp.bind(host, port), secret.encode(), sequences_file=udp.SEQUENCES_FILE
+    )
+    click.echo(f"listening for sensor datagrams on {host}:{port}")
+    try:
+        listener.serve()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        listener.sock.close()
+    click.echo(", ".join(f"{n} {o}" for o, n in sorted(listener.counts.items())))
+
+
+@app.cli.command("rebuild-registry")
+def rebuild_registry():
+    """recreate the sensor registry from the full reading history"""
+    found = SensorRegistry.rebuild(
+        (
+            to_epoch(reading["timestamp"]),
+            reading["sensor_name"],
+            stored_measurement(reading["temperature"]),
+            stored_measurement(reading["humidity"]),
+        )
+        for reading in get_reading_store().iter_readings()
+    )
+    click.echo(f"registered {found} sensors")
@@ -0,0 +1,113 @@
+"""
+change notification for clients that want to hear about a new reading or
+setpoint as soon as it happens instead of polling on a timer.
+
+a client holds a version token for what it last saw (see `current_state`)
+and long-polls with it; the request returns as soon as the state behind the
+token differs. writes made in this process wake waiters straight away, and
+waiters also re-check every WATCH_POLL_INTERVAL seconds to catch writes
+made by other worker processes.
+"""
+
+import asyncio
+import json
+import threading
+import time
+import zlib
+
+from app import app
+from app.store import SettingsStore, get_reading_store
+from app.timeutil import to_isoformat
+
+_changed = threading.Condition()
+_generation = 0
+# (event loop, asyncio.Event) of every async_wait_for_change in progress
+_async_waiters = set()
+
+
+def notify():
+    """wake every waiter in this process, something has been written"""
+    global _generation
+    with _changed:
+        _generation += 1
+        _changed.notify_all()
+        for loop, changed in _async_waiters:
+            loop.call_soon_threadsafe(changed.set)
+
+
+def current_state(sensor_name):
+    """
+    the latest reading for a sensor (any sensor if None) and the setpoint,
+    along with a version token that changes whenever any of them does
+    """
+    reading = get_reading_store().get_last_reading(sensor_name)
+    state = {
+        "sensor": sensor_name,
+        "setpoint": SettingsStore.temp_setpoint(),
+        "timestamp": None,
+        "temperature": None,
+        "humidity": None,
+    }
+    if reading is not None:
+        state.update(
+            sensor=reading["location"],
+            timestamp=to_isoformat(reading["epoch"]),
+            temperature=reading["temperature"],
+            humidity=reading["humidity"],
+        )
+    content = json.dumps(state, sort_keys=True).encode()
+    state["version"] = f"{zlib.crc32(content):08x}"
+    return state
+
+
+def wait_for_change(sensor_name, version, timeout):
+    """
+    the current state as soon as its version differs from `version`, or None
+    if it still hasn't after `timeout` seconds
+    """
+    deadline = time.monotonic() + timeout
+    poll_interval = app.config["WATCH_POLL_INTERVAL"]
+    with _changed:
+        generation = _generation
+    while True:
+        state = current_state(sensor_name)
+        if state["version"] != version:
+            return state
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return None
+        with _changed:
+            if _generation == generation:
+                _changed.wait(min(remaining, poll_interval))
+            generation = _generation
+
+
+async def async_wait_for_change(sensor_name, version, timeout, run):
+    """
+    `wait_for_change` for code running on an asyncio event loop. the loop is
+    never blocked: `run(func, *args)` must run the state lookups off it and
+    be awaitable, e.g. a wrapper around `loop.run_in_executor`
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    poll_interval = app.config["WATCH_POLL_INTERVAL"]
+    changed = asyncio.Event()
+    waiter = (loop, changed)
+    with _changed:
+        _async_waiters.add(waiter)
+    try:
+        while True:
+            changed.clear()
+            state = await run(current_state, sensor_name)
+            if state["version"] != version:
+                return state
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                return None
+            try:
+                await asyncio.wait_for(changed.wait(), min(remaining, poll_interval))
+            except asyncio.TimeoutError:
+                pass
+    finally:
+        with _changed:
+            _async_waiters.discard(waiter)
@@ -0,0 +1,60 @@
+"""
+generator stages for streaming readings out of the store. each stage pulls
+from the one before it, so only a chunk's worth of rows is in memory at once
+"""
+
+import csv
+import io
+import json
+import zlib
+
+CHUNK_SIZE = 64 * 1024
+FIELDS = ["timestamp", "sensor_name", "temperature", "humidity"]
+
+
+def csv_lines(readings):
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=FIELDS)
+    writer.writeheader()
+    for reading in readings:
+        writer.writerow(reading)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    yield buffer.getvalue()
+
+
+def ndjson_lines(readings):
+    for reading in readings:
+        yield json.dumps(reading) + "\n"
+
+
+def chunked(lines, chunk_size=CHUNK_SIZE):
+    """join lines into encoded chunks of roughly `chunk_size` bytes"""
+    pending = []
+    pending_size = 0
+    for line in lines:
+        data = line.encode()
+        pending.append(data)
+        pending_size += len(data)
+        if pending_size >= chunk_size:
+            yield b"".join(pending)
+            pending = []
+            pending_size = 0
+    if pending:
+        yield b"".join(pending)
+
+
+def gzipped(chunks):
+    compressor = zlib.compressobj(wbits=zlib.MAX_WBITS | 16)
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+FORMATS = {
+    "csv": (csv_lines, "text/csv"),
+    "ndjson": (ndjson_lines, "application/x-ndjson"),
+}
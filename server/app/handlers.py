@@ -0,0 +1,126 @@
+"""
+the sensor upload and controller endpoints, apart from the web framework.
+
+both the Flask routes (app.routes) and the asyncio front end (app.asgi) serve
+these, so the two only translate requests and responses and can't drift
+apart. handlers take the decoded request and return a JSON-able body (None
+for an empty one) and a status code. the upload handlers touch the store, so
+the ASGI front end runs them in its I/O pool.
+"""
+
+from werkzeug.http import parse_etags
+
+from app import app
+from app.ingest import (
+    parse_bulk,
+    parse_packed,
+    parse_single,
+    record_readings,
+    stored_measurement,
+)
+
+
+def failed(message):
+    return {"status": "failed", "message": message}
+
+
+def add_reading(payload, now):
+    """/sensor/add_reading: store one reading taken `now`"""
+    # TODO: add authentication
+    if (
+        not isinstance(payload, dict)
+        or "sensor_name" not in payload
+        or "sensor_id" not in payload
+    ):
+        return failed("sensor_name and sensor_id needed"), 400
+
+    try:
+        reading = parse_single(payload["sensor_name"], payload, now)
+    except ValueError as e:
+        return failed(str(e)), 400
+
+    record_readings([reading], payload["sensor_id"])
+    return {"status": "success"}, 200
+
+
+def add_readings(payload, now):
+    """
+    /sensor/add_readings: store several readings buffered by a sensor in one
+    go. each reading gets its own entry in `results`, in the order they were
+    sent
+    """
+    # TODO: add authentication
+    if (
+        not isinstance(payload, dict)
+        or "sensor_name" not in payload
+        or "sensor_id" not in payload
+        or not isinstance(payload.get("readings"), list)
+    ):
+        return failed("sensor_name, sensor_id and readings needed"), 400
+
+    items = payload["readings"]
+    if len(items) > app.config["BULK_MAX_READINGS"]:
+        return (
+            failed(f"at most {app.config['BULK_MAX_READINGS']} readings per request"),
+            413,
+        )
+
+    readings, summary, code = parse_bulk(payload["sensor_name"], items, now)
+    if readings:
+        record_readings(readings, payload["sensor_id"])
+    return summary, code
+
+
+def add_binary(data, now):
+    """
+    /sensor/add_binary: the binary counterpart of /sensor/add_readings for
+    memory-starved sensors (see app.packet). a fully accepted upload gets an
+    empty 204
+    """
+    # TODO: add authentication
+    try:
+        sensor_id, readings, summary, code = parse_packed(data, now)
+    except ValueError as e:
+        return failed(str(e)), 400
+
+    if readings:
+        record_readings(readings, sensor_id)
+    if summary["rejected"]:
+        return summary, code
+    return None, 204
+
+
+def controller_state(state, now):
+    """the /api/controller_state body for a state from events.current_state"""
+    return {
+        "temperature": stored_measurement(state["temperature"]),
+        "humidity": stored_measurement(state["humidity"]),
+        "setpoint": state["setpoint"],
+        "time": now,
+        "version": state["version"],
+    }
+
+
+def etag_matches(if_none_match, etag):
+    """whether an If-None-Match header (or None) names `etag`"""
+    return bool(if_none_match) and parse_etags(if_none_match).contains(etag)
+
+
+def watched_version(version, if_none_match):
+    """
+    the version an /api/watch client last saw: the `version` argument, or
+    failing that the tag it sent in If-None-Match
+    """
+    if version is None and if_none_match:
+        version = next(iter(parse_etags(if_none_match).as_set()), None)
+    return version
+
+
+def watch_timeout(value):
+    """
+    how long an /api/watch request may be held, from its `timeout` argument.
+    raises ValueError if it isn't a number
+    """
+    if value is None:
+        value = app.config["WATCH_TIMEOUT"]
+    return max(0, min(float(value), app.config["WATCH_MAX_TIMEOUT"]))
@@ -0,0 +1,99 @@
+"""
+which sensors are still reporting. a sensor is offline once its newest
+reading is more than OFFLINE_AFTER times SENSOR_INTERVAL seconds old.
+
+last-seen times come from the sensor registry, so a check is one pass over
+the registered sensors and never touches the reading history. a background
+thread re-checks every HEALTH_CHECK_INTERVAL seconds and logs sensors going
+offline and coming back, whether or not anyone is looking at the dashboard.
+"""
+
+import atexit
+import threading
+import time
+
+from app import app
+from app.registry import SensorRegistry
+
+_monitor = None
+_monitor_lock = threading.Lock()
+
+
+def max_silence():
+    """seconds without a reading after which a sensor counts as offline"""
+    return int(app.config["SENSOR_INTERVAL"] * app.config["OFFLINE_AFTER"])
+
+
+def sensor_status(entry, now, max_age):
+    """
+    a registry entry along with how long the sensor has been quiet and
+    whether that makes it offline
+    """
+    age = max(0, now - entry["last_seen"])
+    offline = age > max_age
+    return {
+        **entry,
+        "age": age,
+        "online": not offline,
+        "offline_since": entry["last_seen"] + max_age if offline else None,
+    }
+
+
+class SensorMonitor:
+    """
+    background thread checking every sensor's status every `interval`
+    seconds, logging when one goes offline or comes back
+    """
+
+    def __init__(self, max_age, interval):
+        self.max_age = max_age
+        self.interval = interval
+        # names of the sensors found offline by the last check
+        self._offline = set()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def check(self, now=None):
+        """every registered sensor's status as of `now`, by name"""
+        now = int(time.time()) if now is None else now
+        statuses = [
+            sensor_status(entry, now, self.max_age)
+            for entry in SensorRegistry.sensors()
+        ]
+        offline = {status["name"] for status in statuses if not status["online"]}
+        with self._lock:
+            for name in sorted(offline - self._offline):
+                app.logger.warning(
+                    "sensor %s is offline, nothing heard for over %ds",
+                    name,
+                    self.max_age,
+                )
+            for name in sorted(self._offline - offline):
+                app.logger.info("sensor %s is reporting again", name)
+            self._offline = offline
+        return statuses
+
+    def close(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.check()
+            except Exception:
+                app.logger.exception("sensor health check failed")
+
+
+def get_monitor():
+    """the process-wide sensor monitor, started on first use"""
+    global _monitor
+    with _monitor_lock:
+        if _monitor is None:
+            _monitor = SensorMonitor(
+                max_age=max_silence(), interval=app.config["HEALTH_CHECK_INTERVAL"]
+            )
+            atexit.register(_monitor.close)
+    return _monitor
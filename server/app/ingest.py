@@ -0,0 +1,209 @@
+import atexit
+import math
+import numbers
+import threading
+
+from app import app, events, packet
+from app.health import get_monitor
+from app.archive import Compactor
+from app.registry import SensorRegistry
+from app.store import CSVStore, get_reading_store
+from app.write_buffer import WriteBehindBuffer
+
+_write_buffer = None
+_write_buffer_lock = threading.Lock()
+_compactor = None
+_compactor_lock = threading.Lock()
+
+
+def get_write_buffer():
+    """the process-wide write-behind buffer, or None if WRITE_BEHIND is off"""
+    global _write_buffer
+    if not app.config["WRITE_BEHIND"]:
+        return None
+    with _write_buffer_lock:
+        if _write_buffer is None:
+            _write_buffer = WriteBehindBuffer(
+                get_reading_store(),
+                max_batch=app.config["WRITE_BEHIND_MAX_BATCH"],
+                max_delay=app.config["WRITE_BEHIND_MAX_DELAY"],
+                durability=app.config["WRITE_DURABILITY"],
+            )
+            atexit.register(_write_buffer.close)
+    return _write_buffer
+
+
+def get_compactor():
+    """
+    the process-wide background archive compaction, started on first use, or
+    None if ARCHIVE_AFTER is off or the backend isn't the CSV one
+    """
+    global _compactor
+    if not app.config["ARCHIVE_AFTER"] or get_reading_store() is not CSVStore:
+        return None
+    with _compactor_lock:
+        if _compactor is None:
+            _compactor = Compactor(
+                CSVStore.compact,
+                max_age=app.config["ARCHIVE_AFTER"],
+                interval=app.config["ARCHIVE_INTERVAL"],
+            )
+            atexit.register(_compactor.close)
+    return _compactor
+
+
+def record_readings(readings, sensor_id=None):
+    """
+    store `(epoch_timestamp, sensor_name, temperature, humidity)` tuples
+    coming in from sensors, through the write-behind buffer if it's enabled.
+    once they are stored, note the sensor (`sensor_id` if it sent one) in the
+    registry and wake anyone watching for changes
+    """
+    get_compactor()
+    get_monitor()
+
+    def stored():
+        SensorRegistry.record(readings, sensor_id)
+        events.notify()
+
+    write_buffer = get_write_buffer()
+    if write_buffer is not None:
+        write_buffer.submit(readings, on_written=stored)
+    else:
+        get_reading_store().add_sensor_readings(
+            readings, fsync=app.config["WRITE_DURABILITY"] == "fsync"
+        )
+        stored()
+
+
+def stored_measurement(value):
+    """
+    a measurement read back from storage as a float, or None if it is missing.
+    rows written before readings were validated can hold anything, and that
+    counts as missing too
+    """
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        return None
+    return value if math.isfinite(value) else None
+
+
+def _measurement(item, key):
+    value = item.get(key)
+    if value is None:
+        return None
+    if isinstance(value, bool) or not isinstance(value, numbers.Real):
+        raise ValueError(f"{key} must be a number")
+    return value
+
+
+def parse_reading(sensor_name, item, now):
+    """
+    validate one entry of a bulk upload and turn it into a reading tuple.
+    entries carry either an absolute `timestamp` (epoch seconds) or an `age`
+    in seconds before `now`, for sensors without a synced clock
+    """
+    if not isinstance(item, dict):
+        raise ValueError("reading must be an object")
+
+    if "timestamp" in item:
+        timestamp = item["timestamp"]
+        if isinstance(timestamp, bool) or not isinstance(timestamp, numbers.Real):
+            raise ValueError("timestamp must be epoch seconds")
+    elif "age" in item:
+        age = item["age"]
+        if isinstance(age, bool) or not isinstance(age, numbers.Real) or age < 0:
+            raise ValueError("age must be a non-negative number of seconds")
+        timestamp = now - age
+    else:
+        raise ValueError("reading needs a timestamp or an age")
+
+    timestamp = int(timestamp)
+    if timestamp > now + app.config["MAX_CLOCK_SKEW"]:
+        raise ValueError("timestamp is in the future")
+    if timestamp < now - app.config["MAX_BACKFILL_AGE"]:
+        raise ValueError("timestamp is too old")
+
+    return (
+        timestamp,
+        sensor_name,
+        _measurement(item, "temperature"),
+        _measurement(item, "humidity"),
+    )
+
+
+def parse_single(sensor_name, payload, now):
+    """
+    validate the measurements of a /sensor/add_reading upload, taken `now`,
+    and turn it into a reading tuple
+    """
+    return (
+        now,
+        sensor_name,
+        _measurement(payload, "temperature"),
+        _measurement(payload, "humidity"),
+    )
+
+
+def parse_bulk(sensor_name, items, now):
+    """
+    validate every entry of a bulk upload. returns the valid readings in time
+    order, a response body with a result per entry in the order they were
+    sent, and the status code to answer with
+    """
+    readings = []
+    results = []
+    for item in items:
+        try:
+            readings.append(parse_reading(sensor_name, item, now))
+        except ValueError as e:
+            results.append({"status": "failed", "message": str(e)})
+        else:
+            results.append({"status": "success"})
+
+    # keep the stored history in time order even if the sensor didn't
+    readings.sort(key=lambda reading: reading[0])
+
+    if not readings and items:
+        status, code = "failed", 400
+    elif len(readings) < len(items):
+        status, code = "partial", 200
+    else:
+        status, code = "success", 200
+
+    summary = {
+        "status": status,
+        "accepted": len(readings),
+        "rejected": len(items) - len(readings),
+        "results": results,
+    }
+    return readings, summary, code
+
+
+def parse_packed(data, now):
+    """
+    validate an upload in the binary format of app.packet. returns the
+    sensor id it was sent with followed by what `parse_bulk` returns; raises
+    ValueError if the payload itself is unusable
+    """
+    sensor_id, sensor_name, samples = packet.decode(data)
+    return (sensor_id, *parse_samples(sensor_name, samples, now))
+
+
+def parse_samples(sensor_name, samples, now):
+    """
+    `parse_packed` for a payload already decoded into (age, temperature,
+    humidity) samples
+    """
+    if not samples:
+        raise ValueError("payload holds no readings")
+    if len(samples) > app.config["BULK_MAX_READINGS"]:
+        raise ValueError(
+            f"at most {app.config['BULK_MAX_READINGS']} readings per request"
+        )
+    items = [
+        {"age": age, "temperature": temperature, "humidity": humidity}
+        for age, temperature, humidity in samples
+    ]
+    return parse_bulk(sensor_name, items, now)
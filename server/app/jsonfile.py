@@ -0,0 +1,76 @@
+"""
+small JSON files that every worker process reads and writes, such as
+settings.json and sensors.json.
+
+writers hold `locked(filename)`, an flock shared by every process, for the
+whole read-modify-write, and `save` replaces the file atomically so readers
+never see half of one. readers cache what they read against the file's
+`signature` and only read it again once that changes.
+"""
+
+import contextlib
+import fcntl
+import json
+import os
+import threading
+
+
+def signature(filename):
+    """
+    the (inode, size, mtime) of the file. every save replaces the file, so
+    this changes with every write. raises FileNotFoundError if it's missing
+    """
+    stat = os.stat(filename)
+    return stat.st_ino, stat.st_size, stat.st_mtime_ns
+
+
+def load(filename):
+    with open(filename, "r") as json_file:
+        return json.load(json_file)
+
+
+@contextlib.contextmanager
+def locked(filename):
+    """
+    hold an exclusive lock on `filename` shared by every worker process, so a
+    read-modify-write of it can't lose someone else's update. the lock isn't
+    re-entrant, not even within a process
+    """
+    with open(filename + ".lock", "a") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        yield
+
+
+def save(filename, data, fsync=False):
+    """
+    write a new file and rename it over the old one, so readers see either
+    the old contents or the new ones and never half of each. with `fsync`,
+    don't return until it's on disk. returns the new file's signature
+    """
+    os.replace(_write_temporary(filename, data, fsync), filename)
+    return signature(filename)
+
+
+def create(filename, data, fsync=False):
+    """
+    write `data` to `filename` unless it already exists. linking the new file
+    into place fails if someone got there first, so this needs no lock and is
+    safe to call while holding `locked`
+    """
+    temporary = _write_temporary(filename, data, fsync)
+    try:
+        os.link(temporary, filename)
+    except FileExistsError:
+        pass
+    finally:
+        os.unlink(temporary)
+
+
+def _write_temporary(filename, data, fsync):
+    temporary = f"{filename}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(temporary, "w") as json_file:
+        json.dump(data, json_file)
+        if fsync:
+            json_file.flush()
+            os.fsync(json_file.fileno())
+    return temporary
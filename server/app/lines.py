@@ -0,0 +1,93 @@
+"""
+helpers for reading append-only, line oriented files (readings.csv, rollups)
+by byte offset, without loading them whole
+"""
+
+import os
+
+READ_BLOCK_SIZE = 64 * 1024
+
+
+def reverse_lines(binary_file, end, block_size=READ_BLOCK_SIZE):
+    """
+    yield `(offset, line)` for every line before `end`, newest first.
+    the file is read backwards in `block_size` chunks, so only the lines that
+    are actually consumed are ever read. `end` must fall on a line boundary.
+    """
+    position = end
+    buffer = b""
+    while position > 0:
+        read_size = min(block_size, position)
+        position -= read_size
+        binary_file.seek(position)
+        buffer = binary_file.read(read_size) + buffer
+        lines = buffer.split(b"\n")
+        # the first piece may be the tail of a line that started in an
+        # earlier block. hold on to it until the rest has been read
+        buffer = lines[0]
+        line_end = position + sum(len(line) + 1 for line in lines)
+        for line in reversed(lines[1:]):
+            line_end -= len(line) + 1
+            if line:
+                yield line_end, line
+
+    if buffer:
+        yield 0, buffer
+
+
+def forward_lines(binary_file, offset):
+    """
+    yield `(next_offset, line)` for every complete line from `offset` on.
+    a trailing line without a newline is still being written and is skipped
+    """
+    binary_file.seek(offset)
+    for line in binary_file:
+        if not line.endswith(b"\n"):
+            return
+        offset += len(line)
+        yield offset, line
+
+
+def line_boundary(binary_file, size, block_size=READ_BLOCK_SIZE):
+    """offset just past the last complete line in the first `size` bytes"""
+    position = size
+    while position > 0:
+        start = max(0, position - block_size)
+        binary_file.seek(start)
+        newline = binary_file.read(position - start).rfind(b"\n")
+        if newline >= 0:
+            return start + newline + 1
+        position = start
+    return 0
+
+
+def bisect_lines(binary_file, key, target):
+    """
+    binary search for the offset of the first complete line whose `key(line)`
+    is at least `target`, treating the file as sorted by that key
+    """
+
+    def line_start(position):
+        # offset of the first line starting at or after `position`
+        if position == 0:
+            return 0
+        binary_file.seek(position - 1)
+        binary_file.readline()
+        return binary_file.tell()
+
+    def is_before(position):
+        binary_file.seek(position)
+        line = binary_file.readline()
+        if not line.endswith(b"\n"):
+            return False
+        return key(line) < target
+
+    low = 0
+    high = binary_file.seek(0, os.SEEK_END)
+    while low < high:
+        middle = (low + high) // 2
+        if is_before(line_start(middle)):
+            low = middle + 1
+        else:
+            high = middle
+    return line_start(low)
@@ -0,0 +1,93 @@
+"""
+the compact binary sensor payload accepted by /sensor/add_binary, written by
+client/sensor/packet.py. version 1, little endian:
+
+    header   version (B), length of sensor name (B), sensor id (H)
+    name     sensor name, utf-8
+    reading  seconds since taken (I), temperature * 10 (h), humidity * 10 (H),
+             once per reading
+
+a missing temperature is -32768, a missing humidity 0xffff.
+
+over UDP a payload is wrapped in a datagram of its sequence number (I), the
+payload and the first MAC_SIZE bytes of an HMAC-SHA256 of the two
+"""
+
+import hashlib
+import hmac
+import struct
+
+VERSION = 1
+HEADER = struct.Struct("<BBH")
+READING = struct.Struct("<IhH")
+NO_TEMPERATURE = -32768
+NO_HUMIDITY = 0xFFFF
+CONTENT_TYPE = "application/octet-stream"
+SEQUENCE = struct.Struct("<I")
+MAC_SIZE = 16
+
+
+def encode(sensor_id, sensor_name, readings):
+    """the payload for a list of (age, temperature, humidity) tuples"""
+    name = sensor_name.encode()
+    parts = [HEADER.pack(VERSION, len(name), sensor_id), name]
+    for age, temperature, humidity in readings:
+        parts.append(
+            READING.pack(
+                max(0, int(age)),
+                NO_TEMPERATURE if temperature is None else round(temperature * 10),
+                NO_HUMIDITY if humidity is None else round(humidity * 10),
+            )
+        )
+    return b"".join(parts)
+
+
+def decode(data):
+    """
+    `(sensor_id, sensor_name, [(age, temperature, humidity), ...])` from a
+    payload. raises ValueError if it is malformed or of another version
+    """
+    if len(data) < HEADER.size:
+        raise ValueError("payload too short")
+    version, name_length, sensor_id = HEADER.unpack_from(data)
+    if version != VERSION:
+        raise ValueError(f"unsupported payload version {version}")
+    start = HEADER.size + name_length
+    body = len(data) - start
+    if body < 0 or body % READING.size:
+        raise ValueError("payload length doesn't match its contents")
+    try:
+        sensor_name = data[HEADER.size : start].decode()
+    except UnicodeDecodeError:
+        raise ValueError("sensor name isn't utf-8") from None
+
+    readings = [
+        (
+            age,
+            None if temperature == NO_TEMPERATURE else temperature / 10,
+            None if humidity == NO_HUMIDITY else humidity / 10,
+        )
+        for age, temperature, humidity in READING.iter_unpack(data[start:])
+    ]
+    return sensor_id, sensor_name, readings
+
+
+def sign(sequence, payload, key):
+    """a UDP datagram carrying `payload`, numbered and authenticated"""
+    message = SEQUENCE.pack(sequence & 0xFFFFFFFF) + payload
+    return message + hmac.new(key, message, hashlib.sha256).digest()[:MAC_SIZE]
+
+
+def verify(datagram, key):
+    """
+    `(sequence, payload)` from a datagram made by `sign`. raises ValueError if
+    it is too short or its MAC doesn't check out
+    """
+    if len(datagram) < SEQUENCE.size + MAC_SIZE:
+        raise ValueError("datagram too short")
+    message, mac = datagram[:-MAC_SIZE], datagram[-MAC_SIZE:]
+    expected = hmac.new(key, message, hashlib.sha256).digest()[:MAC_SIZE]
+    if not hmac.compare_digest(mac, expected):
+        raise ValueError("datagram failed authentication")
+    (sequence,) = SEQUENCE.unpack_from(message)
+    return sequence, message[SEQUENCE.size :]
@@ -0,0 +1,166 @@
+"""
+every sensor that has sent a reading, filled in as readings are recorded.
+
+an entry holds the sensor's name and id, when it was first and last heard
+from, and its latest temperature and humidity, so a page listing every sensor
+is one lookup per sensor instead of a search of the reading history.
+
+entries live in memory and are written to sensors.json when a new sensor
+turns up, and otherwise at most every REGISTRY_FLUSH_INTERVAL seconds, so a
+reading doesn't cost a file write. each worker process merges its updates
+into the file rather than overwriting it.
+"""
+
+import atexit
+import threading
+import time
+
+from app import app, jsonfile
+
+SENSORS_FILE = "./sensors.json"
+
+
+def _merge(entry, other):
+    """combine two entries for the same sensor, keeping the newest values"""
+    merged = dict(entry)
+    merged["first_seen"] = min(entry["first_seen"], other["first_seen"])
+    if other["last_seen"] >= entry["last_seen"]:
+        merged.update(
+            last_seen=other["last_seen"],
+            temperature=other["temperature"],
+            humidity=other["humidity"],
+        )
+        if other["id"] is not None:
+            merged["id"] = other["id"]
+    elif merged["id"] is None:
+        merged["id"] = other["id"]
+    return merged
+
+
+class SensorRegistry:
+    filename = SENSORS_FILE
+
+    # name -> entry, as of the last load merged with the updates since.
+    # `_signature` is the (inode, size, mtime) of the file as last read and
+    # `_pending` the names updated in this process but not yet written
+    _sensors = {}
+    _signature = None
+    _pending = set()
+    _saved_at = 0
+    _lock = threading.RLock()
+
+    @classmethod
+    def record(cls, readings, sensor_id=None):
+        """
+        note `(epoch_timestamp, sensor_name, temperature, humidity)` tuples
+        just recorded, all sent by the sensor with `sensor_id` if it's known
+        """
+        with cls._lock:
+            cls._load()
+            discovered = False
+            for timestamp, sensor_name, temperature, humidity in readings:
+                update = {
+                    "name": sensor_name,
+                    "id": sensor_id,
+                    "first_seen": int(timestamp),
+                    "last_seen": int(timestamp),
+                    "temperature": temperature,
+                    "humidity": humidity,
+                }
+                entry = cls._sensors.get(sensor_name)
+                if entry is None:
+                    cls._sensors[sensor_name] = update
+                    discovered = True
+                else:
+                    cls._sensors[sensor_name] = _merge(entry, update)
+                cls._pending.add(sensor_name)
+
+            interval = app.config["REGISTRY_FLUSH_INTERVAL"]
+            if discovered or time.monotonic() - cls._saved_at >= interval:
+                cls.flush()
+
+    @classmethod
+    def sensors(cls):
+        """every known sensor's entry, by name"""
+        with cls._lock:
+            cls._load()
+            return [dict(cls._sensors[name]) for name in sorted(cls._sensors)]
+
+    @classmethod
+    def get(cls, sensor_name):
+        """the entry for one sensor, or None if it has never been heard from"""
+        with cls._lock:
+            cls._load()
+            entry = cls._sensors.get(sensor_name)
+            return dict(entry) if entry is not None else None
+
+    @classmethod
+    def flush(cls):
+        """write the updates made in this process out to the file"""
+        with cls._lock:
+            if not cls._pending:
+                return
+            with jsonfile.locked(cls.filename):
+                # pick up what other workers wrote since we last looked
+                cls._load()
+                cls._save(cls._sensors)
+            cls._pending = set()
+            cls._saved_at = time.monotonic()
+
+    @classmethod
+    def rebuild(cls, readings):
+        """
+        replace the registry with one built from `(epoch_timestamp,
+        sensor_name, temperature, humidity)` tuples, e.g. the whole history
+        """
+        sensors = {}
+        for timestamp, sensor_name, temperature, humidity in readings:
+            update = {
+                "name": sensor_name,
+                "id": None,
+                "first_seen": int(timestamp),
+                "last_seen": int(timestamp),
+                "temperature": temperature,
+                "humidity": humidity,
+            }
+            entry = sensors.get(sensor_name)
+            sensors[sensor_name] = update if entry is None else _merge(entry, update)
+
+        with cls._lock, jsonfile.locked(cls.filename):
+            # ids aren't in the history, keep the ones already known
+            cls._load()
+            for name, entry in sensors.items():
+                if name in cls._sensors:
+                    entry["id"] = cls._sensors[name]["id"]
+            cls._sensors = sensors
+            cls._pending = set()
+            cls._save(sensors)
+        return len(sensors)
+
+    @classmethod
+    def _load(cls):
+        try:
+            signature = jsonfile.signature(cls.filename)
+        except FileNotFoundError:
+            return
+        if signature == cls._signature:
+            return
+
+        stored = jsonfile.load(cls.filename)
+        sensors = {entry["name"]: entry for entry in stored["sensors"]}
+        for name in cls._pending:
+            if name in sensors:
+                sensors[name] = _merge(sensors[name], cls._sensors[name])
+            else:
+                sensors[name] = cls._sensors[name]
+        cls._sensors = sensors
+        cls._signature = signature
+
+    @classmethod
+    def _save(cls, sensors):
+        cls._signature = jsonfile.save(
+            cls.filename, {"sensors": list(sensors.values())}
+        )
+
+
+atexit.register(SensorRegistry.flush)
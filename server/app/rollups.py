@@ -0,0 +1,278 @@
+"""
+per-sensor min/max/mean/count of temperature and humidity over fixed time
+buckets, kept up to date as readings are stored so trend queries don't have
+to touch the raw history
+"""
+
+import csv
+import fcntl
+import os
+import threading
+
+from app import app
+from app.lines import bisect_lines, forward_lines
+
+ROLLUP_DIR = "./rollups"
+RESOLUTIONS = {"1m": 60, "5m": 5 * 60, "1h": 60 * 60, "1d": 24 * 60 * 60}
+
+
+def _number(value):
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+
+class Aggregate:
+    """running totals for one sensor over one bucket. aggregates merge freely"""
+
+    FIELDS = (
+        "count",
+        "t_count",
+        "t_min",
+        "t_max",
+        "t_sum",
+        "h_count",
+        "h_min",
+        "h_max",
+        "h_sum",
+    )
+    __slots__ = FIELDS
+
+    def __init__(self):
+        self.count = self.t_count = self.h_count = 0
+        self.t_sum = self.h_sum = 0.0
+        self.t_min = self.t_max = self.h_min = self.h_max = None
+
+    def add(self, temperature, humidity):
+        self.count += 1
+        temperature = _number(temperature)
+        if temperature is not None:
+            self.t_count += 1
+            self.t_sum += temperature
+            self.t_min = (
+                temperature if self.t_min is None else min(self.t_min, temperature)
+            )
+            self.t_max = (
+                temperature if self.t_max is None else max(self.t_max, temperature)
+            )
+        humidity = _number(humidity)
+        if humidity is not None:
+            self.h_count += 1
+            self.h_sum += humidity
+            self.h_min = humidity if self.h_min is None else min(self.h_min, humidity)
+            self.h_max = humidity if self.h_max is None else max(self.h_max, humidity)
+
+    def merge(self, other):
+        self.count += other.count
+        self.t_count += other.t_count
+        self.t_sum += other.t_sum
+        self.h_count += other.h_count
+        self.h_sum += other.h_sum
+        for field, pick in (
+            ("t_min", min),
+            ("t_max", max),
+            ("h_min", min),
+            ("h_max", max),
+        ):
+            mine, theirs = getattr(self, field), getattr(other, field)
+            if mine is None or (theirs is not None and pick(mine, theirs) != mine):
+                setattr(self, field, theirs)
+
+    def to_row(self):
+        return [getattr(self, field) for field in self.FIELDS]
+
+    @classmethod
+    def from_row(cls, values):
+        aggregate = cls()
+        for field, value in zip(cls.FIELDS, values):
+            if field.endswith("count"):
+                setattr(aggregate, field, int(value))
+            else:
+                setattr(aggregate, field, _number(value))
+        aggregate.t_sum = aggregate.t_sum or 0.0
+        aggregate.h_sum = aggregate.h_sum or 0.0
+        return aggregate
+
+    def summary(self, sensor_name, bucket):
+        return {
+            "sensor_name": sensor_name,
+            "bucket": bucket,
+            "count": self.count,
+            "temperature_min": self.t_min,
+            "temperature_max": self.t_max,
+            "temperature_mean": self.t_sum / self.t_count if self.t_count else None,
+            "humidity_min": self.h_min,
+            "humidity_max": self.h_max,
+            "humidity_mean": self.h_sum / self.h_count if self.h_count else None,
+        }
+
+
+def bucket_start(timestamp, resolution):
+    seconds = RESOLUTIONS[resolution]
+    return timestamp - timestamp % seconds
+
+
+def aggregate_readings(readings):
+    """
+    fold `(epoch_timestamp, sensor_name, temperature, humidity)` tuples into
+    {(resolution, sensor_name, bucket): Aggregate}
+    """
+    aggregates = {}
+    for timestamp, sensor_name, temperature, humidity in readings:
+        for resolution in RESOLUTIONS:
+            key = (resolution, sensor_name, bucket_start(timestamp, resolution))
+            aggregate = aggregates.get(key)
+            if aggregate is None:
+                aggregate = aggregates[key] = Aggregate()
+            aggregate.add(temperature, humidity)
+    return aggregates
+
+
+def summarize(aggregates):
+    """{(sensor_name, bucket): Aggregate} as a list of dicts, by sensor then time"""
+    return [aggregates[key].summary(*key) for key in sorted(aggregates)]
+
+
+class RollupFiles:
+    """
+    rollups for the CSV backend: an append-only file per resolution holding
+    partial aggregates, which are merged by (sensor, bucket) when read.
+
+    each process folds the readings it stores into pending aggregates and
+    appends them at most ROLLUP_FLUSH_INTERVAL seconds later (0 appends them
+    with every batch), so a file gets about one row per sensor per bucket per
+    interval rather than one per reading, every worker sees the others'
+    readings within the interval, and a process that dies loses at most that
+    much. a read in this process also counts what it hasn't written yet.
+    """
+
+    directory = ROLLUP_DIR
+    # (resolution, sensor_name, bucket) -> Aggregate not yet written out
+    _pending = {}
+    _timer = None
+    _lock = threading.Lock()
+
+    @classmethod
+    def path(cls, resolution):
+        return os.path.join(cls.directory, f"rollup_{resolution}.csv")
+
+    @classmethod
+    def add(cls, readings):
+        if not readings:
+            return
+        interval = app.config["ROLLUP_FLUSH_INTERVAL"]
+        with cls._lock:
+            for key, aggregate in aggregate_readings(readings).items():
+                if key in cls._pending:
+                    cls._pending[key].merge(aggregate)
+                else:
+                    cls._pending[key] = aggregate
+            if interval > 0 and cls._timer is None:
+                cls._timer = threading.Timer(interval, cls.flush)
+                cls._timer.daemon = True
+                cls._timer.start()
+        if interval <= 0:
+            cls.flush()
+
+    @classmethod
+    def flush(cls):
+        """write out the pending aggregates, e.g. at shutdown"""
+        appends = {resolution: [] for resolution in RESOLUTIONS}
+        with cls._lock:
+            if cls._timer is not None:
+                cls._timer.cancel()
+                cls._timer = None
+            for (resolution, sensor_name, bucket), aggregate in cls._pending.items():
+                appends[resolution].append([bucket, sensor_name] + aggregate.to_row())
+            cls._pending = {}
+            cls._append(appends)
+
+    @classmethod
+    def _append(cls, appends):
+        for resolution, rows in appends.items():
+            if not rows:
+                continue
+            os.makedirs(cls.directory, exist_ok=True)
+            rows.sort(key=lambda row: row[0])
+            with open(cls.path(resolution), "a") as rollup_file:
+                fcntl.flock(rollup_file, fcntl.LOCK_EX)
+                csv.writer(rollup_file).writerows(rows)
+
+    @classmethod
+    def get_aggregates(cls, sensor_name, start, end, resolution):
+        seconds = RESOLUTIONS[resolution]
+        if start is not None:
+            start = bucket_start(start, resolution)
+        merged = {}
+
+        def include(row_sensor, bucket):
+            return (
+                (sensor_name is None or row_sensor == sensor_name)
+                and (start is None or bucket >= start)
+                and (end is None or bucket < end)
+            )
+
+        # rows can be out of bucket order by a bucket plus however late a
+        # backfilled reading may arrive and how long it may then be pending
+        slack = (
+            seconds
+            + app.config["MAX_BACKFILL_AGE"]
+            + app.config["ROLLUP_FLUSH_INTERVAL"]
+        )
+        path = cls.path(resolution)
+        if os.path.exists(path):
+            with open(path, "rb") as rollup_file:
+                offset = 0
+                if start is not None:
+                    offset = bisect_lines(
+                        rollup_file,
+                        lambda line: int(line.split(b",", 1)[0]),
+                        start - slack,
+                    )
+                for _, line in forward_lines(rollup_file, offset):
+                    row = line.decode().strip().split(",")
+                    bucket, row_sensor = int(row[0]), row[1]
+                    if end is not None and bucket >= end + slack:
+                        break
+                    if not include(row_sensor, bucket):
+                        continue
+                    aggregate = Aggregate.from_row(row[2:])
+                    key = (row_sensor, bucket)
+                    if key in merged:
+                        merged[key].merge(aggregate)
+                    else:
+                        merged[key] = aggregate
+
+        with cls._lock:
+            for key, aggregate in cls._pending.items():
+                pending_resolution, row_sensor, bucket = key
+                if pending_resolution != resolution or not include(row_sensor, bucket):
+                    continue
+                key = (row_sensor, bucket)
+                if key not in merged:
+                    merged[key] = Aggregate()
+                merged[key].merge(aggregate)
+
+        return summarize(merged)
+
+    @classmethod
+    def rebuild(cls, readings):
+        """recompute every rollup file from scratch from an iterable of readings"""
+        with cls._lock:
+            cls._pending = {}
+            os.makedirs(cls.directory, exist_ok=True)
+            for resolution in RESOLUTIONS:
+                if os.path.exists(cls.path(resolution)):
+                    os.remove(cls.path(resolution))
+        batch = []
+        for reading in readings:
+            batch.append(reading)
+            if len(batch) >= 10000:
+                cls.add(batch)
+                cls.flush()
+                batch = []
+        cls.add(batch)
+        cls.flush()
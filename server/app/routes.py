@@ -1,11 +1,26 @@
-import datetime
+import calendar
+import time
+import zlib
 
-import pytz
-from flask import abort, flash, jsonify, redirect, render_template, request, url_for
+from flask import (
+    Response,
+    flash,
+    jsonify,
+    redirect,
+    render_template,
+    request,
+    stream_with_context,
+    url_for,
+)
 
-from app import app
+from app import app, events, handlers
+from app.export import FORMATS, chunked, gzipped
 from app.forms import LoginForm
-from app.store import CSVStore, SettingsStore
+from app.rollups import RESOLUTIONS
+from app.ingest import get_write_buffer
+from app.health import get_monitor, max_silence
+from app.store import SettingsStore, get_reading_store
+from app.timeutil import parse_time, to_isoformat
 
 
 @app.route("/")
@@ -14,36 +29,56 @@ def index():
     """
     show the main page
     """
-    office_sensor = CSVStore.get_last_reading("office")
-    bedroom_sensor = CSVStore.get_last_reading("bedroom")
-    sensors = [office_sensor, bedroom_sensor]
-    for sensor in sensors:
-        utc_timestamp = pytz.utc.localize(
-            datetime.datetime.strptime(sensor["timestamp"], app.config["TIME_FORMAT"])
-        ).isoformat()
-        sensor["timestamp"] = utc_timestamp
+    sensors = [
+        {
+            "location": sensor["name"],
+            "timestamp": to_isoformat(sensor["last_seen"]),
+            "temperature": sensor["temperature"],
+            "humidity": sensor["humidity"],
+            "online": sensor["online"],
+        }
+        for sensor in get_monitor().check()
+    ]
 
     return render_template("index.html", sensors=sensors)
 
 
+def _respond(body, status):
+    """a Flask response for what an app.handlers function returned"""
+    if body is None:
+        return "", status
+    return jsonify(body), status
+
+
 @app.route("/sensor/add_reading", methods=["POST"])
 def update_from_sensor():
-    # TODO: add authentication
-    if (
-        not request.json
-        or "sensor_name" not in request.json
-        or "sensor_id" not in request.json
-    ):
-        abort(400)
+    return _respond(
+        *handlers.add_reading(
+            request.get_json(force=True, silent=True), int(time.time())
+        )
+    )
 
-    sensor_name = request.json["sensor_name"]
-    sensor_id = request.json["sensor_id"]
-    temp = request.json.get("temperature", None)
-    humidity = request.json.get("humidity", None)
 
-    CSVStore.add_sensor_reading(sensor_name, temp, humidity)
+@app.route("/sensor/add_readings", methods=["POST"])
+def bulk_update_from_sensor():
+    return _respond(
+        *handlers.add_readings(
+            request.get_json(force=True, silent=True), int(time.time())
+        )
+    )
 
-    return jsonify({"status": "success"}), 200
+
+@app.route("/sensor/add_binary", methods=["POST"])
+def binary_update_from_sensor():
+    return _respond(*handlers.add_binary(request.get_data(), int(time.time())))
+
+
+@app.route("/sensor/ingest_stats")
+def ingest_stats():
+    write_buffer = get_write_buffer()
+    if write_buffer is None:
+        return jsonify({"write_behind": False}), 200
+    return jsonify({"write_behind": True, **write_buffer.stats()}), 200
 
 
 @app.route("/login", methods=["GET", "POST"])
@@ -57,16 +92,181 @@ def login():
     return render_template("login.html", title="Sign In", form=form)
 
 
+def _readings_query_args():
+    """
+    pull the reading filters and paging arguments shared by the readings
+    views out of the query string. raises ValueError for malformed values
+    """
+    args = request.args
+    limit = int(args.get("limit", app.config["READINGS_PAGE_SIZE"]))
+    if limit < 1:
+        raise ValueError("limit must be positive")
+    return {
+        "sensor_name": args.get("sensor") or None,
+        "start": parse_time(args["from"]) if args.get("from") else None,
+        "end": parse_time(args["to"]) if args.get("to") else None,
+        "limit": min(limit, app.config["READINGS_MAX_PAGE_SIZE"]),
+        "cursor": args.get("cursor") or None,
+    }
+
+
 @app.route("/raw_readings")
 def raw_readings():
-    all_readings = CSVStore.get_all()
-    return render_template("raw_data.html", title="Raw Readings", rows=all_readings)
+    try:
+        query = _readings_query_args()
+        rows, next_cursor = get_reading_store().query(**query)
+    except ValueError as e:
+        flash(f"Invalid query: {e}")
+        rows, next_cursor = [], None
+
+    # links to the first and next pages keep the current filters
+    filters = {
+        key: value for key, value in request.args.items() if value and key != "cursor"
+    }
+    first_args = filters if "cursor" in request.args else None
+    next_args = dict(filters, cursor=next_cursor) if next_cursor is not None else None
+
+    return render_template(
+        "raw_data.html",
+        title="Raw Readings",
+        rows=rows,
+        first_args=first_args,
+        next_args=next_args,
+    )
+
+
+@app.route("/api/sensors")
+def sensor_health():
+    """
+    every sensor that has reported, with when it was last heard from and
+    whether it has been quiet long enough to count as offline
+    """
+    sensors = get_monitor().check()
+    return (
+        jsonify(
+            {
+                "sensors": sensors,
+                "offline": [
+                    sensor["name"] for sensor in sensors if not sensor["online"]
+                ],
+                "offline_after": max_silence(),
+            }
+        ),
+        200,
+    )
+
+
+@app.route("/api/readings")
+def query_readings():
+    try:
+        query = _readings_query_args()
+        rows, next_cursor = get_reading_store().query(**query)
+    except ValueError as e:
+        return jsonify({"status": "failed", "message": str(e)}), 400
+
+    return jsonify({"readings": rows, "next_cursor": next_cursor}), 200
+
+
+@app.route("/api/aggregates")
+def query_aggregates():
+    """
+    per-sensor min/max/mean/count of temperature and humidity, bucketed at
+    `resolution` (1m, 5m, 1h or 1d)
+    """
+    resolution = request.args.get("resolution", "1h")
+    if resolution not in RESOLUTIONS:
+        return (
+            jsonify(
+                {
+                    "status": "failed",
+                    "message": f"resolution must be one of {', '.join(RESOLUTIONS)}",
+                }
+            ),
+            400,
+        )
+    try:
+        query = _readings_query_args()
+    except ValueError as e:
+        return jsonify({"status": "failed", "message": str(e)}), 400
+
+    buckets = get_reading_store().get_aggregates(
+        query["sensor_name"], query["start"], query["end"], resolution
+    )
+    return jsonify({"resolution": resolution, "buckets": buckets}), 200
+
+
+@app.route("/export")
+def export_readings():
+    """
+    stream every reading matching the filters as CSV or NDJSON, optionally
+    gzipped. rows go out as they are read, so memory use doesn't grow with
+    the size of the export
+    """
+    export_format = request.args.get("format", "csv")
+    if export_format not in FORMATS:
+        return (
+            jsonify(
+                {
+                    "status": "failed",
+                    "message": f"format must be one of {', '.join(FORMATS)}",
+                }
+            ),
+            400,
+        )
+    try:
+        query = _readings_query_args()
+    except ValueError as e:
+        return jsonify({"status": "failed", "message": str(e)}), 400
+
+    encode, mimetype = FORMATS[export_format]
+    readings = get_reading_store().iter_readings(
+        query["sensor_name"], query["start"], query["end"]
+    )
+    body = chunked(encode(readings))
+    filename = f"readings.{export_format}"
+    if request.args.get("gzip") == "1":
+        body = gzipped(body)
+        mimetype = "application/gzip"
+        filename += ".gz"
+
+    return Response(
+        stream_with_context(body),
+        mimetype=mimetype,
+        headers={"Content-Disposition": f"attachment; filename={filename}"},
+    )
+
+
+def _not_modified(etag, last_modified=None):
+    """
+    a 304 response if the request's If-None-Match or If-Modified-Since say the
+    client already has this version, otherwise None
+    """
+    if request.if_none_match:
+        fresh = handlers.etag_matches(request.headers.get("If-None-Match"), etag)
+    elif request.if_modified_since is not None and last_modified is not None:
+        since = calendar.timegm(request.if_modified_since.utctimetuple())
+        fresh = int(last_modified) <= since
+    else:
+        fresh = False
+    if not fresh:
+        return None
+    response = Response(status=304)
+    return _with_validators(response, etag, last_modified)
+
+
+def _with_validators(response, etag, last_modified=None):
+    response.set_etag(etag)
+    if last_modified is not None:
+        response.last_modified = int(last_modified)
+    # clients have to check back, but may do so with the validators above
+    response.cache_control.no_cache = True
+    return response
 
 
 @app.route("/current_temp")
 def get_current_temp():
     sensor_name = request.args.get("sensorName", None)
-    current_temp = CSVStore.get_last_reading(sensor_name)
+    current_temp = get_reading_store().get_last_reading(sensor_name)
 
     if current_temp is None:
         return (
@@ -79,29 +279,71 @@ def get_current_temp():
             400,
         )
 
-    timestamp = current_temp["timestamp"]
-    utc_timestamp = pytz.utc.localize(
-        datetime.datetime.strptime(timestamp, app.config["TIME_FORMAT"])
-    ).isoformat()
+    # the latest reading comes out of the store's index, so a client that is
+    # up to date gets its 304 before any formatting or encoding happens
+    etag = "{:08x}".format(
+        zlib.crc32(
+            ",".join(
+                current_temp[key]
+                for key in ("location", "timestamp", "temperature", "humidity")
+            ).encode()
+        )
+    )
+    last_modified = current_temp["epoch"]
+    not_modified = _not_modified(etag, last_modified)
+    if not_modified is not None:
+        return not_modified
 
-    return (
-        jsonify(
-            {
-                "location": current_temp["location"],
-                "timestamp": utc_timestamp,
-                "temperature": current_temp["temperature"],
-                "humidity": current_temp["humidity"],
-            }
-        ),
-        200,
+    response = jsonify(
+        {
+            "location": current_temp["location"],
+            "timestamp": to_isoformat(last_modified),
+            "temperature": current_temp["temperature"],
+            "humidity": current_temp["humidity"],
+        }
     )
+    return _with_validators(response, etag, last_modified), 200
+
+
+@app.route("/api/watch")
+def watch_state():
+    """
+    long-poll for the latest reading of `sensor` and the setpoint. pass the
+    version from the last response as `version` (or in If-None-Match) and
+    the request is held until something changes, for up to `timeout`
+    seconds, then answered with the new state or a 304 if nothing changed
+    """
+    sensor_name = request.args.get("sensor") or None
+    version = handlers.watched_version(
+        request.args.get("version"), request.headers.get("If-None-Match")
+    )
+    try:
+        timeout = handlers.watch_timeout(request.args.get("timeout"))
+    except ValueError:
+        return jsonify(handlers.failed("timeout must be a number")), 400
+
+    state = events.wait_for_change(sensor_name, version, timeout)
+    if state is None:
+        response = Response(status=304)
+        response.set_etag(version)
+        return response
+
+    response = jsonify(state)
+    response.set_etag(state["version"])
+    return response
 
 
 @app.route("/temp_setpoint", methods=["GET", "POST"])
 def temp_setpoint():
     if request.method == "GET":
         current_setpoint = SettingsStore.temp_setpoint()
-        return jsonify({"setpoint": current_setpoint}), 200
+        etag = f"setpoint-{current_setpoint}"
+        last_modified = SettingsStore.modified()
+        not_modified = _not_modified(etag, last_modified)
+        if not_modified is not None:
+            return not_modified
+        response = jsonify({"setpoint": current_setpoint})
+        return _with_validators(response, etag, last_modified), 200
     elif request.method == "POST":
         new_setpoint = request.json.get("newSetpoint", None)
         if new_setpoint is None:
@@ -124,6 +366,7 @@ def temp_setpoint():
                 400,
             )
 
+        events.notify()
         if result != int(new_setpoint):
             return (
                 jsonify(
@@ -146,3 +389,20 @@ def temp_setpoint():
             ),
             200,
         )
+
+
+@app.route("/api/controller_state")
+def controller_state():
+    """
+    everything a thermostat controller polls for in one small response: the
+    latest reading of `sensor`, the setpoint, the server's clock (epoch
+    seconds) and the version token also used by /api/watch. send the version
+    back in If-None-Match to get a 304 while nothing has changed
+    """
+    state = events.current_state(request.args.get("sensor") or None)
+    not_modified = _not_modified(state["version"])
+    if not_modified is not None:
+        return not_modified
+
+    response = jsonify(handlers.controller_state(state, int(time.time())))
+    return _with_validators(response, state["version"]), 200
@@ -0,0 +1,34 @@
+"""
+make stopping the server run the same cleanup as a normal exit.
+
+buffered readings, open rollup buckets and registry updates are written out
+by atexit handlers, but atexit only runs when the interpreter exits normally
+and the default SIGTERM action kills the process outright. unless a server
+has already installed a handler of its own, SIGTERM is turned into
+SystemExit here, so stopping the service (or `kill`) loses nothing. SIGINT
+already raises KeyboardInterrupt, which unwinds the same way.
+"""
+
+import signal
+import sys
+import threading
+
+
+def _exit(signum, frame):
+    sys.exit(128 + signum)
+
+
+def exit_on_sigterm():
+    """
+    install the SIGTERM handler. only the main thread can install signal
+    handlers, so this does nothing anywhere else
+    """
+    if threading.current_thread() is not threading.main_thread():
+        return
+    previous = signal.getsignal(signal.SIGTERM)
+    if callable(previous) and previous is not _exit:
+        # e.g. a server's own graceful shutdown, which exits normally itself
+        return
+    if previous == signal.SIG_IGN:
+        return
+    signal.signal(signal.SIGTERM, _exit)
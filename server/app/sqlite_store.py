@@ -0,0 +1,320 @@
+import math
+import sqlite3
+import threading
+
+from app import app
+from app.archive import Archive
+from app.rollups import RESOLUTIONS, Aggregate, aggregate_readings, summarize
+from app.store import CSVStore, ReadingStore
+from app.timeutil import from_epoch
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS readings (
+    id INTEGER PRIMARY KEY,
+    timestamp INTEGER NOT NULL,
+    sensor_name TEXT NOT NULL,
+    temperature REAL,
+    humidity REAL
+);
+CREATE INDEX IF NOT EXISTS readings_sensor_time ON readings (sensor_name, timestamp);
+CREATE INDEX IF NOT EXISTS readings_time ON readings (timestamp);
+CREATE TABLE IF NOT EXISTS rollups (
+    resolution TEXT NOT NULL,
+    sensor_name TEXT NOT NULL,
+    bucket INTEGER NOT NULL,
+    count INTEGER NOT NULL,
+    t_count INTEGER NOT NULL,
+    t_min REAL,
+    t_max REAL,
+    t_sum REAL NOT NULL,
+    h_count INTEGER NOT NULL,
+    h_min REAL,
+    h_max REAL,
+    h_sum REAL NOT NULL,
+    PRIMARY KEY (resolution, sensor_name, bucket)
+);
+"""
+
+# fold a partial aggregate into its rollup row. sqlite's two-argument min/max
+# return NULL if either side is, hence the coalesces
+UPSERT_ROLLUP = """
+INSERT INTO rollups VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (resolution, sensor_name, bucket) DO UPDATE SET
+    count = count + excluded.count,
+    t_count = t_count + excluded.t_count,
+    t_min = min(coalesce(t_min, excluded.t_min), coalesce(excluded.t_min, t_min)),
+    t_max = max(coalesce(t_max, excluded.t_max), coalesce(excluded.t_max, t_max)),
+    t_sum = t_sum + excluded.t_sum,
+    h_count = h_count + excluded.h_count,
+    h_min = min(coalesce(h_min, excluded.h_min), coalesce(excluded.h_min, h_min)),
+    h_max = max(coalesce(h_max, excluded.h_max), coalesce(excluded.h_max, h_max)),
+    h_sum = h_sum + excluded.h_sum
+"""
+
+
+def _to_float(value):
+    if value is None or str(value).strip() == "":
+        return None
+    return float(value)
+
+
+def _to_text(value):
+    return "" if value is None else str(value)
+
+
+def _reading(timestamp, sensor_name, temperature, humidity):
+    return {
+        "timestamp": from_epoch(timestamp),
+        "sensor_name": sensor_name,
+        "temperature": _to_text(temperature),
+        "humidity": _to_text(humidity),
+    }
+
+
+class SQLiteStore(ReadingStore):
+    """
+    readings kept in an SQLite database in WAL mode, so readers never block
+    the writer. timestamps are stored as UTC epoch seconds and indexed
+    together with the sensor name
+    """
+
+    _local = threading.local()
+
+    @classmethod
+    def connection(cls):
+        # sqlite connections can't be shared across threads, keep one per thread
+        conn = getattr(cls._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(app.config["SQLITE_DATABASE"], timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(SCHEMA)
+            cls._local.conn = conn
+        return conn
+
+    @classmethod
+    def add_sensor_readings(cls, readings, fsync=False):
+        conn = cls.connection()
+        if fsync:
+            conn.execute("PRAGMA synchronous=FULL")
+        try:
+            with conn:
+                conn.executemany(
+                    "INSERT INTO readings (timestamp, sensor_name, temperature, humidity)"
+                    " VALUES (?, ?, ?, ?)",
+                    [
+                        (
+                            timestamp,
+                            sensor_name,
+                            _to_float(temperature),
+                            _to_float(humidity),
+                        )
+                        for timestamp, sensor_name, temperature, humidity in readings
+                    ],
+                )
+                # the batch is aggregated first, so each rollup row is touched
+                # once per batch rather than once per reading
+                conn.executemany(
+                    UPSERT_ROLLUP,
+                    [
+                        list(key) + aggregate.to_row()
+                        for key, aggregate in aggregate_readings(readings).items()
+                    ],
+                )
+        finally:
+            if fsync:
+                conn.execute("PRAGMA synchronous=NORMAL")
+
+    @classmethod
+    def get_last_reading(cls, desired_sensor_name):
+        if desired_sensor_name is None:
+            row = (
+                cls.connection()
+                .execute(
+                    "SELECT timestamp, sensor_name, temperature, humidity FROM readings"
+                    " ORDER BY timestamp DESC, id DESC LIMIT 1"
+                )
+                .fetchone()
+            )
+        else:
+            row = (
+                cls.connection()
+                .execute(
+                    "SELECT timestamp, sensor_name, temperature, humidity FROM readings"
+                    " WHERE sensor_name = ? ORDER BY timestamp DESC, id DESC LIMIT 1",
+                    (desired_sensor_name,),
+                )
+                .fetchone()
+            )
+
+        if row is None:
+            return None
+        timestamp, sensor_name, temperature, humidity = row
+        return {
+            "location": sensor_name,
+            "timestamp": from_epoch(timestamp),
+            "epoch": timestamp,
+            "temperature": _to_text(temperature),
+            "humidity": _to_text(humidity),
+        }
+
+    @classmethod
+    def get_all(cls):
+        rows = cls.connection().execute(
+            "SELECT timestamp, sensor_name, temperature, humidity FROM readings"
+            " ORDER BY id"
+        )
+        return [_reading(*row) for row in rows]
+
+    @staticmethod
+    def _filters(sensor_name, start, end):
+        conditions = []
+        params = []
+        if sensor_name is not None:
+            conditions.append("sensor_name = ?")
+            params.append(sensor_name)
+        if start is not None:
+            conditions.append("timestamp >= ?")
+            params.append(start)
+        if end is not None:
+            conditions.append("timestamp < ?")
+            params.append(end)
+        return conditions, params
+
+    @classmethod
+    def query(cls, sensor_name=None, start=None, end=None, limit=100, cursor=None):
+        # pages are keyed on (timestamp, id), so the cursor is where the last
+        # page stopped and the next one is a single index range scan
+        conditions, params = cls._filters(sensor_name, start, end)
+        if cursor is not None:
+            try:
+                last_timestamp, last_id = (int(part) for part in cursor.split(":"))
+            except ValueError:
+                raise ValueError(f"invalid cursor {cursor!r}") from None
+            conditions.append("(timestamp, id) > (?, ?)")
+            params.extend([last_timestamp, last_id])
+
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        cursor = cls.connection().execute(
+            "SELECT id, timestamp, sensor_name, temperature, humidity FROM readings"
+            f" {where} ORDER BY timestamp, id LIMIT ?",
+            params + [limit + 1],
+        )
+        rows = cursor.fetchall()
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = f"{rows[-1][1]}:{rows[-1][0]}"
+
+        return [_reading(*row[1:]) for row in rows], next_cursor
+
+    @classmethod
+    def iter_readings(cls, sensor_name=None, start=None, end=None):
+        conditions, params = cls._filters(sensor_name, start, end)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        # iterating the cursor steps through the result set as it goes rather
+        # than fetching it all up front
+        rows = cls.connection().execute(
+            "SELECT timestamp, sensor_name, temperature, humidity FROM readings"
+            f" {where} ORDER BY timestamp, id",
+            params,
+        )
+        for row in rows:
+            yield _reading(*row)
+
+    @classmethod
+    def get_aggregates(cls, sensor_name, start, end, resolution):
+        conditions = ["resolution = ?"]
+        params = [resolution]
+        if sensor_name is not None:
+            conditions.append("sensor_name = ?")
+            params.append(sensor_name)
+        if start is not None:
+            conditions.append("bucket >= ?")
+            params.append(start - start % RESOLUTIONS[resolution])
+        if end is not None:
+            conditions.append("bucket < ?")
+            params.append(end)
+
+        rows = cls.connection().execute(
+            f"SELECT sensor_name, bucket, {', '.join(Aggregate.FIELDS)} FROM rollups"
+            f" WHERE {' AND '.join(conditions)}",
+            params,
+        )
+        return summarize(
+            {(row[0], row[1]): Aggregate.from_row(row[2:]) for row in rows}
+        )
+
+    @classmethod
+    def rebuild_rollups(cls):
+        with cls.connection() as conn:
+            conn.execute("DELETE FROM rollups")
+            for resolution, seconds in RESOLUTIONS.items():
+                conn.execute(
+                    "INSERT INTO rollups SELECT ?, sensor_name,"
+                    " timestamp - timestamp % ? AS bucket, count(*),"
+                    " count(temperature), min(temperature), max(temperature),"
+                    " total(temperature), count(humidity), min(humidity),"
+                    " max(humidity), total(humidity)"
+                    " FROM readings GROUP BY sensor_name, bucket",
+                    (resolution, seconds),
+                )
+
+    @classmethod
+    def import_csv(cls, filename, boundary=None):
+        """
+        bulk load a readings.csv file in one transaction, leaving out rows from
+        before `boundary` (epoch seconds). lines that aren't readings, such as
+        a header, are skipped. returns the number of rows imported and skipped
+        """
+        skipped = 0
+
+        def rows(csv_file):
+            nonlocal skipped
+            for line in csv_file:
+                try:
+                    # undecodable bytes are a UnicodeDecodeError, a ValueError
+                    row = CSVStore._parse_line(line)
+                    if row is None:
+                        raise ValueError
+                    row[2], row[3] = _to_float(row[2]), _to_float(row[3])
+                except ValueError:
+                    skipped += 1
+                    continue
+                if boundary is None or row[0] >= boundary:
+                    yield row
+
+        with open(filename, "rb") as csv_file, cls.connection() as conn:
+            before = conn.total_changes
+            conn.executemany(
+                "INSERT INTO readings (timestamp, sensor_name, temperature, humidity)"
+                " VALUES (?, ?, ?, ?)",
+                rows(csv_file),
+            )
+            return conn.total_changes - before, skipped
+
+    @classmethod
+    def import_archive(cls):
+        """bulk load the readings archived by CSVStore. returns the row count"""
+        sensors = Archive.index()["sensors"]
+
+        def rows():
+            for segment in Archive.segments():
+                for record in Archive.records(segment).tolist():
+                    timestamp, sensor_id, temperature, humidity = record
+                    yield (
+                        timestamp,
+                        sensors[sensor_id],
+                        None if math.isnan(temperature) else temperature,
+                        None if math.isnan(humidity) else humidity,
+                    )
+
+        with cls.connection() as conn:
+            before = conn.total_changes
+            conn.executemany(
+                "INSERT INTO readings (timestamp, sensor_name, temperature, humidity)"
+                " VALUES (?, ?, ?, ?)",
+                rows(),
+            )
+            return conn.total_changes - before
@@ -1,9 +1,15 @@
+import atexit
 import csv
-import datetime
-import json
+import fcntl
 import os
+import threading
+import time
 
-from app import app
+from app import app, jsonfile
+from app.archive import Archive
+from app.lines import bisect_lines, forward_lines, line_boundary, reverse_lines
+from app.rollups import RollupFiles
+from app.timeutil import from_epoch, stored_epoch
 
 CSV_FILE = "./readings.csv"
 SETTINGS_FILE = "./settings.json"
@@ -13,16 +19,18 @@ class SettingsStore:
     filename = SETTINGS_FILE
     DEFAULT_STORE = {"setpoint": 72}
 
+    # settings.json as last read, and the (inode, size, mtime) it was read at.
+    # writes replace the file, so any change by any worker shows up in the
+    # signature and a read only touches the disk when there's something new
+    _settings = None
+    _signature = None
+    _lock = threading.Lock()
+
     @classmethod
     def temp_setpoint(cls, new_setpoint=None):
-        if not os.path.exists(cls.filename):
-            cls.create_default_store()
-
-        with open(cls.filename, "r") as json_file:
-            settings = json.load(json_file)
-
         if new_setpoint is None:
             # return current setpoint
+            settings = cls._load()
             return settings.get("setpoint", cls.DEFAULT_STORE["setpoint"])
         else:
             try:
@@ -36,58 +44,363 @@ class SettingsStore:
                 min(app.config["SETPOINT_MAX"], new_setpoint),
             )
 
-            settings["setpoint"] = new_setpoint
-            with open(cls.filename, "w") as json_file:
-                json.dump(settings, json_file)
+            with jsonfile.locked(cls.filename):
+                settings = dict(cls._load())
+                settings["setpoint"] = new_setpoint
+                jsonfile.save(cls.filename, settings, fsync=True)
 
             return new_setpoint
 
+    @classmethod
+    def modified(cls):
+        """when the settings were last changed, in epoch seconds"""
+        cls._load()
+        return cls._signature[2] / 1e9
+
     @classmethod
     def create_default_store(cls):
-        with open(cls.filename, "w") as json_file:
-            json.dump(cls.DEFAULT_STORE, json_file)
+        jsonfile.create(cls.filename, cls.DEFAULT_STORE, fsync=True)
 
+    @classmethod
+    def _load(cls):
+        try:
+            signature = jsonfile.signature(cls.filename)
+        except FileNotFoundError:
+            cls.create_default_store()
+            signature = jsonfile.signature(cls.filename)
+
+        with cls._lock:
+            if signature != cls._signature:
+                cls._settings = jsonfile.load(cls.filename)
+                cls._signature = signature
+            return cls._settings
 
-class CSVStore:
-    filename = CSV_FILE
+
+class ReadingStore:
+    """
+    interface every sensor reading backend implements. readings are handed
+    back as dicts of strings, in the same shape whichever backend is in use
+    """
 
     @classmethod
     def add_sensor_reading(cls, sensor_name, temperature, humidity):
-        with open(cls.filename, "a") as csv_file:
-            writer = csv.writer(csv_file, delimiter=",")
-            timestamp = datetime.datetime.utcnow().strftime(app.config["TIME_FORMAT"])
-            writer.writerow([timestamp, sensor_name, temperature, humidity])
+        cls.add_sensor_readings(
+            [(int(time.time()), sensor_name, temperature, humidity)]
+        )
+
+    @classmethod
+    def add_sensor_readings(cls, readings, fsync=False):
+        """
+        store `(epoch_timestamp, sensor_name, temperature, humidity)` tuples in
+        one write. with `fsync`, don't return until they are on disk
+        """
+        raise NotImplementedError
 
     @classmethod
     def get_last_reading(cls, desired_sensor_name):
-        if not os.path.exists(cls.filename):
-            return None
-        with open(cls.filename, "r") as csv_file:
-            for row in reversed(csv_file.readlines()):
-                timestamp, sensor_name, temperature, humidity = [
-                    tag.strip() for tag in row.split(",")
-                ]
-                if sensor_name == desired_sensor_name or desired_sensor_name is None:
-                    return {
-                        "location": sensor_name,
-                        "timestamp": timestamp,
-                        "temperature": temperature,
-                        "humidity": humidity,
-                    }
+        """
+        newest reading for a sensor, or for any sensor if the name is None.
+        besides the strings it has its time as an int under "epoch", so
+        callers don't have to parse the timestamp back
+        """
+        raise NotImplementedError
+
+    @classmethod
+    def get_all(cls):
+        raise NotImplementedError
+
+    @classmethod
+    def query(cls, sensor_name=None, start=None, end=None, limit=100, cursor=None):
+        """
+        up to `limit` readings taken in [start, end) (epoch seconds, either
+        bound optional), optionally for one sensor only. returns the rows and
+        an opaque cursor to pass back in for the next page, or None when
+        there are no more. raises ValueError for a cursor it didn't hand out
+        """
+        raise NotImplementedError
+
+    @classmethod
+    def iter_readings(cls, sensor_name=None, start=None, end=None):
+        """
+        generator over every reading matching the same filters as `query`,
+        read from storage as it is consumed
+        """
+        raise NotImplementedError
+
+    @classmethod
+    def get_aggregates(cls, sensor_name, start, end, resolution):
+        """
+        min/max/mean/count of temperature and humidity per sensor per bucket
+        of `resolution` (a key of rollups.RESOLUTIONS), for buckets starting
+        in [start, end). answered from rollups kept as readings are added
+        """
+        raise NotImplementedError
+
+    @classmethod
+    def rebuild_rollups(cls):
+        """recompute the rollups from the full reading history"""
+        raise NotImplementedError
+
+
+def get_reading_store():
+    """the ReadingStore implementation picked by READINGS_BACKEND"""
+    backend = app.config["READINGS_BACKEND"]
+    if backend == "csv":
+        return CSVStore
+    if backend == "sqlite":
+        from app.sqlite_store import SQLiteStore
+
+        return SQLiteStore
+    raise ValueError(f"unknown READINGS_BACKEND {backend!r}")
+
+
+class CSVStore(ReadingStore):
+    """
+    readings appended to a CSV file, one `timestamp,sensor,temperature,humidity`
+    row each. timestamps are written as epoch seconds; files from before that
+    have TIME_FORMAT strings, and both are read
+    """
+
+    filename = CSV_FILE
+
+    # in-memory index of the newest row per sensor, so lookups don't have to
+    # re-read the whole file. `_signature` is the (inode, size, mtime) of the
+    # file as of the last time the index was brought up to date. rows in
+    # [_scanned_from, _indexed_offset) are reflected in the index: new rows
+    # are consumed forwards as they are appended, older history is only
+    # scanned (backwards, from _scanned_from) when a lookup misses.
+    # `_oldest_indexed` is the smallest epoch among those rows, see `_settled`
+    _latest = {}
+    _latest_any = None
+    _signature = None
+    _indexed_offset = 0
+    _scanned_from = 0
+    _oldest_indexed = None
+    _lock = threading.RLock()
+
+    @classmethod
+    def add_sensor_readings(cls, readings, fsync=False):
+        rows = [
+            [int(timestamp), sensor_name, temperature, humidity]
+            for timestamp, sensor_name, temperature, humidity in readings
+        ]
+        with cls._lock:
+            cls._refresh_index()
+            with cls._open_for_append() as csv_file:
+                start = csv_file.tell()
+                writer = csv.writer(csv_file, delimiter=",")
+                writer.writerows(rows)
+                csv_file.flush()
+                if fsync:
+                    os.fsync(csv_file.fileno())
+                if start == cls._indexed_offset:
+                    for timestamp, sensor_name, temperature, humidity in rows:
+                        cls._index_row(
+                            [
+                                timestamp,
+                                sensor_name,
+                                "" if temperature is None else str(temperature),
+                                "" if humidity is None else str(humidity),
+                            ]
+                        )
+                    cls._indexed_offset = csv_file.tell()
+                    cls._signature = cls._stat_signature(os.fstat(csv_file.fileno()))
+
+        RollupFiles.add(readings)
+
+    @classmethod
+    def _open_for_append(cls):
+        """
+        readings.csv opened for appending, under an exclusive lock. other
+        workers append to the same file, and holding the lock is what makes
+        the offsets recorded while writing really ours
+        """
+        return cls._open_locked("a")
+
+    @classmethod
+    def _open_locked(cls, mode):
+        """
+        readings.csv opened in `mode` under an exclusive lock, making sure
+        the file locked is still the one at `filename` once the lock is held
+        """
+        while True:
+            csv_file = open(cls.filename, mode)
+            fcntl.flock(csv_file, fcntl.LOCK_EX)
+            if os.fstat(csv_file.fileno()).st_ino == os.stat(cls.filename).st_ino:
+                return csv_file
+            # compaction replaced the file while we were waiting for the lock
+            csv_file.close()
+
+    @classmethod
+    def get_last_reading(cls, desired_sensor_name):
+        with cls._lock:
+            cls._refresh_index()
+            if desired_sensor_name is None:
+                reading = cls._latest_any
             else:
-                return None
+                reading = cls._latest.get(desired_sensor_name)
+            if not cls._settled(reading):
+                reading = cls._scan_back(desired_sensor_name)
+            if reading is None:
+                # sensors that have been quiet since their readings were archived
+                reading = Archive.latest(desired_sensor_name)
+
+        # callers are free to modify what they get back
+        return dict(reading) if reading is not None else None
+
+    @staticmethod
+    def _stat_signature(stat):
+        return stat.st_ino, stat.st_size, stat.st_mtime_ns
+
+    @classmethod
+    def _refresh_index(cls):
+        """
+        bring the latest-reading index up to date with the file on disk.
+        appends made by other processes are consumed incrementally; if the
+        file was replaced or truncated, the index is reset to the tail of the
+        file and repopulated lazily by `_scan_back`
+        """
+        try:
+            signature = cls._stat_signature(os.stat(cls.filename))
+        except FileNotFoundError:
+            signature = None
+
+        if signature == cls._signature:
+            return
+
+        if (
+            signature is None
+            or cls._signature is None
+            or signature[0] != cls._signature[0]
+            or signature[1] < cls._indexed_offset
+        ):
+            cls._latest = {}
+            cls._latest_any = None
+            cls._indexed_offset = 0
+            cls._scanned_from = 0
+            cls._oldest_indexed = None
+            if signature is not None:
+                with open(cls.filename, "rb") as csv_file:
+                    cls._indexed_offset = line_boundary(csv_file, signature[1])
+                cls._scanned_from = cls._indexed_offset
+
+        if signature is not None:
+            cls._index_from(cls._indexed_offset)
+        cls._signature = signature
+
+    @classmethod
+    def _settled(cls, reading):
+        """
+        whether no row that hasn't been indexed yet can be newer than
+        `reading`. rows are appended at most MAX_BACKFILL_AGE after they were
+        taken and at most MAX_CLOCK_SKEW before, so every row ahead of one
+        taken at `epoch` was taken before `epoch` plus both
+        """
+        if cls._scanned_from == 0:
+            return True
+        if reading is None:
+            return False
+        slack = app.config["MAX_BACKFILL_AGE"] + app.config["MAX_CLOCK_SKEW"]
+        return reading["epoch"] > cls._oldest_indexed + slack
+
+    @classmethod
+    def _scan_back(cls, desired_sensor_name):
+        """
+        walk the not-yet-indexed history newest first until the newest row
+        for `desired_sensor_name` (any sensor if None) is known. rows arrive
+        out of time order when sensors backfill, so the first row found isn't
+        necessarily it and the walk goes on until `_settled` says so. every
+        sensor seen on the way is indexed too
+        """
+
+        def latest():
+            if desired_sensor_name is None:
+                return cls._latest_any
+            return cls._latest.get(desired_sensor_name)
+
+        with open(cls.filename, "rb") as csv_file:
+            for offset, line in reverse_lines(csv_file, cls._scanned_from):
+                cls._scanned_from = offset
+                row = cls._parse_line(line)
+                if row is None:
+                    continue
+                cls._index_row(row, newest=False)
+                if cls._settled(latest()):
+                    return latest()
+
+        cls._scanned_from = 0
+        return latest()
+
+    @classmethod
+    def _index_from(cls, offset):
+        with open(cls.filename, "rb") as csv_file:
+            for offset, line in forward_lines(csv_file, offset):
+                row = cls._parse_line(line)
+                if row is not None:
+                    cls._index_row(row)
+        cls._indexed_offset = offset
+
+    @staticmethod
+    def _parse_line(line):
+        """
+        `[epoch, sensor_name, temperature, humidity]` for a line of the file,
+        or None if it isn't a reading
+        """
+        row = [tag.strip() for tag in line.decode().split(",")]
+        if len(row) != 4:
+            return None
+        try:
+            row[0] = stored_epoch(row[0])
+        except ValueError:
+            return None
+        return row
+
+    @classmethod
+    def _index_row(cls, row, newest=True):
+        epoch, sensor_name, temperature, humidity = row
+        reading = {
+            "location": sensor_name,
+            "timestamp": from_epoch(epoch),
+            "epoch": epoch,
+            "temperature": temperature,
+            "humidity": humidity,
+        }
+        if cls._oldest_indexed is None or epoch < cls._oldest_indexed:
+            cls._oldest_indexed = epoch
+
+        # a backfilled reading appended after newer ones isn't the latest.
+        # between readings taken in the same second, the one further down the
+        # file is
+        def newer(latest):
+            if latest is None:
+                return True
+            return epoch >= latest["epoch"] if newest else epoch > latest["epoch"]
+
+        if newer(cls._latest.get(sensor_name)):
+            cls._latest[sensor_name] = reading
+        if newer(cls._latest_any):
+            cls._latest_any = reading
+        return reading
 
     @classmethod
     def get_all(cls):
+        archived = [reading for _, reading in Archive.scan()]
         if not os.path.exists(cls.filename):
-            return None
-        with open(cls.filename, "r") as csv_file:
-            ret_data = []
-            for row in csv_file.readlines():
-                timestamp, sensor_name, temperature, humidity = row.split(",")
+            return archived or None
+        boundary = Archive.boundary()
+        with open(cls.filename, "rb") as csv_file:
+            ret_data = archived
+            for line in csv_file.readlines():
+                row = cls._parse_line(line)
+                if row is None:
+                    continue
+                epoch, sensor_name, temperature, humidity = row
+                if boundary is not None and epoch < boundary:
+                    # left behind by a compaction that didn't finish
+                    continue
                 ret_data.append(
                     {
-                        "timestamp": timestamp,
+                        "timestamp": from_epoch(epoch),
                         "sensor_name": sensor_name,
                         "temperature": temperature,
                         "humidity": humidity,
@@ -95,3 +408,158 @@ class CSVStore:
                 )
 
             return ret_data
+
+    @classmethod
+    def query(cls, sensor_name=None, start=None, end=None, limit=100, cursor=None):
+        # archived readings come first, with cursors of their own (see
+        # Archive.scan); a plain number is an offset into readings.csv
+        rows = []
+        offset = None
+        if cursor is None or not cursor.isdigit():
+            for position, reading in Archive.scan(sensor_name, start, end, cursor):
+                rows.append(reading)
+                if len(rows) == limit:
+                    return rows, position
+        else:
+            offset = int(cursor)
+
+        if not os.path.exists(cls.filename):
+            return rows, None
+        with open(cls.filename, "rb") as csv_file:
+            for offset, reading in cls._scan(csv_file, sensor_name, start, end, offset):
+                rows.append(reading)
+                if len(rows) == limit:
+                    return rows, str(offset)
+
+        return rows, None
+
+    @classmethod
+    def iter_readings(cls, sensor_name=None, start=None, end=None):
+        for _, reading in Archive.scan(sensor_name, start, end):
+            yield reading
+        if not os.path.exists(cls.filename):
+            return
+        with open(cls.filename, "rb") as csv_file:
+            for _, reading in cls._scan(csv_file, sensor_name, start, end):
+                yield reading
+
+    @classmethod
+    def _scan(cls, csv_file, sensor_name, start, end, offset=None):
+        """
+        yield `(next_offset, reading)` for the rows matching the filters,
+        starting at `offset` or, failing that, wherever `start` is in the file
+        """
+        # anything before the archive boundary is served from the archive
+        boundary = Archive.boundary()
+        if boundary is not None and (start is None or start < boundary):
+            start = boundary
+        # rows are in arrival order, which can trail the time order by up to
+        # MAX_BACKFILL_AGE for sensors that upload buffered readings. widen
+        # the seek and the stop condition by that much
+        slack = app.config["MAX_BACKFILL_AGE"]
+        stop = end + slack if end is not None else None
+
+        if offset is None:
+            if start is not None:
+                offset = cls._seek_time(csv_file, start - slack)
+            else:
+                offset = 0
+
+        for offset, line in forward_lines(csv_file, offset):
+            row = cls._parse_line(line)
+            if row is None:
+                continue
+            epoch = row[0]
+            if stop is not None and epoch >= stop:
+                return
+            if (
+                (start is not None and epoch < start)
+                or (end is not None and epoch >= end)
+                or (sensor_name is not None and row[1] != sensor_name)
+            ):
+                continue
+
+            yield offset, {
+                "timestamp": from_epoch(epoch),
+                "sensor_name": row[1],
+                "temperature": row[2],
+                "humidity": row[3],
+            }
+
+    @staticmethod
+    def _seek_time(csv_file, timestamp):
+        """offset of the first row stamped at or after `timestamp`"""
+
+        def line_epoch(line):
+            try:
+                return stored_epoch(line.split(b",", 1)[0].strip().decode())
+            except ValueError:
+                return -1
+
+        return bisect_lines(csv_file, line_epoch, timestamp)
+
+    @classmethod
+    def compact(cls, max_age):
+        """
+        move the readings taken more than `max_age` seconds ago out of
+        readings.csv and into the archive. returns how many were moved
+        """
+        if max_age <= app.config["MAX_BACKFILL_AGE"]:
+            # otherwise a backfilled reading could land behind the boundary
+            raise ValueError("readings can only be archived once past MAX_BACKFILL_AGE")
+        if not os.path.exists(cls.filename):
+            return 0
+
+        # appends and other compactions wait for this lock, and then notice
+        # the file has been replaced. the boundary is only read once it's
+        # held, so no two compactions archive the same rows
+        with cls._lock, cls._open_locked("rb") as csv_file:
+            cutoff = int(time.time()) - max_age
+            boundary = Archive.boundary()
+            archived, kept, dropped = [], [], 0
+            offset = 0
+            for offset, line in forward_lines(csv_file, 0):
+                row = cls._parse_line(line)
+                if row is None or row[0] >= cutoff:
+                    kept.append(line)
+                elif boundary is not None and row[0] < boundary:
+                    # already archived by a compaction that didn't finish
+                    dropped += 1
+                else:
+                    archived.append(tuple(row))
+            csv_file.seek(offset)
+            kept.append(csv_file.read())
+
+            if not archived and not dropped:
+                return 0
+            if archived:
+                Archive.append(archived, cutoff)
+
+            replacement = cls.filename + ".compact"
+            with open(replacement, "wb") as new_file:
+                new_file.writelines(kept)
+                new_file.flush()
+                os.fsync(new_file.fileno())
+            os.replace(replacement, cls.filename)
+
+        return len(archived)
+
+    @classmethod
+    def get_aggregates(cls, sensor_name, start, end, resolution):
+        return RollupFiles.get_aggregates(sensor_name, start, end, resolution)
+
+    @classmethod
+    def rebuild_rollups(cls):
+        RollupFiles.rebuild(
+            (
+                stored_epoch(reading["timestamp"]),
+                reading["sensor_name"],
+                reading["temperature"],
+                reading["humidity"],
+            )
+            for reading in cls.iter_readings()
+        )
+
+
+# aggregates not yet written out only live in memory
+atexit.register(RollupFiles.flush)
@@ -0,0 +1,87 @@
+import calendar
+import datetime
+import functools
+import time
+
+from app import app
+
+DAY = 24 * 60 * 60
+# the TIME_FORMAT layout the fast paths below produce and read
+DEFAULT_TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+@functools.lru_cache(maxsize=1024)
+def _date(day):
+    """YYYY-MM-DD for a day number since the epoch"""
+    return time.strftime("%Y-%m-%d", time.gmtime(day * DAY))
+
+
+@functools.lru_cache(maxsize=1024)
+def _day(date):
+    """day number since the epoch for YYYY-MM-DD"""
+    year, month, day = int(date[0:4]), int(date[5:7]), int(date[8:10])
+    return calendar.timegm((year, month, day, 0, 0, 0)) // DAY
+
+
+def _clock(seconds):
+    hours, seconds = divmod(seconds, 3600)
+    minutes, seconds = divmod(seconds, 60)
+    return f"{hours:02d}:{minutes:02d}:{seconds:02d}"
+
+
+def to_epoch(timestamp):
+    """seconds since the unix epoch for a UTC timestamp in TIME_FORMAT"""
+    time_format = app.config["TIME_FORMAT"]
+    if time_format == DEFAULT_TIME_FORMAT and len(timestamp) == 19:
+        # readings arrive in time order, so the date part is nearly always
+        # one that was just looked up
+        return (
+            _day(timestamp[:10]) * DAY
+            + int(timestamp[11:13]) * 3600
+            + int(timestamp[14:16]) * 60
+            + int(timestamp[17:19])
+        )
+    parsed = datetime.datetime.strptime(timestamp, time_format)
+    return calendar.timegm(parsed.timetuple())
+
+
+def from_epoch(epoch):
+    """TIME_FORMAT string for a UTC epoch timestamp"""
+    time_format = app.config["TIME_FORMAT"]
+    if time_format != DEFAULT_TIME_FORMAT:
+        return time.strftime(time_format, time.gmtime(epoch))
+    day, seconds = divmod(int(epoch), DAY)
+    return f"{_date(day)} {_clock(seconds)}"
+
+
+def stored_epoch(timestamp):
+    """
+    epoch seconds for a timestamp as stored in readings.csv: epoch seconds,
+    or a TIME_FORMAT string in rows written before readings were stored that
+    way. raises ValueError for anything else
+    """
+    if timestamp.isdigit():
+        return int(timestamp)
+    return to_epoch(timestamp)
+
+
+def to_isoformat(epoch):
+    """ISO 8601 string with a UTC offset for a UTC epoch timestamp"""
+    day, seconds = divmod(int(epoch), DAY)
+    return f"{_date(day)}T{_clock(seconds)}+00:00"
+
+
+def parse_time(value):
+    """
+    epoch seconds for a user supplied time: either epoch seconds or an ISO 8601
+    string, taken as UTC if it has no offset. raises ValueError otherwise
+    """
+    value = value.strip()
+    if value.lstrip("-").isdigit():
+        return int(value)
+    if value.endswith("Z"):
+        value = value[:-1] + "+00:00"
+    parsed = datetime.datetime.fromisoformat(value)
+    if parsed.tzinfo is None:
+        return calendar.timegm(parsed.timetuple())
+    return int(parsed.timestamp())
@@ -0,0 +1,169 @@
+"""
+a fire-and-forget UDP alternative to the HTTP upload endpoints, for battery
+powered sensors that can't afford a TCP handshake and a response wait on
+every wake:
+
+    flask listen-udp
+
+each datagram is an app.packet payload wrapped by `packet.sign`, with a
+sequence number and an HMAC made with UDP_SECRET. datagrams that fail the MAC
+are dropped, as are repeats of a sequence number the sensor already sent and
+anything too far behind its newest. readings go through `record_readings`,
+the same as /sensor/add_reading.
+
+nothing is ever sent back, so a sensor can't tell whether a datagram made it.
+sensors that can't lose a reading should keep uploading over HTTP.
+"""
+
+import collections
+import os
+import socket
+import threading
+import time
+
+from app import app, jsonfile, packet
+from app.ingest import parse_samples, record_readings
+
+MAX_DATAGRAM = 2048
+SEQUENCES_FILE = "./udp_sequences.json"
+
+
+class SequenceWindow:
+    """
+    replay protection over sequence numbers, one window per sensor. a
+    sequence number is accepted if it is higher than any seen so far, or one
+    of the `size` below the highest that hasn't been seen yet. anything
+    further back is refused, however it is signed.
+
+    sensors put a boot counter kept in flash in the top 16 bits and count
+    datagrams in the bottom 16, so a restarted sensor carries on above what
+    it sent before and never needs to be trusted to say it restarted.
+
+    with `filename`, the windows are saved there on every change and loaded
+    at start, so restarting the listener doesn't reopen old datagrams
+    """
+
+    def __init__(self, size=64, filename=None):
+        self.size = size
+        self.filename = filename
+        # sensor id -> (highest sequence number, bitmask of the ones before it)
+        self._seen = {}
+        self._lock = threading.Lock()
+        if filename is not None and os.path.exists(filename):
+            stored = jsonfile.load(filename)
+            self._seen = {
+                int(sensor_id): tuple(window)
+                for sensor_id, window in stored["sensors"].items()
+            }
+
+    def accept(self, sensor_id, sequence):
+        """True the first time `sequence` is seen for this sensor"""
+        with self._lock:
+            if sensor_id not in self._seen:
+                window = (sequence, 1)
+            else:
+                highest, mask = self._seen[sensor_id]
+                if sequence > highest:
+                    ahead = sequence - highest
+                    mask = (mask << ahead | 1) & ((1 << self.size) - 1)
+                    window = (sequence, mask)
+                else:
+                    behind = highest - sequence
+                    if behind >= self.size or mask & (1 << behind):
+                        return False
+                    window = (highest, mask | 1 << behind)
+            self._seen[sensor_id] = window
+            self._save()
+            return True
+
+    def _save(self):
+        if self.filename is None:
+            return
+        jsonfile.save(
+            self.filename,
+            {"sensors": {str(key): list(value) for key, value in self._seen.items()}},
+        )
+
+
+class UDPListener:
+    """
+    reads datagrams from a bound UDP socket (anything with `recvfrom`) and
+    stores the readings in them
+    """
+
+    def __init__(self, sock, secret, window=64, sequences_file=None):
+        self.sock = sock
+        self.secret = secret
+        self.window = SequenceWindow(window, sequences_file)
+        self.counts = collections.Counter()
+        self._closed = threading.Event()
+        self._thread = None
+
+    def handle(self, datagram, now=None):
+        """
+        authenticate and store one datagram. returns what became of it:
+        "accepted", "partial" (some readings rejected), "rejected" (all of
+        them), "duplicate" (seen before, or too old to tell), "unauthenticated"
+        or "malformed"
+        """
+        now = int(time.time()) if now is None else now
+        try:
+            sequence, payload = packet.verify(datagram, self.secret)
+        except ValueError:
+            return self._count("unauthenticated")
+        try:
+            sensor_id, sensor_name, samples = packet.decode(payload)
+            readings, summary, _ = parse_samples(sensor_name, samples, now)
+        except ValueError:
+            return self._count("malformed")
+        if not self.window.accept(sensor_id, sequence):
+            return self._count("duplicate")
+
+        if readings:
+            record_readings(readings, sensor_id)
+        if not readings:
+            return self._count("rejected")
+        return self._count("partial" if summary["rejected"] else "accepted")
+
+    def _count(self, outcome):
+        self.counts[outcome] += 1
+        return outcome
+
+    def serve(self, poll_interval=1.0):
+        """handle datagrams until `close` is called"""
+        self.sock.settimeout(poll_interval)
+        while not self._closed.is_set():
+            try:
+                datagram, _ = self.sock.recvfrom(MAX_DATAGRAM)
+            except socket.timeout:
+                continue
+            except OSError:
+                if self._closed.is_set():
+                    break
+                raise
+            try:
+                self.handle(datagram)
+            except Exception:
+                app.logger.exception("failed to store a UDP datagram")
+
+    def start(self):
+        """serve from a daemon thread"""
+        self._thread = threading.Thread(
+            target=self.serve, name="udp-listener", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def close(self):
+        self._closed.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.sock.close()
+
+
+def bind(host, port):
+    """a UDP socket bound to host:port for a `UDPListener`"""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    return sock
@@ -0,0 +1,165 @@
+import threading
+import time
+
+from app import app
+
+DURABILITY_LEVELS = ("none", "write", "fsync")
+
+
+class _Batch:
+    def __init__(self):
+        self.readings = []
+        # called once the readings are in the store
+        self.callbacks = []
+        self.started = None
+        self.done = threading.Event()
+        self.error = None
+
+
+class WriteBehindBuffer:
+    """
+    queue sensor readings in memory and hand them to a ReadingStore in batches,
+    from a background thread, once `max_batch` readings are waiting or the
+    oldest has waited `max_delay` seconds.
+
+    `durability` decides when `submit` returns:
+        "none"  as soon as the readings are queued
+        "write" once the batch holding them has been written to the store
+        "fsync" once that batch has also been synced to disk
+    """
+
+    def __init__(self, store, max_batch=200, max_delay=1.0, durability="write"):
+        if durability not in DURABILITY_LEVELS:
+            raise ValueError(f"unknown durability level {durability!r}")
+        self.store = store
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.durability = durability
+
+        self._cond = threading.Condition()
+        self._batch = _Batch()
+        self._closing = False
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+        self.flush_count = 0
+        self.flushed_readings = 0
+        self.failed_readings = 0
+        self.last_flush_seconds = 0.0
+        self.max_flush_seconds = 0.0
+        self.total_flush_seconds = 0.0
+
+    def submit(self, readings, on_written=None):
+        """
+        queue `(epoch_timestamp, sensor_name, temperature, humidity)` tuples.
+        `on_written` is called from the background thread once they have
+        been written to the store, and not at all if that fails
+        """
+        with self._cond:
+            if self._closing:
+                raise RuntimeError("write-behind buffer is closed")
+            batch = self._batch
+            batch.readings.extend(readings)
+            if on_written is not None:
+                batch.callbacks.append(on_written)
+            if batch.started is None:
+                # start the flusher's clock on the first reading of a batch
+                batch.started = time.monotonic()
+                self._cond.notify()
+            elif len(batch.readings) >= self.max_batch:
+                self._cond.notify()
+
+        if self.durability != "none":
+            batch.done.wait()
+            if batch.error is not None:
+                raise batch.error
+
+    def flush(self):
+        """write out whatever is queued right now and wait for it"""
+        with self._cond:
+            batch = self._batch
+            if not batch.readings:
+                return
+            # pretend the batch has already waited long enough
+            batch.started = time.monotonic() - self.max_delay
+            self._cond.notify()
+        batch.done.wait()
+
+    def close(self):
+        """flush anything still queued and stop the background thread"""
+        with self._cond:
+            self._closing = True
+            self._cond.notify()
+        self._thread.join()
+
+    @property
+    def queue_depth(self):
+        with self._cond:
+            return len(self._batch.readings)
+
+    def stats(self):
+        return {
+            "queue_depth": self.queue_depth,
+            "flush_count": self.flush_count,
+            "flushed_readings": self.flushed_readings,
+            "failed_readings": self.failed_readings,
+            "last_flush_ms": round(self.last_flush_seconds * 1000, 3),
+            "max_flush_ms": round(self.max_flush_seconds * 1000, 3),
+            "mean_flush_ms": (
+                round(self.total_flush_seconds * 1000 / self.flush_count, 3)
+                if self.flush_count
+                else 0.0
+            ),
+        }
+
+    def _next_batch(self):
+        """block until a batch is due, then swap in an empty one and return it"""
+        with self._cond:
+            while True:
+                batch = self._batch
+                if batch.readings:
+                    waited = time.monotonic() - batch.started
+                    if (
+                        self._closing
+                        or len(batch.readings) >= self.max_batch
+                        or waited >= self.max_delay
+                    ):
+                        self._batch = _Batch()
+                        return batch
+                    self._cond.wait(self.max_delay - waited)
+                elif self._closing:
+                    return None
+                else:
+                    self._cond.wait()
+
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            if batch is None:
+                return
+
+            started = time.perf_counter()
+            try:
+                self.store.add_sensor_readings(
+                    batch.readings, fsync=self.durability == "fsync"
+                )
+            except Exception as exc:
+                batch.error = exc
+                self.failed_readings += len(batch.readings)
+                app.logger.exception(
+                    "write-behind flush of %d readings failed", len(batch.readings)
+                )
+            else:
+                self.flushed_readings += len(batch.readings)
+                for callback in batch.callbacks:
+                    try:
+                        callback()
+                    except Exception:
+                        app.logger.exception("write-behind callback failed")
+            finally:
+                elapsed = time.perf_counter() - started
+                self.flush_count += 1
+                self.last_flush_seconds = elapsed
+                self.max_flush_seconds = max(self.max_flush_seconds, elapsed)
+                self.total_flush_seconds += elapsed
+                batch.done.set()
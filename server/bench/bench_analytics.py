@@ -0,0 +1,89 @@
+"""
+compare the row-by-row and the vectorised NumPy paths over a synthetic
+readings.csv: hourly per-sensor temperature/humidity stats plus the dew point
+of every reading.
+
+    python bench/bench_analytics.py --rows 3000000
+"""
+
+import argparse
+import math
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from app import analytics  # noqa: E402
+from app.store import CSVStore  # noqa: E402
+from app.timeutil import from_epoch, to_epoch  # noqa: E402
+
+
+def write_synthetic(filename, rows, sensors):
+    random.seed(0)
+    start = int(time.time()) - rows // sensors * 60
+    with open(filename, "w") as csv_file:
+        for i in range(rows):
+            timestamp = start + (i // sensors) * 60
+            temperature = round(21 + 4 * math.sin(i / 5000) + random.gauss(0, 0.3), 1)
+            humidity = round(45 + 10 * math.cos(i / 7000) + random.gauss(0, 1), 1)
+            csv_file.write(
+                f"{from_epoch(timestamp)},sensor{i % sensors},{temperature},{humidity}\r\n"
+            )
+
+
+def row_by_row():
+    buckets = {}
+    dew_points = []
+    for reading in CSVStore.iter_readings():
+        timestamp = to_epoch(reading["timestamp"])
+        temperature = float(reading["temperature"])
+        humidity = float(reading["humidity"])
+        key = (reading["sensor_name"], timestamp - timestamp % 3600)
+        stats = buckets.get(key)
+        if stats is None:
+            stats = buckets[key] = [0, 0.0, math.inf, -math.inf]
+        stats[0] += 1
+        stats[1] += temperature
+        stats[2] = min(stats[2], temperature)
+        stats[3] = max(stats[3], temperature)
+        gamma = math.log(humidity / 100) + 17.62 * temperature / (243.12 + temperature)
+        dew_points.append(243.12 * gamma / (17.62 - gamma))
+    return len(buckets)
+
+
+def vectorised():
+    frame = analytics.load_csv(CSVStore.filename)
+    hourly = analytics.resample(frame, 3600)
+    analytics.dew_point(frame.temperature, frame.humidity)
+    return len(hourly["bucket"])
+
+
+def timed(label, func):
+    started = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - started
+    print(f"{label:>12}: {elapsed:8.2f}s ({result} hourly buckets)")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=2000000)
+    parser.add_argument("--sensors", type=int, default=10)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        CSVStore.filename = os.path.join(directory, "readings.csv")
+        print(f"writing {args.rows} synthetic readings...")
+        write_synthetic(CSVStore.filename, args.rows, args.sensors)
+
+        slow = timed("row-by-row", row_by_row)
+        fast = timed("vectorised", vectorised)
+        print(f"{'speedup':>12}: {slow / fast:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+compare the JSON sensor uploads with the binary payload of app.packet: check
+that what the sensor firmware encodes (client/sensor/packet.py) decodes to
+the same readings, then report payload sizes and server side parse times.
+
+    python bench/bench_payload.py
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import timeit
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, ".."))
+sys.path.insert(0, os.path.join(HERE, "..", "..", "client", "sensor"))
+
+import packet as sensor_packet  # noqa: E402
+from app import packet  # noqa: E402
+
+
+def json_body(sensor_id, sensor_name, readings):
+    # the bodies client/sensor/main.py posts
+    if len(readings) == 1:
+        _, temperature, humidity = readings[0]
+        return json.dumps(
+            {
+                "sensor_name": sensor_name,
+                "sensor_id": sensor_id,
+                "temperature": temperature,
+                "humidity": humidity,
+            }
+        ).encode()
+    return json.dumps(
+        {
+            "sensor_name": sensor_name,
+            "sensor_id": sensor_id,
+            "readings": [
+                {"age": age, "temperature": temperature, "humidity": humidity}
+                for age, temperature, humidity in readings
+            ],
+        }
+    ).encode()
+
+
+def random_readings(count):
+    return [
+        (
+            60 * i,
+            None if random.random() < 0.05 else round(random.uniform(-20, 40), 1),
+            None if random.random() < 0.05 else round(random.uniform(0, 100), 1),
+        )
+        for i in range(count)
+    ]
+
+
+def check_round_trip(trials):
+    for _ in range(trials):
+        sensor_id = random.randrange(1 << 16)
+        name = random.choice(["office", "bedroom", "garage", "crawl space ☃"])
+        readings = random_readings(random.randint(1, 40))
+        encoded = sensor_packet.encode(sensor_id, name, readings)
+        assert encoded == packet.encode(sensor_id, name, readings)
+        assert packet.decode(encoded) == (sensor_id, name, readings)
+    for bad in (b"", b"\x02\x00\x01\x00", b"\x01\x03\x01\x00ab", b"\x01\x00\x01\x00x"):
+        try:
+            packet.decode(bad)
+        except ValueError:
+            continue
+        raise AssertionError(f"{bad!r} decoded")
+    print(f"round trip: {trials} random payloads decode to what was encoded")
+
+
+def compare(label, readings, number):
+    as_json = json_body(1, "sensor1", readings)
+    as_binary = packet.encode(1, "sensor1", readings)
+    json_us = timeit.timeit(lambda: json.loads(as_json), number=number) / number
+    binary_us = timeit.timeit(lambda: packet.decode(as_binary), number=number) / number
+    print(
+        f"{label:>12}: json {len(as_json):5d} B {json_us * 1e6:7.2f} us"
+        f"   binary {len(as_binary):5d} B {binary_us * 1e6:7.2f} us"
+        f"   ({len(as_binary) / len(as_json):.0%} of the size)"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--number", type=int, default=20000)
+    args = parser.parse_args()
+
+    random.seed(0)
+    check_round_trip(1000)
+    compare("1 reading", random_readings(1), args.number)
+    compare("40 readings", random_readings(40), args.number // 20)
+
+
+if __name__ == "__main__":
+    main()
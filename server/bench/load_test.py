@@ -0,0 +1,199 @@
+"""
+load test the sensor endpoints with thousands of simulated sensors, each
+opening a fresh connection per upload the way urequests does, and report
+requests per second and latency percentiles for each server mode.
+
+by default a server is started for each mode in a scratch directory:
+    wsgi  the threaded Flask server, as server_start.sh runs it
+    asgi  asgi.py under uvicorn (from requirements.txt)
+
+    python bench/load_test.py --sensors 2000 --duration 20
+    python bench/load_test.py --url http://127.0.0.1:5000   # a running server
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import resource
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from urllib.parse import urlsplit
+
+SERVER_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+
+def server_command(mode, port):
+    if mode == "wsgi":
+        return [sys.executable, "-m", "flask", "run", "--port", str(port)]
+    return [
+        sys.executable,
+        "-m",
+        "uvicorn",
+        "asgi:application",
+        "--app-dir",
+        SERVER_DIR,
+        "--port",
+        str(port),
+        "--log-level",
+        "warning",
+        "--backlog",
+        "4096",
+    ]
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_for_port(port, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=1).close()
+            return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f"server on port {port} didn't come up")
+
+
+async def request(host, port, method, path, body=b""):
+    """one request on a new connection. returns the status code"""
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        writer.write(
+            f"{method} {path} HTTP/1.1\r\nHost: {host}\r\n"
+            f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n"
+            "Connection: close\r\n\r\n".encode() + body
+        )
+        await writer.drain()
+        status_line = await reader.readline()
+        await reader.read()
+        return int(status_line.split()[1])
+    finally:
+        writer.close()
+
+
+async def sensor(number, host, port, args, deadline, results):
+    name = f"sensor{number}"
+    await asyncio.sleep(random.uniform(0, args.ramp))
+    while time.monotonic() < deadline:
+        if random.random() < args.reads:
+            method, path, body = "GET", f"/api/controller_state?sensor={name}", b""
+        else:
+            method, path = "POST", "/sensor/add_reading"
+            body = json.dumps(
+                {
+                    "sensor_name": name,
+                    "sensor_id": number,
+                    "temperature": round(random.uniform(15, 30), 1),
+                    "humidity": round(random.uniform(20, 80), 1),
+                }
+            ).encode()
+        started = time.perf_counter()
+        try:
+            status = await asyncio.wait_for(
+                request(host, port, method, path, body), args.timeout
+            )
+        except (OSError, asyncio.TimeoutError, IndexError, ValueError):
+            status = None
+        results.append((time.perf_counter() - started, status))
+        if args.interval:
+            await asyncio.sleep(args.interval)
+
+
+def percentile(values, fraction):
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+async def run_load(host, port, args):
+    results = []
+    started = time.monotonic()
+    deadline = started + args.ramp + args.duration
+    await asyncio.gather(
+        *(sensor(n, host, port, args, deadline, results) for n in range(args.sensors))
+    )
+    elapsed = time.monotonic() - started - args.ramp / 2
+    ok = sorted(latency for latency, status in results if status == 200)
+    errors = len(results) - len(ok)
+    if not ok:
+        return {"requests": len(results), "errors": errors}
+    return {
+        "requests": len(results),
+        "errors": errors,
+        "rps": len(ok) / elapsed,
+        "p50_ms": percentile(ok, 0.50) * 1000,
+        "p99_ms": percentile(ok, 0.99) * 1000,
+        "max_ms": ok[-1] * 1000,
+    }
+
+
+def report(label, stats):
+    if "rps" not in stats:
+        print(f"{label:>6}: {stats['requests']} requests, all failed")
+        return
+    print(
+        f"{label:>6}: {stats['rps']:8.1f} req/s  p50 {stats['p50_ms']:7.1f} ms"
+        f"  p99 {stats['p99_ms']:7.1f} ms  max {stats['max_ms']:7.1f} ms"
+        f"  ({stats['requests']} requests, {stats['errors']} errors)"
+    )
+
+
+def run_mode(mode, args):
+    port = free_port()
+    with tempfile.TemporaryDirectory() as directory:
+        env = dict(os.environ, FLASK_APP=os.path.join(SERVER_DIR, "server.py"))
+        server = subprocess.Popen(
+            server_command(mode, port),
+            cwd=directory,
+            env=env,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        try:
+            wait_for_port(port)
+            return asyncio.run(run_load("127.0.0.1", port, args))
+        finally:
+            server.terminate()
+            server.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sensors", type=int, default=2000)
+    parser.add_argument("--duration", type=float, default=20, help="seconds")
+    parser.add_argument(
+        "--ramp", type=float, default=2, help="seconds over which sensors start"
+    )
+    parser.add_argument(
+        "--interval", type=float, default=0, help="seconds between a sensor's uploads"
+    )
+    parser.add_argument(
+        "--reads", type=float, default=0.1, help="share of controller state reads"
+    )
+    parser.add_argument("--timeout", type=float, default=30, help="per request")
+    parser.add_argument("--modes", nargs="+", default=["wsgi", "asgi"])
+    parser.add_argument("--url", help="load an already running server instead")
+    args = parser.parse_args()
+
+    # every simulated sensor holds a socket open
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+
+    print(f"{args.sensors} sensors for {args.duration:g}s")
+    if args.url:
+        url = urlsplit(args.url)
+        report("server", asyncio.run(run_load(url.hostname, url.port or 80, args)))
+        return
+    for mode in args.modes:
+        report(mode, run_mode(mode, args))
+
+
+if __name__ == "__main__":
+    main()
@@ -6,3 +6,58 @@ class Config:
     TIME_FORMAT = r"%Y-%m-%d %H:%M:%S"
     SETPOINT_MIN = 50
     SETPOINT_MAX = 90
+    # where sensor readings are kept: "csv" or "sqlite"
+    READINGS_BACKEND = os.environ.get("READINGS_BACKEND") or "csv"
+    SQLITE_DATABASE = os.environ.get("SQLITE_DATABASE") or "./readings.db"
+    # queue incoming sensor readings and write them out in batches of up to
+    # WRITE_BEHIND_MAX_BATCH, at most WRITE_BEHIND_MAX_DELAY seconds apart
+    WRITE_BEHIND = os.environ.get("WRITE_BEHIND") == "1"
+    WRITE_BEHIND_MAX_BATCH = 200
+    WRITE_BEHIND_MAX_DELAY = 1.0
+    # when a sensor upload is acknowledged: "none" once queued (write-behind
+    # only), "write" once written to storage, "fsync" once synced to disk
+    WRITE_DURABILITY = os.environ.get("WRITE_DURABILITY") or "write"
+    # limits for bulk uploads from sensors that buffer readings between wakes.
+    # readings may be backdated by at most MAX_BACKFILL_AGE seconds, which is
+    # also how far the CSV store's time seeks have to look past their target
+    BULK_MAX_READINGS = 500
+    MAX_BACKFILL_AGE = 2 * 60 * 60
+    MAX_CLOCK_SKEW = 5 * 60
+    # page sizes for the raw readings view and the readings query API
+    READINGS_PAGE_SIZE = 100
+    READINGS_MAX_PAGE_SIZE = 1000
+    # readings older than ARCHIVE_AFTER seconds are moved out of readings.csv
+    # into the binary archive, checked every ARCHIVE_INTERVAL seconds. 0 turns
+    # compaction off; otherwise it has to be more than MAX_BACKFILL_AGE
+    ARCHIVE_AFTER = int(os.environ.get("ARCHIVE_AFTER") or 0)
+    ARCHIVE_INTERVAL = 60 * 60
+    # long-polls on /api/watch wait WATCH_TIMEOUT seconds by default, at most
+    # WATCH_MAX_TIMEOUT, and look for changes made by other workers every
+    # WATCH_POLL_INTERVAL seconds
+    WATCH_TIMEOUT = 25
+    WATCH_MAX_TIMEOUT = 55
+    WATCH_POLL_INTERVAL = 1.0
+    # the ASGI server mode (asgi.py) runs store calls in a pool of
+    # ASGI_IO_THREADS threads and refuses request bodies over ASGI_MAX_BODY
+    ASGI_IO_THREADS = 16
+    ASGI_MAX_BODY = 1024 * 1024
+    # the UDP listener (flask listen-udp) for sensors set to
+    # UPLOAD_TRANSPORT = "udp". it only runs with UDP_SECRET set, the key
+    # shared with the sensors
+    UDP_HOST = os.environ.get("UDP_HOST") or "0.0.0.0"
+    UDP_PORT = int(os.environ.get("UDP_PORT") or 5005)
+    UDP_SECRET = os.environ.get("UDP_SECRET")
+    # the sensor registry (sensors.json) is written when a new sensor shows
+    # up, and otherwise at most every REGISTRY_FLUSH_INTERVAL seconds
+    REGISTRY_FLUSH_INTERVAL = 10
+    # a sensor is flagged offline when it hasn't been heard from for
+    # OFFLINE_AFTER times SENSOR_INTERVAL seconds (the sensors' LOG_INTERVAL,
+    # times UPLOAD_EVERY for sensors that buffer). checked in the background
+    # every HEALTH_CHECK_INTERVAL seconds
+    SENSOR_INTERVAL = int(os.environ.get("SENSOR_INTERVAL") or 60)
+    OFFLINE_AFTER = float(os.environ.get("OFFLINE_AFTER") or 3)
+    HEALTH_CHECK_INTERVAL = 30
+    # the CSV backend's rollups are written out at most ROLLUP_FLUSH_INTERVAL
+    # seconds after a reading is stored (0: with every write), which is how
+    # long other workers can be behind on /api/aggregates
+    ROLLUP_FLUSH_INTERVAL = int(os.environ.get("ROLLUP_FLUSH_INTERVAL") or 10)
@@ -3,4 +3,13 @@ PROJ_ROOT=/usr/src/home_automation/home-automation/server
 PYTHON_BIN=$PROJ_ROOT/venv/bin/python3
 PIP_BIN=$PROJ_ROOT/venv/bin/pip3
 $PIP_BIN install -r $PROJ_ROOT/requirements.txt
-$PYTHON_BIN -m flask run
\ No newline at end of file
+# with UDP_SECRET set, also take sensor readings over UDP (flask listen-udp)
+if [ -n "$UDP_SECRET" ]; then
+    $PYTHON_BIN -m flask listen-udp &
+fi
+# SERVER_MODE=asgi serves the app from an event loop under uvicorn instead
+if [ "$SERVER_MODE" = "asgi" ]; then
+    $PYTHON_BIN -m uvicorn asgi:application --app-dir $PROJ_ROOT --host 0.0.0.0 --port 5000
+else
+    $PYTHON_BIN -m flask run
+fi
@@ -0,0 +1,94 @@
+# Runs the app against a fresh set of data files in a temporary directory:
+#
+#     cd server && python -m pytest -q tests
+
+import asyncio
+import os
+import sys
+import threading
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+from app import app as flask_app  # noqa: E402
+from app import asgi  # noqa: E402
+from app.archive import Archive  # noqa: E402
+from app.registry import SensorRegistry  # noqa: E402
+from app.rollups import RollupFiles  # noqa: E402
+from app.sqlite_store import SQLiteStore  # noqa: E402
+from app.store import CSVStore, SettingsStore  # noqa: E402
+
+
+@pytest.fixture
+def app(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setitem(flask_app.config, "READINGS_BACKEND", "csv")
+    monkeypatch.setitem(flask_app.config, "SQLITE_DATABASE", "./readings.db")
+    monkeypatch.setitem(flask_app.config, "WRITE_BEHIND", False)
+    monkeypatch.setitem(flask_app.config, "ARCHIVE_AFTER", 0)
+    # rollups are written relative to the working directory, so nothing can
+    # be left pending for a later test's directory
+    monkeypatch.setitem(flask_app.config, "ROLLUP_FLUSH_INTERVAL", 0)
+    flask_app.config["TESTING"] = True
+
+    # forget whatever the previous test's files left cached
+    monkeypatch.setattr(CSVStore, "_latest", {})
+    monkeypatch.setattr(CSVStore, "_latest_any", None)
+    monkeypatch.setattr(CSVStore, "_signature", None)
+    monkeypatch.setattr(CSVStore, "_indexed_offset", 0)
+    monkeypatch.setattr(CSVStore, "_scanned_from", 0)
+    monkeypatch.setattr(CSVStore, "_oldest_indexed", None)
+    monkeypatch.setattr(SettingsStore, "_settings", None)
+    monkeypatch.setattr(SettingsStore, "_signature", None)
+    monkeypatch.setattr(SensorRegistry, "_sensors", {})
+    monkeypatch.setattr(SensorRegistry, "_signature", None)
+    monkeypatch.setattr(SensorRegistry, "_pending", set())
+    monkeypatch.setattr(Archive, "_index", None)
+    monkeypatch.setattr(Archive, "_signature", None)
+    monkeypatch.setattr(Archive, "_views", {})
+    monkeypatch.setattr(RollupFiles, "_pending", {})
+    monkeypatch.setattr(SQLiteStore, "_local", threading.local())
+    return flask_app
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def asgi_call(app):
+    """
+    `call(method, path, body=b"", headers={})` runs one request through the
+    ASGI front end and returns its status, headers and body
+    """
+
+    def call(method, path, body=b"", headers=None):
+        path, _, query = path.partition("?")
+        messages = []
+
+        async def receive():
+            return {"type": "http.request", "body": body, "more_body": False}
+
+        async def send(message):
+            messages.append(message)
+
+        scope = {
+            "type": "http",
+            "method": method,
+            "path": path,
+            "query_string": query.encode(),
+            "headers": [
+                (name.lower().encode(), value.encode())
+                for name, value in (headers or {}).items()
+            ],
+        }
+        asyncio.run(asgi.application(scope, receive, send))
+        response_headers = {
+            name.decode(): value.decode() for name, value in messages[0]["headers"]
+        }
+        content = b"".join(message.get("body", b"") for message in messages[1:])
+        return messages[0]["status"], response_headers, content
+
+    return call
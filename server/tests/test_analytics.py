@@ -0,0 +1,45 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from app import analytics
+from app.archive import Archive
+from app.store import CSVStore
+
+
+def test_load_csv_skips_rows_that_dont_parse(app):
+    with open("readings.csv", "w") as csv_file:
+        csv_file.write("timestamp,sensor,temperature,humidity\n")
+        csv_file.write("1700000000,den,20.5,40\n")
+        csv_file.write("1700000060,den,abc,40\n")
+        csv_file.write("1700000120,den,21,\n")
+        csv_file.write("2023-11-14 22:15:00,porch,5.5,80\n")
+        csv_file.write("not a time,porch,5.5,80\n")
+        csv_file.write(",porch,5.5,80\n")
+        csv_file.write("99999999999999999999999,porch,5.5,80\n")
+        csv_file.write("1700000180,porch," + "9" * 100000 + ",80\n")
+
+    frame = analytics.load_csv()
+    assert frame.timestamps.tolist() == [1700000000, 1700000120, 1700000100]
+    assert [frame.sensor_names[code] for code in frame.sensor_codes] == [
+        "den",
+        "den",
+        "porch",
+    ]
+    assert frame.temperature.tolist() == [20.5, 21.0, 5.5]
+    assert np.isnan(frame.humidity[1])
+
+
+def test_load_csv_includes_the_archive(app):
+    CSVStore.add_sensor_readings(
+        [
+            (1700000000, "den", 20.0, 40.0),
+            (1700000060, "den", 20.5, 41.0),
+            (1800000000, "den", 21.0, 42.0),
+        ]
+    )
+    Archive.append([(1700000000, "den", 20.0, 40.0)], 1700000060)
+
+    # the first row is in the archive as well, and counted once
+    frame = analytics.load_csv()
+    assert sorted(frame.timestamps.tolist()) == [1700000000, 1700000060, 1800000000]
@@ -0,0 +1,130 @@
+import os
+import threading
+import time
+
+import pytest
+
+from app.archive import Archive, Compactor
+from app.store import CSVStore
+from app.timeutil import from_epoch
+
+pytest.importorskip("numpy")
+
+DAY = 24 * 60 * 60
+
+
+def add_readings():
+    """readings from last month, last week and just now, the last one current"""
+    now = int(time.time())
+    CSVStore.add_sensor_readings(
+        [
+            (now - 40 * DAY, "attic", 30.5, None),
+            (now - 7 * DAY, "den", 19.0, 45.0),
+            (now - 60, "den", 21.0, 40.0),
+        ]
+    )
+    return now
+
+
+def temperatures_of(readings):
+    # archived measurements come back as the shortest text for their float32
+    return [float(reading["temperature"]) for reading in readings]
+
+
+def test_compaction_moves_old_readings_into_the_archive(app):
+    now = add_readings()
+
+    assert CSVStore.compact(DAY) == 2
+    assert now - DAY <= Archive.boundary() <= int(time.time()) - DAY
+    with open(CSVStore.filename) as csv_file:
+        assert csv_file.read().splitlines() == [f"{now - 60},den,21.0,40.0"]
+    assert len(Archive.segments()) == 2
+
+    # nothing left to move
+    assert CSVStore.compact(DAY) == 0
+
+
+def test_compaction_stays_clear_of_backfill(app):
+    add_readings()
+    with pytest.raises(ValueError):
+        CSVStore.compact(app.config["MAX_BACKFILL_AGE"])
+    assert not os.path.exists(Archive.directory)
+
+
+def test_reads_span_the_archive_and_the_csv(app):
+    now = add_readings()
+    CSVStore.compact(DAY)
+
+    temperatures = [30.5, 19.0, 21.0]
+    assert temperatures_of(CSVStore.get_all()) == temperatures
+    assert temperatures_of(CSVStore.iter_readings()) == temperatures
+    assert CSVStore.get_all()[0] == {
+        "timestamp": from_epoch(now - 40 * DAY),
+        "sensor_name": "attic",
+        "temperature": "30.5",
+        "humidity": "",
+    }
+
+    rows, cursors = [], []
+    cursor = None
+    while True:
+        page, cursor = CSVStore.query(limit=1, cursor=cursor)
+        rows.extend(page)
+        if cursor is None:
+            break
+        cursors.append(cursor)
+    assert temperatures_of(rows) == temperatures
+    assert cursors[0].startswith("a:") and cursors[1].startswith("a:")
+
+    den, _ = CSVStore.query(sensor_name="den", start=now - 8 * DAY, end=now)
+    assert temperatures_of(den) == [19.0, 21.0]
+
+
+def test_latest_reading_of_a_sensor_only_in_the_archive(app):
+    now = add_readings()
+    CSVStore.compact(DAY)
+
+    attic = CSVStore.get_last_reading("attic")
+    assert attic["epoch"] == now - 40 * DAY
+    assert attic["temperature"] == "30.5"
+    assert attic["humidity"] == ""
+    assert Archive.latest("den")["epoch"] == now - 7 * DAY
+    assert Archive.latest(None)["location"] == "den"
+    assert Archive.latest("porch") is None
+    # the CSV still has a newer one
+    assert CSVStore.get_last_reading("den")["epoch"] == now - 60
+
+
+def test_compact_archive_command(app):
+    add_readings()
+    runner = app.test_cli_runner()
+
+    result = runner.invoke(args=["compact-archive"])
+    assert result.exit_code != 0
+    assert "ARCHIVE_AFTER" in result.output
+
+    result = runner.invoke(args=["compact-archive", "--age", "60"])
+    assert result.exit_code != 0
+    assert "MAX_BACKFILL_AGE" in result.output
+
+    result = runner.invoke(args=["compact-archive", "--age", str(DAY)])
+    assert result.exit_code == 0
+    assert result.output == "archived 2 readings\n"
+
+
+def test_compactor_keeps_going_after_a_failure(app):
+    calls = []
+    called_twice = threading.Event()
+
+    def compact(max_age):
+        calls.append(max_age)
+        if len(calls) == 2:
+            called_twice.set()
+        raise OSError("disk full")
+
+    compactor = Compactor(compact, max_age=DAY, interval=0.01)
+    try:
+        assert called_twice.wait(timeout=5)
+    finally:
+        compactor.close()
+    assert calls[:2] == [DAY, DAY]
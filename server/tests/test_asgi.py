@@ -0,0 +1,88 @@
+import json
+
+import pytest
+
+
+@pytest.fixture
+def both(client, asgi_call):
+    """`call(method, path, body, headers)` through Flask and through ASGI"""
+
+    def call(method, path, body=b"", headers=None):
+        response = client.open(path, method=method, data=body, headers=headers)
+        flask = (
+            response.status_code,
+            response.headers.get("ETag"),
+            json.loads(response.data) if response.data else None,
+        )
+        status, response_headers, content = asgi_call(method, path, body, headers)
+        asgi = (
+            status,
+            response_headers.get("etag"),
+            json.loads(content) if content else None,
+        )
+        return flask, asgi
+
+    return call
+
+
+@pytest.mark.parametrize(
+    "body",
+    [
+        b"",
+        b"not json",
+        b'{"sensor_name": "den"}',
+        b'{"sensor_name": "den", "sensor_id": 1, "temperature": "abc"}',
+    ],
+)
+def test_add_reading_errors_match(both, body):
+    flask, asgi = both(
+        "POST", "/sensor/add_reading", body, {"Content-Type": "application/json"}
+    )
+    assert flask == asgi
+    assert flask[0] == 400
+    assert flask[2]["status"] == "failed"
+
+
+def test_add_readings_results_match(both):
+    body = json.dumps(
+        {
+            "sensor_name": "den",
+            "sensor_id": 1,
+            "readings": [{"age": 60, "temperature": 20.5}, {"humidity": 40}],
+        }
+    ).encode()
+    flask, asgi = both(
+        "POST", "/sensor/add_readings", body, {"Content-Type": "application/json"}
+    )
+    assert flask == asgi
+    assert flask[0] == 200
+    assert flask[2]["status"] == "partial"
+
+
+def test_controller_state_etags_match(both):
+    both(
+        "POST",
+        "/sensor/add_reading",
+        b'{"sensor_name": "den", "sensor_id": 1, "temperature": 20.5}',
+        {"Content-Type": "application/json"},
+    )
+    flask, asgi = both("GET", "/api/controller_state?sensor=den")
+    assert flask[0] == asgi[0] == 200
+    etag = flask[1]
+    assert etag == asgi[1]
+
+    # If-None-Match is read the same way by both: any listed tag or * matches,
+    # a weak one never does
+    for if_none_match in (etag, f'"other", {etag}', "*"):
+        flask, asgi = both(
+            "GET",
+            "/api/controller_state?sensor=den",
+            headers={"If-None-Match": if_none_match},
+        )
+        assert flask[0] == asgi[0] == 304
+    flask, asgi = both(
+        "GET",
+        "/api/controller_state?sensor=den",
+        headers={"If-None-Match": "W/" + etag},
+    )
+    assert flask[0] == asgi[0] == 200
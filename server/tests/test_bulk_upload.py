@@ -0,0 +1,134 @@
+import time
+
+import pytest
+
+from app.ingest import parse_bulk
+from app.registry import SensorRegistry
+from app.store import get_reading_store
+
+NOW = 1700000000
+
+
+def upload(client, readings, sensor_name="den"):
+    return client.post(
+        "/sensor/add_readings",
+        json={"sensor_name": sensor_name, "sensor_id": 1, "readings": readings},
+    )
+
+
+@pytest.mark.parametrize("backend", ["csv", "sqlite"])
+def test_every_reading_accepted(app, client, monkeypatch, backend):
+    monkeypatch.setitem(app.config, "READINGS_BACKEND", backend)
+    now = int(time.time())
+
+    response = upload(
+        client,
+        [
+            {"timestamp": now - 60, "temperature": 21.0, "humidity": 40.0},
+            # sent out of order, and by age for a sensor without a clock
+            {"age": 120, "temperature": 20.0, "humidity": 41.0},
+            {"timestamp": now, "temperature": 22.0},
+        ],
+    )
+    assert response.status_code == 200
+    assert response.get_json() == {
+        "status": "success",
+        "accepted": 3,
+        "rejected": 0,
+        "results": [{"status": "success"}] * 3,
+    }
+
+    rows, _ = get_reading_store().query(sensor_name="den")
+    assert [row["temperature"] for row in rows] == ["20.0", "21.0", "22.0"]
+    assert rows[-1]["humidity"] == ""
+    assert get_reading_store().get_last_reading("den")["epoch"] == now
+    assert SensorRegistry.get("den")["last_seen"] == now
+
+
+def test_some_readings_rejected(client):
+    now = int(time.time())
+
+    response = upload(
+        client,
+        [
+            {"timestamp": now, "temperature": 21.0},
+            {"timestamp": now - 3 * 60 * 60, "temperature": 20.0},
+            {"timestamp": now + 60 * 60, "temperature": 20.0},
+            {"age": -5, "temperature": 20.0},
+            {"temperature": 20.0},
+            {"timestamp": now, "temperature": "warm"},
+            "21.0",
+        ],
+    )
+    assert response.status_code == 200
+    body = response.get_json()
+    assert (body["status"], body["accepted"], body["rejected"]) == ("partial", 1, 6)
+    assert [result.get("message") for result in body["results"]] == [
+        None,
+        "timestamp is too old",
+        "timestamp is in the future",
+        "age must be a non-negative number of seconds",
+        "reading needs a timestamp or an age",
+        "temperature must be a number",
+        "reading must be an object",
+    ]
+    assert len(get_reading_store().get_all()) == 1
+
+
+def test_nothing_accepted(client):
+    response = upload(client, [{"temperature": 20.0}])
+    assert response.status_code == 400
+    assert response.get_json()["status"] == "failed"
+    assert get_reading_store().get_all() is None
+
+
+@pytest.mark.parametrize(
+    "payload",
+    [
+        {"sensor_id": 1, "readings": []},
+        {"sensor_name": "den", "readings": []},
+        {"sensor_name": "den", "sensor_id": 1, "readings": {"age": 0}},
+        ["not", "an", "object"],
+    ],
+)
+def test_malformed_uploads(client, payload):
+    response = client.post("/sensor/add_readings", json=payload)
+    assert response.status_code == 400
+    assert response.get_json() == {
+        "status": "failed",
+        "message": "sensor_name, sensor_id and readings needed",
+    }
+
+
+def test_too_many_readings(app, client, monkeypatch):
+    monkeypatch.setitem(app.config, "BULK_MAX_READINGS", 2)
+    response = upload(client, [{"age": 0, "temperature": 20.0}] * 3)
+    assert response.status_code == 413
+    assert response.get_json()["status"] == "failed"
+    assert get_reading_store().get_all() is None
+
+
+def test_backfill_limits(app):
+    skew = app.config["MAX_CLOCK_SKEW"]
+    backfill = app.config["MAX_BACKFILL_AGE"]
+    readings, summary, code = parse_bulk(
+        "den",
+        [
+            {"timestamp": NOW + skew},
+            {"timestamp": NOW + skew + 1},
+            {"age": backfill},
+            {"age": backfill + 1},
+            # fractions of a second are dropped
+            {"timestamp": NOW + 0.5},
+        ],
+        NOW,
+    )
+    assert (summary["status"], code) == ("partial", 200)
+    assert [result["status"] for result in summary["results"]] == [
+        "success",
+        "failed",
+        "success",
+        "failed",
+        "success",
+    ]
+    assert [reading[0] for reading in readings] == [NOW - backfill, NOW, NOW + skew]
@@ -0,0 +1,85 @@
+import os
+import time
+
+from werkzeug.http import http_date
+
+
+def add_reading(client, temperature=70.5):
+    response = client.post(
+        "/sensor/add_reading",
+        json={
+            "sensor_name": "den",
+            "sensor_id": 1,
+            "temperature": temperature,
+            "humidity": 40,
+        },
+    )
+    assert response.status_code == 200
+
+
+def test_current_temp_validators(client):
+    add_reading(client)
+    response = client.get("/current_temp")
+    assert response.status_code == 200
+    etag = response.headers["ETag"]
+    last_modified = response.headers["Last-Modified"]
+    assert etag and last_modified
+
+    again = client.get("/current_temp", headers={"If-None-Match": etag})
+    assert again.status_code == 304
+    assert again.headers["ETag"] == etag
+    assert again.data == b""
+
+    since = client.get("/current_temp", headers={"If-Modified-Since": last_modified})
+    assert since.status_code == 304
+
+    earlier = http_date(response.last_modified.timestamp() - 60)
+    assert (
+        client.get("/current_temp", headers={"If-Modified-Since": earlier}).status_code
+        == 200
+    )
+
+
+def test_current_temp_new_reading_changes_etag(client):
+    add_reading(client, 70.5)
+    etag = client.get("/current_temp").headers["ETag"]
+    add_reading(client, 71.0)
+    response = client.get("/current_temp", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+    assert response.json["temperature"] == "71.0"
+
+
+def test_temp_setpoint_validators(client):
+    client.get("/temp_setpoint")
+    # Last-Modified has whole seconds, so date the settings back far enough
+    # for the POST below to land in a later one
+    past = time.time() - 10
+    os.utime("settings.json", (past, past))
+    response = client.get("/temp_setpoint")
+    assert response.status_code == 200
+    etag = response.headers["ETag"]
+    last_modified = response.headers["Last-Modified"]
+
+    assert (
+        client.get("/temp_setpoint", headers={"If-None-Match": etag}).status_code == 304
+    )
+    assert (
+        client.get(
+            "/temp_setpoint", headers={"If-Modified-Since": last_modified}
+        ).status_code
+        == 304
+    )
+
+    assert client.post("/temp_setpoint", json={"newSetpoint": 68}).status_code == 200
+
+    changed = client.get("/temp_setpoint", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
+    assert changed.json == {"setpoint": 68}
+    assert (
+        client.get(
+            "/temp_setpoint", headers={"If-Modified-Since": last_modified}
+        ).status_code
+        == 200
+    )
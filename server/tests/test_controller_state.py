@@ -0,0 +1,25 @@
+import json
+
+import pytest
+
+
+@pytest.fixture
+def garbled(app):
+    # a row stored before readings were validated
+    with open("readings.csv", "w") as csv_file:
+        csv_file.write("1700000000,den,abc,nan\n")
+
+
+def test_unreadable_measurements_come_back_as_null(client, garbled):
+    response = client.get("/api/controller_state?sensor=den")
+    assert response.status_code == 200
+    assert response.json["temperature"] is None
+    assert response.json["humidity"] is None
+
+
+def test_unreadable_measurements_come_back_as_null_from_asgi(asgi_call, garbled):
+    status, _, content = asgi_call("GET", "/api/controller_state?sensor=den")
+    assert status == 200
+    body = json.loads(content)
+    assert body["temperature"] is None
+    assert body["humidity"] is None
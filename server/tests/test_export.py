@@ -0,0 +1,109 @@
+import csv
+import gzip
+import io
+import itertools
+import json
+
+import pytest
+
+from app.export import chunked, csv_lines, gzipped, ndjson_lines
+from app.store import get_reading_store
+
+START = 1700000000
+
+
+def add_readings(store):
+    store.add_sensor_readings(
+        [
+            (START + 60 * i, "den" if i % 2 == 0 else "porch", 20.0 + i, 40.0)
+            for i in range(10)
+        ]
+    )
+
+
+@pytest.mark.parametrize("backend", ["csv", "sqlite"])
+def test_csv_export(app, client, monkeypatch, backend):
+    monkeypatch.setitem(app.config, "READINGS_BACKEND", backend)
+    add_readings(get_reading_store())
+
+    response = client.get("/export?sensor=den")
+    assert response.status_code == 200
+    assert response.mimetype == "text/csv"
+    assert (
+        response.headers["Content-Disposition"] == "attachment; filename=readings.csv"
+    )
+    rows = list(csv.DictReader(io.StringIO(response.get_data(as_text=True))))
+    assert len(rows) == 5
+    assert rows[0] == {
+        "timestamp": "2023-11-14 22:13:20",
+        "sensor_name": "den",
+        "temperature": "20.0",
+        "humidity": "40.0",
+    }
+    assert {row["sensor_name"] for row in rows} == {"den"}
+
+
+@pytest.mark.parametrize("backend", ["csv", "sqlite"])
+def test_gzipped_ndjson_export(app, client, monkeypatch, backend):
+    monkeypatch.setitem(app.config, "READINGS_BACKEND", backend)
+    add_readings(get_reading_store())
+
+    response = client.get(
+        "/export", query_string={"format": "ndjson", "gzip": "1", "from": START + 300}
+    )
+    assert response.status_code == 200
+    assert response.mimetype == "application/gzip"
+    assert (
+        response.headers["Content-Disposition"]
+        == "attachment; filename=readings.ndjson.gz"
+    )
+    lines = gzip.decompress(response.get_data()).decode().splitlines()
+    readings = [json.loads(line) for line in lines]
+    assert [float(reading["temperature"]) for reading in readings] == [
+        25.0 + i for i in range(5)
+    ]
+
+
+def test_empty_export_is_just_the_header(client):
+    response = client.get("/export")
+    assert response.status_code == 200
+    assert response.get_data(as_text=True).strip() == (
+        "timestamp,sensor_name,temperature,humidity"
+    )
+
+
+@pytest.mark.parametrize(
+    "query",
+    ["format=xml", "limit=0", "from=yesterday"],
+    ids=["format", "limit", "from"],
+)
+def test_bad_export_arguments(client, query):
+    response = client.get(f"/export?{query}")
+    assert response.status_code == 400
+    assert response.get_json()["status"] == "failed"
+
+
+def endless_readings():
+    for i in itertools.count():
+        yield {
+            "timestamp": str(START + i),
+            "sensor_name": "den",
+            "temperature": "20.0",
+            "humidity": "40.0",
+        }
+
+
+@pytest.mark.parametrize("encode", [csv_lines, ndjson_lines])
+def test_stages_stream_rather_than_collect(encode):
+    # every stage has to hand over a chunk without reading to the end
+    chunks = gzipped(chunked(encode(endless_readings()), chunk_size=1024))
+    compressed = b""
+    while len(compressed) < 64:
+        compressed += next(chunks)
+
+
+def test_chunks_are_about_chunk_size():
+    lines = ["x" * 99 + "\n"] * 25
+    chunks = list(chunked(lines, chunk_size=1000))
+    assert [len(chunk) for chunk in chunks] == [1000, 1000, 500]
+    assert b"".join(chunks) == "".join(lines).encode()
@@ -0,0 +1,114 @@
+import logging
+import time
+
+import pytest
+
+from app.health import SensorMonitor, max_silence, sensor_status
+from app.registry import SensorRegistry
+from app.store import CSVStore
+
+NOW = 1700000000
+
+
+@pytest.fixture
+def monitor(app):
+    # checked by hand, the background thread never gets a turn
+    monitor = SensorMonitor(max_age=180, interval=3600)
+    yield monitor
+    monitor.close()
+
+
+def test_sensor_status():
+    entry = {"name": "den", "last_seen": NOW - 100}
+    assert sensor_status(entry, NOW, 180) == {
+        "name": "den",
+        "last_seen": NOW - 100,
+        "age": 100,
+        "online": True,
+        "offline_since": None,
+    }
+    status = sensor_status(entry, NOW + 200, 180)
+    assert not status["online"]
+    assert status["offline_since"] == NOW + 80
+    # a clock that runs behind a sensor's doesn't make for a negative age
+    assert sensor_status(entry, NOW - 200, 180)["age"] == 0
+
+
+def test_check_flags_quiet_sensors_and_logs_changes(app, monitor, caplog):
+    SensorRegistry.record([(NOW, "den", 20.5, 40.0), (NOW - 600, "attic", 30.0, None)])
+
+    with caplog.at_level(logging.INFO, logger=app.logger.name):
+        statuses = monitor.check(now=NOW + 60)
+        assert {status["name"]: status["online"] for status in statuses} == {
+            "attic": False,
+            "den": True,
+        }
+        assert "sensor attic is offline" in caplog.text
+
+        # only changes are logged
+        caplog.clear()
+        monitor.check(now=NOW + 60)
+        assert caplog.text == ""
+
+        SensorRegistry.record([(NOW + 120, "attic", 29.5, None)])
+        monitor.check(now=NOW + 240)
+        assert "sensor attic is reporting again" in caplog.text
+        assert "sensor den is offline" in caplog.text
+
+
+def test_check_doesnt_read_the_history(app, monitor, monkeypatch):
+    SensorRegistry.record([(NOW, "den", 20.5, 40.0)])
+
+    def no_history(*args, **kwargs):
+        raise AssertionError("the reading history was read")
+
+    for method in ("get_last_reading", "get_all", "query", "iter_readings"):
+        monkeypatch.setattr(CSVStore, method, no_history)
+    assert monitor.check(now=NOW)[0]["online"]
+
+
+def test_background_checks(app):
+    SensorRegistry.record([(NOW, "den", 20.5, 40.0)])
+    monitor = SensorMonitor(max_age=180, interval=0.01)
+    try:
+        deadline = time.monotonic() + 5
+        while monitor._offline != {"den"} and time.monotonic() < deadline:
+            time.sleep(0.01)
+    finally:
+        monitor.close()
+    assert monitor._offline == {"den"}
+
+
+def post_reading(client, sensor_name):
+    response = client.post(
+        "/sensor/add_reading",
+        json={
+            "sensor_name": sensor_name,
+            "sensor_id": 1,
+            "temperature": 20.5,
+            "humidity": 40,
+        },
+    )
+    assert response.status_code == 200
+
+
+def test_sensors_endpoint(client):
+    post_reading(client, "den")
+    SensorRegistry.record([(int(time.time()) - 3600, "attic", 30.0, None)])
+
+    body = client.get("/api/sensors").get_json()
+    assert body["offline"] == ["attic"]
+    assert body["offline_after"] == max_silence()
+    sensors = {sensor["name"]: sensor for sensor in body["sensors"]}
+    assert sensors["den"]["online"]
+    assert sensors["den"]["temperature"] == 20.5
+    assert sensors["attic"]["age"] >= 3600
+
+
+def test_dashboard_marks_offline_sensors(client):
+    post_reading(client, "den")
+    SensorRegistry.record([(int(time.time()) - 3600, "attic", 30.0, None)])
+
+    page = client.get("/").get_data(as_text=True)
+    assert page.count("offline, last seen") == 1
+    assert page.index("Attic") < page.index("offline, last seen") < page.index("Den")
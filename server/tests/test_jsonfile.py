@@ -0,0 +1,28 @@
+import os
+
+from app import jsonfile
+
+
+def test_create_leaves_an_existing_file_alone(tmp_path):
+    filename = str(tmp_path / "settings.json")
+    jsonfile.create(filename, {"setpoint": 72})
+    jsonfile.save(filename, {"setpoint": 65})
+    jsonfile.create(filename, {"setpoint": 72})
+    assert jsonfile.load(filename) == {"setpoint": 65}
+    assert sorted(os.listdir(tmp_path)) == ["settings.json"]
+
+
+def test_create_while_holding_the_lock(tmp_path):
+    filename = str(tmp_path / "settings.json")
+    with jsonfile.locked(filename):
+        jsonfile.create(filename, {"setpoint": 72})
+    assert jsonfile.load(filename) == {"setpoint": 72}
+
+
+def test_save_changes_the_signature(tmp_path):
+    filename = str(tmp_path / "sensors.json")
+    first = jsonfile.save(filename, {"sensors": []})
+    assert first == jsonfile.signature(filename)
+    second = jsonfile.save(filename, {"sensors": []})
+    # same size and maybe the same mtime, but a new inode
+    assert second != first
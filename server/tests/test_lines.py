@@ -0,0 +1,78 @@
+import io
+import os
+
+import pytest
+
+from app.lines import line_boundary, reverse_lines
+from app.store import CSVStore
+
+CONTENT = (
+    b"first\n\nsecond line\nx\n" + b"a much longer line than the rest\n" + b"last\n"
+)
+
+
+class CountingFile(io.BytesIO):
+    """a file that counts how many bytes have been read from it"""
+
+    read_bytes = 0
+
+    def read(self, size=-1):
+        data = super().read(size)
+        self.read_bytes += len(data)
+        return data
+
+
+def expected_lines(content):
+    lines = []
+    offset = 0
+    for line in content.split(b"\n")[:-1]:
+        if line:
+            lines.append((offset, line))
+        offset += len(line) + 1
+    return lines[::-1]
+
+
+@pytest.mark.parametrize("block_size", [1, 2, 3, 5, 7, 16, 64, 1024])
+def test_reverse_lines_across_block_boundaries(block_size):
+    lines = list(reverse_lines(io.BytesIO(CONTENT), len(CONTENT), block_size))
+    assert lines == expected_lines(CONTENT)
+
+
+def test_reverse_lines_from_a_boundary_inside_the_file():
+    end = CONTENT.index(b"x\n") + 2
+    lines = list(reverse_lines(io.BytesIO(CONTENT), end, block_size=4))
+    assert lines == expected_lines(CONTENT[:end])
+
+
+def test_reverse_lines_only_reads_what_is_consumed():
+    content = b"".join(b"%08d\n" % i for i in range(10000))
+    binary_file = CountingFile(content)
+    lines = reverse_lines(binary_file, len(content), block_size=64)
+    assert next(lines) == (len(content) - 9, b"00009999")
+    assert next(lines) == (len(content) - 18, b"00009998")
+    assert binary_file.read_bytes <= 64
+
+
+def test_line_boundary_leaves_out_a_partial_last_line():
+    content = b"one\ntwo\nthr"
+    assert line_boundary(io.BytesIO(content), len(content), block_size=2) == 8
+    assert line_boundary(io.BytesIO(b"partial"), 7) == 0
+
+
+def test_cold_lookup_stops_at_the_requested_sensor(app, monkeypatch):
+    # a quiet sensor far back, then a lot of history from a busy one
+    rows = [(1700000000, "attic", 25.0, 30.0)]
+    rows += [(1700000000 + i * 60, "den", 20.0, 40.0) for i in range(1, 5000)]
+    CSVStore.add_sensor_readings(rows)
+    size = os.path.getsize(CSVStore.filename)
+    monkeypatch.setattr(CSVStore, "_latest", {})
+    monkeypatch.setattr(CSVStore, "_latest_any", None)
+    monkeypatch.setattr(CSVStore, "_signature", None)
+
+    assert CSVStore.get_last_reading("den")["epoch"] == 1700000000 + 4999 * 60
+    # the newest den row settles it, so only about MAX_BACKFILL_AGE of the
+    # history behind it is read
+    assert CSVStore._scanned_from > size * 9 // 10
+
+    assert CSVStore.get_last_reading("attic")["epoch"] == 1700000000
+    assert CSVStore._scanned_from == 0
@@ -0,0 +1,144 @@
+import pytest
+
+from app.store import CSVStore, get_reading_store
+
+START = 1700000000
+
+
+def add_readings(store, count=30):
+    """`count` readings a minute apart, alternating between den and porch"""
+    store.add_sensor_readings(
+        [
+            (START + 60 * i, "den" if i % 2 == 0 else "porch", 20.0 + i, 40.0)
+            for i in range(count)
+        ]
+    )
+
+
+def read_pages(client, **args):
+    """every reading /api/readings returns, following next_cursor to the end"""
+    rows = []
+    pages = 0
+    while True:
+        response = client.get("/api/readings", query_string=args)
+        assert response.status_code == 200
+        body = response.get_json()
+        rows.extend(body["readings"])
+        pages += 1
+        if body["next_cursor"] is None:
+            return rows, pages
+        args["cursor"] = body["next_cursor"]
+
+
+@pytest.mark.parametrize("backend", ["csv", "sqlite"])
+def test_paging_returns_every_reading_once(app, client, monkeypatch, backend):
+    monkeypatch.setitem(app.config, "READINGS_BACKEND", backend)
+    add_readings(get_reading_store())
+
+    rows, pages = read_pages(client, limit=7)
+
+    assert pages == 5
+    assert [float(row["temperature"]) for row in rows] == [20.0 + i for i in range(30)]
+    assert rows[0] == {
+        "timestamp": "2023-11-14 22:13:20",
+        "sensor_name": "den",
+        "temperature": "20.0",
+        "humidity": "40.0",
+    }
+
+
+@pytest.mark.parametrize("backend", ["csv", "sqlite"])
+def test_sensor_and_time_filters(app, client, monkeypatch, backend):
+    monkeypatch.setitem(app.config, "READINGS_BACKEND", backend)
+    add_readings(get_reading_store())
+
+    rows, _ = read_pages(client, sensor="porch", limit=4)
+    assert len(rows) == 15
+    assert {row["sensor_name"] for row in rows} == {"porch"}
+
+    # `from` is inclusive and `to` exclusive, as epoch seconds or ISO 8601
+    by_epoch, _ = read_pages(client, **{"from": START + 600, "to": START + 1200})
+    by_iso, _ = read_pages(
+        client, **{"from": "2023-11-14T22:23:20Z", "to": "2023-11-14 22:33:20"}
+    )
+    assert [float(row["temperature"]) for row in by_epoch] == [
+        30.0 + i for i in range(10)
+    ]
+    assert by_iso == by_epoch
+
+
+def test_backfilled_readings_are_found_by_time(app, client):
+    add_readings(CSVStore)
+    # uploaded late, so it sits after newer rows in the file
+    CSVStore.add_sensor_readings([(START + 90, "attic", 25.0, 30.0)])
+
+    rows, _ = read_pages(client, **{"from": START + 60, "to": START + 120})
+    assert [row["sensor_name"] for row in rows] == ["porch", "attic"]
+
+
+def test_a_late_start_seeks_instead_of_reading_everything(app, client, monkeypatch):
+    # longer than MAX_BACKFILL_AGE, so the seek can skip most of the file
+    add_readings(CSVStore, count=1000)
+    parsed = []
+    parse_line = CSVStore._parse_line
+
+    def counting_parse_line(line):
+        parsed.append(line)
+        return parse_line(line)
+
+    monkeypatch.setattr(CSVStore, "_parse_line", staticmethod(counting_parse_line))
+    rows, _ = read_pages(client, **{"from": START + 60 * 990})
+
+    assert len(rows) == 10
+    slack_rows = app.config["MAX_BACKFILL_AGE"] // 60
+    assert len(parsed) <= slack_rows + len(rows) + 1
+
+
+@pytest.mark.parametrize("backend", ["csv", "sqlite"])
+@pytest.mark.parametrize(
+    "args",
+    [
+        {"cursor": "nonsense"},
+        {"limit": "0"},
+        {"limit": "lots"},
+        {"from": "yesterday"},
+    ],
+)
+def test_malformed_queries_are_rejected(app, client, monkeypatch, backend, args):
+    monkeypatch.setitem(app.config, "READINGS_BACKEND", backend)
+    add_readings(get_reading_store(), count=3)
+
+    response = client.get("/api/readings", query_string=args)
+    assert response.status_code == 400
+    assert response.get_json()["status"] == "failed"
+
+
+def test_page_size_is_capped(app, client, monkeypatch):
+    monkeypatch.setitem(app.config, "READINGS_MAX_PAGE_SIZE", 10)
+    add_readings(CSVStore)
+
+    body = client.get("/api/readings?limit=1000").get_json()
+    assert len(body["readings"]) == 10
+    assert body["next_cursor"] is not None
+
+
+def test_nothing_recorded_yet(client):
+    assert client.get("/api/readings").get_json() == {
+        "readings": [],
+        "next_cursor": None,
+    }
+
+
+def test_raw_readings_links_to_the_next_page(client):
+    add_readings(CSVStore)
+
+    response = client.get("/raw_readings?sensor=den&limit=5")
+    assert response.status_code == 200
+    page = response.get_data(as_text=True)
+    assert page.count("<td>den</td>") == 5
+    assert "<td>porch</td>" not in page
+    assert "cursor=" in page
+
+    response = client.get("/raw_readings?limit=0")
+    assert response.status_code == 200
+    assert "Invalid query" in response.get_data(as_text=True)
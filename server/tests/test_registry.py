@@ -0,0 +1,25 @@
+import json
+
+from app.registry import SensorRegistry
+
+
+def test_rebuild_registry_from_a_history_with_garbled_rows(app):
+    with open("readings.csv", "w") as csv_file:
+        csv_file.write("timestamp,sensor,temperature,humidity\n")
+        csv_file.write("1700000000,den,20.5,40\n")
+        # stored before readings were validated
+        csv_file.write("1700000060,den,abc,nan\n")
+        csv_file.write("1700000120,porch,5.5,\n")
+
+    result = app.test_cli_runner().invoke(args=["rebuild-registry"])
+    assert result.exit_code == 0, result.output
+    assert "registered 2 sensors" in result.output
+
+    with open(SensorRegistry.filename) as json_file:
+        sensors = {entry["name"]: entry for entry in json.load(json_file)["sensors"]}
+    assert sensors["den"]["first_seen"] == 1700000000
+    assert sensors["den"]["last_seen"] == 1700000060
+    assert sensors["den"]["temperature"] is None
+    assert sensors["den"]["humidity"] is None
+    assert sensors["porch"]["temperature"] == 5.5
+    assert sensors["porch"]["humidity"] is None
@@ -0,0 +1,147 @@
+import os
+
+import pytest
+
+from app.rollups import Aggregate, RollupFiles
+from app.store import get_reading_store
+
+# midnight UTC, so every resolution's buckets line up with it
+DAY = 1699920000
+
+
+def add_readings(store):
+    store.add_sensor_readings(
+        [
+            (DAY, "den", 20.0, 40.0),
+            (DAY + 600, "den", 22.0, 44.0),
+            (DAY + 1800, "den", 24.0, None),
+            (DAY + 3600, "den", 30.0, 50.0),
+            (DAY + 60, "porch", 5.0, 80.0),
+        ]
+    )
+
+
+def aggregates(client, **args):
+    response = client.get("/api/aggregates", query_string=args)
+    assert response.status_code == 200
+    return response.get_json()["buckets"]
+
+
+@pytest.mark.parametrize("backend", ["csv", "sqlite"])
+def test_hourly_aggregates(app, client, monkeypatch, backend):
+    monkeypatch.setitem(app.config, "READINGS_BACKEND", backend)
+    add_readings(get_reading_store())
+
+    assert aggregates(client, sensor="den", resolution="1h") == [
+        {
+            "sensor_name": "den",
+            "bucket": DAY,
+            "count": 3,
+            "temperature_min": 20.0,
+            "temperature_max": 24.0,
+            "temperature_mean": 22.0,
+            "humidity_min": 40.0,
+            "humidity_max": 44.0,
+            "humidity_mean": 42.0,
+        },
+        {
+            "sensor_name": "den",
+            "bucket": DAY + 3600,
+            "count": 1,
+            "temperature_min": 30.0,
+            "temperature_max": 30.0,
+            "temperature_mean": 30.0,
+            "humidity_min": 50.0,
+            "humidity_max": 50.0,
+            "humidity_mean": 50.0,
+        },
+    ]
+
+
+@pytest.mark.parametrize("backend", ["csv", "sqlite"])
+def test_every_resolution(app, client, monkeypatch, backend):
+    monkeypatch.setitem(app.config, "READINGS_BACKEND", backend)
+    add_readings(get_reading_store())
+
+    def counts(resolution, **args):
+        return [
+            (bucket["sensor_name"], bucket["bucket"] - DAY, bucket["count"])
+            for bucket in aggregates(client, resolution=resolution, **args)
+        ]
+
+    assert counts("1d") == [("den", 0, 4), ("porch", 0, 1)]
+    assert counts("5m", sensor="den") == [
+        ("den", 0, 1),
+        ("den", 600, 1),
+        ("den", 1800, 1),
+        ("den", 3600, 1),
+    ]
+    assert counts("1m", sensor="porch") == [("porch", 60, 1)]
+    # a start inside a bucket still gets that whole bucket
+    assert counts("1h", sensor="den", **{"from": DAY + 1200, "to": DAY + 3600}) == [
+        ("den", 0, 3)
+    ]
+
+
+@pytest.mark.parametrize("query", ["resolution=1w", "from=yesterday"])
+def test_bad_aggregate_arguments(client, query):
+    response = client.get(f"/api/aggregates?{query}")
+    assert response.status_code == 400
+    assert response.get_json()["status"] == "failed"
+
+
+@pytest.mark.parametrize("backend", ["csv", "sqlite"])
+def test_rebuild_matches_the_incremental_rollups(app, client, monkeypatch, backend):
+    monkeypatch.setitem(app.config, "READINGS_BACKEND", backend)
+    store = get_reading_store()
+    add_readings(store)
+    # a backfilled batch lands in buckets that already have rows
+    store.add_sensor_readings([(DAY + 300, "den", 18.0, 38.0)])
+    incremental = {
+        resolution: aggregates(client, resolution=resolution)
+        for resolution in ("1m", "5m", "1h", "1d")
+    }
+
+    store.rebuild_rollups()
+
+    for resolution, buckets in incremental.items():
+        assert aggregates(client, resolution=resolution) == buckets
+
+
+def test_pending_aggregates_are_read_before_they_are_written(app, client, monkeypatch):
+    monkeypatch.setitem(app.config, "ROLLUP_FLUSH_INTERVAL", 3600)
+    try:
+        add_readings(get_reading_store())
+        assert not os.path.exists(RollupFiles.path("1h"))
+        before = aggregates(client, resolution="1h")
+
+        RollupFiles.flush()
+        assert os.path.exists(RollupFiles.path("1h"))
+        assert aggregates(client, resolution="1h") == before
+        assert before[0]["count"] == 3
+    finally:
+        RollupFiles.flush()
+
+
+def test_aggregates_merge_around_missing_values():
+    first = Aggregate()
+    first.add("20.0", "")
+    second = Aggregate()
+    second.add("nan?", "40.0")
+    second.add("18.0", "60.0")
+
+    first.merge(second)
+    assert first.summary("den", DAY) == {
+        "sensor_name": "den",
+        "bucket": DAY,
+        "count": 3,
+        "temperature_min": 18.0,
+        "temperature_max": 20.0,
+        "temperature_mean": 19.0,
+        "humidity_min": 40.0,
+        "humidity_max": 60.0,
+        "humidity_mean": 50.0,
+    }
+    assert Aggregate.from_row(first.to_row()).summary("den", DAY) == first.summary(
+        "den", DAY
+    )
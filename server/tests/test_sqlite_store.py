@@ -0,0 +1,67 @@
+import pytest
+
+from app.archive import Archive
+from app.sqlite_store import SQLiteStore
+from app.store import CSVStore
+
+
+@pytest.mark.parametrize("backend", ["csv", "sqlite"])
+@pytest.mark.parametrize("field", ["temperature", "humidity"])
+def test_add_reading_rejects_measurements_that_arent_numbers(
+    app, client, monkeypatch, backend, field
+):
+    monkeypatch.setitem(app.config, "READINGS_BACKEND", backend)
+    response = client.post(
+        "/sensor/add_reading",
+        json={"sensor_name": "den", "sensor_id": 1, field: "abc"},
+    )
+    assert response.status_code == 400
+    assert response.json == {"status": "failed", "message": f"{field} must be a number"}
+
+    response = client.post(
+        "/sensor/add_reading",
+        json={"sensor_name": "den", "sensor_id": 1, "temperature": 20.5},
+    )
+    assert response.status_code == 200
+
+
+def test_import_csv_skips_lines_that_arent_readings(app):
+    with open("readings.csv", "wb") as csv_file:
+        csv_file.write(b"timestamp,sensor,temperature,humidity\n")
+        csv_file.write(b"1700000000,den,20.5,40\n")
+        csv_file.write(b"1700000060,den,abc,40\n")
+        csv_file.write(b"1700000120,den,21,\n")
+        csv_file.write(b"2023-11-14 22:15:00,porch,5.5,80\n")
+        csv_file.write(b"1700000180,porch,\xff,80\n")
+
+    assert SQLiteStore.import_csv("readings.csv") == (3, 3)
+    assert [
+        (reading["sensor_name"], reading["temperature"], reading["humidity"])
+        for reading in SQLiteStore.get_all()
+    ] == [("den", "20.5", "40.0"), ("den", "21.0", ""), ("porch", "5.5", "80.0")]
+
+
+def test_import_csv_command_includes_the_archive(app):
+    pytest.importorskip("numpy")
+    CSVStore.add_sensor_readings(
+        [
+            (1700000000, "den", 20.0, 40.0),
+            (1700000060, "den", 20.5, None),
+            (1800000000, "den", 21.0, 42.0),
+        ]
+    )
+    # the first row was archived by a compaction that didn't finish
+    Archive.append([(1700000000, "den", 20.0, 40.0)], 1700000060)
+
+    result = app.test_cli_runner().invoke(args=["import-csv"])
+    assert result.exit_code == 0, result.output
+    assert "imported 1 archived readings" in result.output
+    assert f"imported 2 readings from {CSVStore.filename}" in result.output
+    assert [
+        (reading["timestamp"], reading["temperature"], reading["humidity"])
+        for reading in SQLiteStore.get_all()
+    ] == [
+        ("2023-11-14 22:13:20", "20.0", "40.0"),
+        ("2023-11-14 22:14:20", "20.5", ""),
+        ("2027-01-15 08:00:00", "21.0", "42.0"),
+    ]
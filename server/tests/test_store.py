@@ -0,0 +1,176 @@
+import os
+import threading
+
+import pytest
+
+from app.store import CSVStore, SettingsStore, get_reading_store
+
+
+@pytest.mark.parametrize("backend", ["csv", "sqlite"])
+def test_backfilled_readings_dont_become_the_latest(app, monkeypatch, backend):
+    monkeypatch.setitem(app.config, "READINGS_BACKEND", backend)
+    store = get_reading_store()
+    store.add_sensor_readings(
+        [(1700000600, "den", 21.0, 40.0), (1700000300, "porch", 5.0, 80.0)]
+    )
+    # a sensor uploading what it buffered while it was offline
+    store.add_sensor_readings(
+        [(1700000000, "den", 19.0, 45.0), (1700000100, "den", 19.5, 44.0)]
+    )
+
+    assert store.get_last_reading("den")["epoch"] == 1700000600
+    assert store.get_last_reading(None)["epoch"] == 1700000600
+
+    store.add_sensor_readings([(1700000600, "porch", 6.0, 79.0)])
+    assert store.get_last_reading("porch")["temperature"] == "6.0"
+    assert store.get_last_reading(None)["location"] == "porch"
+
+
+def test_backfill_appended_by_another_process_isnt_the_latest(app):
+    CSVStore.add_sensor_readings([(1700000600, "den", 21.0, 40.0)])
+    # appended behind the index's back, as another worker would
+    with open(CSVStore.filename, "a") as csv_file:
+        csv_file.write("1700000000,den,19.0,45.0\n")
+
+    assert CSVStore.get_last_reading("den")["epoch"] == 1700000600
+
+
+def test_setting_the_setpoint_before_settings_exist(client):
+    # nothing has read the settings yet, so settings.json isn't there
+    done = threading.Event()
+
+    def post():
+        response = client.post("/temp_setpoint", json={"newSetpoint": 68})
+        assert response.status_code == 200
+        done.set()
+
+    threading.Thread(target=post, daemon=True).start()
+    assert done.wait(timeout=5), "setting the setpoint hung"
+    assert SettingsStore.temp_setpoint() == 68
+    assert not [name for name in os.listdir(".") if name.endswith(".tmp")]
+
+
+def test_backfill_isnt_the_latest_after_a_restart(app):
+    with open(CSVStore.filename, "w") as csv_file:
+        csv_file.write("1700000600,den,21.0,40.0\n")
+        csv_file.write("1700000000,den,19.0,45.0\n")
+
+    assert CSVStore.get_last_reading("den")["epoch"] == 1700000600
+    assert CSVStore.get_last_reading(None)["epoch"] == 1700000600
+
+
+def test_cold_start_scan_stops_once_nothing_older_can_be_newer(app):
+    slack = app.config["MAX_BACKFILL_AGE"] + app.config["MAX_CLOCK_SKEW"]
+    with open(CSVStore.filename, "w") as csv_file:
+        for epoch in range(1700000000, 1700000000 + 3 * slack, 60):
+            csv_file.write(f"{epoch},den,20.0,40.0\n")
+        csv_file.write(f"{epoch - 60},porch,5.0,80.0\n")
+        csv_file.write(f"{epoch - 120},porch,4.0,80.0\n")
+    size = os.path.getsize(CSVStore.filename)
+
+    assert CSVStore.get_last_reading("porch")["temperature"] == "5.0"
+    assert CSVStore.get_last_reading(None)["location"] == "den"
+    # about MAX_BACKFILL_AGE of history was read, not the whole file
+    assert size // 2 < CSVStore._scanned_from < size
+
+
+def forget_index(monkeypatch):
+    """start the CSV index over, as a freshly started worker would"""
+    monkeypatch.setattr(CSVStore, "_latest", {})
+    monkeypatch.setattr(CSVStore, "_latest_any", None)
+    monkeypatch.setattr(CSVStore, "_signature", None)
+    monkeypatch.setattr(CSVStore, "_indexed_offset", 0)
+    monkeypatch.setattr(CSVStore, "_scanned_from", 0)
+    monkeypatch.setattr(CSVStore, "_oldest_indexed", None)
+
+
+def test_latest_reading_per_sensor_and_overall(app):
+    assert CSVStore.get_last_reading("den") is None
+    CSVStore.add_sensor_readings(
+        [(1700000000, "den", 20.0, 40.0), (1700000060, "porch", 5.0, None)]
+    )
+    CSVStore.add_sensor_readings([(1700000120, "den", 20.5, 41.0)])
+
+    den = CSVStore.get_last_reading("den")
+    assert den == {
+        "location": "den",
+        "timestamp": "2023-11-14 22:15:20",
+        "epoch": 1700000120,
+        "temperature": "20.5",
+        "humidity": "41.0",
+    }
+    assert CSVStore.get_last_reading("porch")["humidity"] == ""
+    assert CSVStore.get_last_reading(None)["location"] == "den"
+    assert CSVStore.get_last_reading("attic") is None
+
+    # callers get a copy they are free to change
+    den["temperature"] = "99"
+    assert CSVStore.get_last_reading("den")["temperature"] == "20.5"
+
+
+def test_lookups_dont_read_the_file_while_it_is_unchanged(app, monkeypatch):
+    CSVStore.add_sensor_readings([(1700000000, "den", 20.0, 40.0)])
+    CSVStore.get_last_reading("den")
+
+    def no_open(*args, **kwargs):
+        raise AssertionError("readings.csv was read")
+
+    monkeypatch.setattr("app.store.open", no_open, raising=False)
+    for _ in range(3):
+        assert CSVStore.get_last_reading("den")["epoch"] == 1700000000
+        assert CSVStore.get_last_reading(None)["epoch"] == 1700000000
+
+
+def test_index_picks_up_rows_appended_by_another_process(app):
+    CSVStore.add_sensor_readings([(1700000000, "den", 20.0, 40.0)])
+    assert CSVStore.get_last_reading("den")["epoch"] == 1700000000
+    with open(CSVStore.filename, "a") as csv_file:
+        csv_file.write("1700000060,den,20.5,40.0\n")
+        csv_file.write("1700000120,attic,25.0,30.0\n")
+
+    assert CSVStore.get_last_reading("den")["epoch"] == 1700000060
+    assert CSVStore.get_last_reading("attic")["epoch"] == 1700000120
+
+
+def test_index_is_rebuilt_when_the_file_is_replaced(app):
+    CSVStore.add_sensor_readings(
+        [(1700000000, "den", 20.0, 40.0), (1700000060, "porch", 5.0, 80.0)]
+    )
+    assert CSVStore.get_last_reading("porch") is not None
+
+    # a new file of the same size under the same name, e.g. restored from a
+    # backup, whose porch reading is older than the one the index holds
+    with open("replacement.csv", "w") as csv_file:
+        csv_file.write("1600000000,porch,7.0,70.0\n")
+        csv_file.write("1700000000,attic,9.0,90.0\n")
+    os.replace("replacement.csv", CSVStore.filename)
+
+    assert CSVStore.get_last_reading("porch")["epoch"] == 1600000000
+    assert CSVStore.get_last_reading("den") is None
+    assert CSVStore.get_last_reading(None)["location"] == "attic"
+
+
+def test_index_is_rebuilt_when_the_file_is_truncated(app):
+    CSVStore.add_sensor_readings(
+        [(1700000000, "den", 20.0, 40.0), (1700000060, "porch", 5.0, 80.0)]
+    )
+    CSVStore.get_last_reading("porch")
+    with open(CSVStore.filename, "rb+") as csv_file:
+        csv_file.truncate(len(csv_file.readline()))
+
+    assert CSVStore.get_last_reading("porch") is None
+    assert CSVStore.get_last_reading(None)["location"] == "den"
+
+
+def test_index_starts_from_the_tail_of_an_existing_file(app, monkeypatch):
+    CSVStore.add_sensor_readings(
+        [(1700000000 + i * 60, "den", 20.0, 40.0) for i in range(100)]
+        + [(1700006000, "porch", 5.0, 80.0)]
+    )
+    forget_index(monkeypatch)
+
+    assert CSVStore.get_last_reading("porch")["epoch"] == 1700006000
+    assert CSVStore.get_last_reading("den")["epoch"] == 1700005940
+    # later rows are indexed as they are written
+    CSVStore.add_sensor_readings([(1700006060, "den", 21.0, 40.0)])
+    assert CSVStore.get_last_reading("den")["epoch"] == 1700006060
@@ -0,0 +1,81 @@
+import time
+
+import pytest
+
+from app.store import CSVStore
+from app.timeutil import (
+    from_epoch,
+    parse_time,
+    stored_epoch,
+    to_epoch,
+    to_isoformat,
+)
+
+# around the turn of a leap year, a day apart and a second before midnight
+EPOCHS = [0, 951782399, 951868799, 1700000000, 4102444799]
+
+
+@pytest.mark.parametrize("epoch", EPOCHS)
+def test_fast_paths_match_strftime(app, epoch):
+    expected = time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime(epoch))
+    assert from_epoch(epoch) == expected
+    assert to_epoch(expected) == epoch
+    assert to_isoformat(epoch) == expected.replace(" ", "T") + "+00:00"
+
+
+def test_other_time_formats(app, monkeypatch):
+    monkeypatch.setitem(app.config, "TIME_FORMAT", "%d/%m/%Y %H:%M:%S")
+    assert from_epoch(1700000000) == "14/11/2023 22:13:20"
+    assert to_epoch("14/11/2023 22:13:20") == 1700000000
+    assert stored_epoch("14/11/2023 22:13:20") == 1700000000
+    # ISO output doesn't depend on TIME_FORMAT
+    assert to_isoformat(1700000000) == "2023-11-14T22:13:20+00:00"
+
+
+def test_stored_timestamps(app):
+    assert stored_epoch("1700000000") == 1700000000
+    assert stored_epoch("2023-11-14 22:13:20") == 1700000000
+    for garbage in ["", "yesterday", "2023-11-14"]:
+        with pytest.raises(ValueError):
+            stored_epoch(garbage)
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        "1700000000",
+        " 1700000000 ",
+        "2023-11-14T22:13:20Z",
+        "2023-11-14T22:13:20+00:00",
+        "2023-11-15T00:13:20+02:00",
+        "2023-11-14 22:13:20",
+    ],
+)
+def test_parse_time(value):
+    assert parse_time(value) == 1700000000
+
+
+def test_parse_time_rejects_anything_else():
+    with pytest.raises(ValueError):
+        parse_time("last tuesday")
+
+
+def test_legacy_rows_read_alongside_epoch_rows(app):
+    # a file started before readings were stored as epoch seconds
+    with open(CSVStore.filename, "w") as csv_file:
+        csv_file.write("2023-11-14 22:13:20,den,20.0,40.0\n")
+        csv_file.write("2023-11-14 22:14:20,porch,5.0,80.0\n")
+    CSVStore.add_sensor_readings([(1700000120, "den", 21.0, 41.0)])
+
+    with open(CSVStore.filename) as csv_file:
+        assert csv_file.read().splitlines()[-1] == "1700000120,den,21.0,41.0"
+    assert [row["timestamp"] for row in CSVStore.get_all()] == [
+        "2023-11-14 22:13:20",
+        "2023-11-14 22:14:20",
+        "2023-11-14 22:15:20",
+    ]
+    assert CSVStore.get_last_reading("porch")["epoch"] == 1700000060
+    assert CSVStore.get_last_reading(None)["epoch"] == 1700000120
+
+    rows, _ = CSVStore.query(start=1700000060, end=1700000180)
+    assert [row["sensor_name"] for row in rows] == ["porch", "den"]
@@ -0,0 +1,82 @@
+import socket
+import time
+
+import pytest
+
+from app import packet, udp
+from app.store import CSVStore
+
+SECRET = b"sensor key"
+
+
+@pytest.fixture
+def listener(app):
+    listener = udp.UDPListener(
+        udp.bind("127.0.0.1", 0), SECRET, window=4, sequences_file="sequences.json"
+    ).start()
+    yield listener
+    listener.close()
+
+
+@pytest.fixture
+def send(listener):
+    """send a datagram to the listener and wait for what became of it"""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+
+    def send(sequence, temperature=20.5, key=SECRET):
+        handled = sum(listener.counts.values())
+        payload = packet.encode(7, "porch", [(0, temperature, 50.0)])
+        sock.sendto(packet.sign(sequence, payload, key), listener.sock.getsockname())
+        deadline = time.monotonic() + 5
+        while sum(listener.counts.values()) == handled:
+            assert time.monotonic() < deadline, "the listener never got the datagram"
+            time.sleep(0.01)
+        return +listener.counts
+
+    yield send
+    sock.close()
+
+
+def stored_temperatures():
+    return [reading["temperature"] for reading in CSVStore.get_all()]
+
+
+def test_valid_datagrams_are_stored(send):
+    assert send(1 << 16 | 1, 20.5) == {"accepted": 1}
+    assert send(1 << 16 | 2, 21.0) == {"accepted": 2}
+    assert stored_temperatures() == ["20.5", "21.0"]
+
+
+def test_repeated_and_old_sequence_numbers_are_dropped(send):
+    send(1 << 16 | 10, 20.0)
+    assert send(1 << 16 | 10, 20.1) == {"accepted": 1, "duplicate": 1}
+    # within the window and not seen yet, so late but fine
+    assert send(1 << 16 | 8, 20.2) == {"accepted": 2, "duplicate": 1}
+    assert send(1 << 16 | 8, 20.3) == {"accepted": 2, "duplicate": 2}
+    # further back than the window
+    assert send(1 << 16 | 6, 20.4) == {"accepted": 2, "duplicate": 3}
+    # an earlier boot of the sensor
+    assert send(0 << 16 | 500, 20.5) == {"accepted": 2, "duplicate": 4}
+    assert stored_temperatures() == ["20.0", "20.2"]
+
+
+def test_sequence_numbers_stay_used_across_restarts(app, send, listener):
+    send(1 << 16 | 10)
+    listener.close()
+
+    restarted = udp.UDPListener(
+        udp.bind("127.0.0.1", 0), SECRET, window=4, sequences_file="sequences.json"
+    )
+    try:
+        payload = packet.encode(7, "porch", [(0, 19.0, 50.0)])
+        datagram = packet.sign(1 << 16 | 10, payload, SECRET)
+        assert restarted.handle(datagram) == "duplicate"
+    finally:
+        restarted.sock.close()
+
+
+def test_datagrams_with_a_bad_mac_are_rejected(send):
+    assert send(1 << 16 | 1, key=b"wrong key") == {"unauthenticated": 1}
+    # a forged datagram doesn't use up its sequence number
+    assert send(1 << 16 | 1) == {"unauthenticated": 1, "accepted": 1}
+    assert stored_temperatures() == ["20.5"]
@@ -0,0 +1,125 @@
+import json
+import threading
+import time
+
+import pytest
+
+from app import handlers
+from app.store import CSVStore
+
+
+def add_reading(client, temperature):
+    response = client.post(
+        "/sensor/add_reading",
+        json={
+            "sensor_name": "den",
+            "sensor_id": 1,
+            "temperature": temperature,
+            "humidity": 40,
+        },
+    )
+    assert response.status_code == 200
+
+
+def later(delay, func, *args):
+    """call `func(*args)` from another thread after `delay` seconds"""
+    timer = threading.Timer(delay, func, args)
+    timer.daemon = True
+    timer.start()
+    return timer
+
+
+def test_a_new_version_is_answered_straight_away(client):
+    add_reading(client, 20.5)
+
+    started = time.monotonic()
+    response = client.get("/api/watch?sensor=den&version=stale&timeout=10")
+    assert time.monotonic() - started < 5
+    assert response.status_code == 200
+    state = response.get_json()
+    assert state["temperature"] == "20.5"
+    assert state["setpoint"] is not None
+    assert response.headers["ETag"] == f'"{state["version"]}"'
+
+
+def test_nothing_changed_until_the_timeout(client):
+    add_reading(client, 20.5)
+    version = client.get("/api/watch?sensor=den").get_json()["version"]
+
+    started = time.monotonic()
+    response = client.get(f"/api/watch?sensor=den&version={version}&timeout=0.2")
+    assert time.monotonic() - started >= 0.2
+    assert response.status_code == 304
+    assert response.headers["ETag"] == f'"{version}"'
+
+    # the version can come in If-None-Match instead
+    response = client.get(
+        "/api/watch?sensor=den&timeout=0", headers={"If-None-Match": f'"{version}"'}
+    )
+    assert response.status_code == 304
+
+
+def test_a_write_wakes_the_watcher(app, client, monkeypatch):
+    # only the notification can wake it in time
+    monkeypatch.setitem(app.config, "WATCH_POLL_INTERVAL", 60)
+    add_reading(client, 20.5)
+    version = client.get("/api/watch?sensor=den").get_json()["version"]
+
+    later(0.2, add_reading, app.test_client(), 21.0)
+    started = time.monotonic()
+    response = client.get(f"/api/watch?sensor=den&version={version}&timeout=30")
+    assert time.monotonic() - started < 10
+    assert response.status_code == 200
+    assert response.get_json()["temperature"] == "21.0"
+
+
+def test_a_write_by_another_process_is_polled_for(app, client, monkeypatch):
+    monkeypatch.setitem(app.config, "WATCH_POLL_INTERVAL", 0.05)
+    add_reading(client, 20.5)
+    version = client.get("/api/watch?sensor=den").get_json()["version"]
+
+    def append_behind_our_back():
+        with open(CSVStore.filename, "a") as csv_file:
+            csv_file.write(f"{int(time.time())},den,22.0,40.0\n")
+
+    later(0.2, append_behind_our_back)
+    response = client.get(f"/api/watch?sensor=den&version={version}&timeout=10")
+    assert response.status_code == 200
+    assert response.get_json()["temperature"] == "22.0"
+
+
+def test_a_bad_timeout_is_rejected(client, asgi_call):
+    response = client.get("/api/watch?timeout=soon")
+    assert response.status_code == 400
+    assert response.get_json()["status"] == "failed"
+
+    status, _, _ = asgi_call("GET", "/api/watch?timeout=soon")
+    assert status == 400
+
+
+@pytest.mark.parametrize(
+    "value, expected", [(None, 25.0), ("5", 5.0), ("-1", 0.0), ("1000", 55.0)]
+)
+def test_watch_timeouts_are_bounded(app, value, expected):
+    assert handlers.watch_timeout(value) == expected
+
+
+def test_asgi_watch(app, client, asgi_call, monkeypatch):
+    monkeypatch.setitem(app.config, "WATCH_POLL_INTERVAL", 60)
+    add_reading(client, 20.5)
+    version = client.get("/api/watch?sensor=den").get_json()["version"]
+
+    status, headers, _ = asgi_call(
+        "GET", f"/api/watch?sensor=den&version={version}&timeout=0.1"
+    )
+    assert status == 304
+    assert headers["etag"] == f'"{version}"'
+
+    later(0.2, add_reading, app.test_client(), 21.0)
+    started = time.monotonic()
+    status, headers, content = asgi_call(
+        "GET", f"/api/watch?sensor=den&version={version}&timeout=30"
+    )
+    assert time.monotonic() - started < 10
+    assert status == 200
+    assert json.loads(content)["temperature"] == "21.0"
@@ -0,0 +1,188 @@
+import os
+import subprocess
+import sys
+import textwrap
+import threading
+
+import pytest
+
+from app.write_buffer import WriteBehindBuffer
+
+SERVER_DIR = os.path.join(os.path.dirname(__file__), os.pardir)
+
+
+class RecordingStore:
+    """a ReadingStore that remembers the batches it was given"""
+
+    def __init__(self, fail=False):
+        self.batches = []
+        self.fail = fail
+        self.written = threading.Event()
+
+    def add_sensor_readings(self, readings, fsync=False):
+        if self.fail:
+            raise OSError("disk full")
+        self.batches.append((list(readings), fsync))
+        self.written.set()
+
+
+@pytest.fixture
+def make_buffer():
+    buffers = []
+
+    def make_buffer(store, **options):
+        buffers.append(WriteBehindBuffer(store, **options))
+        return buffers[-1]
+
+    yield make_buffer
+    for write_buffer in buffers:
+        write_buffer.close()
+
+
+def reading(i):
+    return (1700000000 + i, "den", 20.0, 40.0)
+
+
+def test_durability_none_returns_before_the_write(make_buffer):
+    store = RecordingStore()
+    written = []
+    write_buffer = make_buffer(store, max_delay=60, durability="none")
+    write_buffer.submit([reading(0)], on_written=lambda: written.append(1))
+    assert store.batches == []
+    assert write_buffer.queue_depth == 1
+
+    write_buffer.flush()
+    assert store.batches == [([reading(0)], False)]
+    assert written == [1]
+    assert write_buffer.queue_depth == 0
+
+
+@pytest.mark.parametrize("durability, fsync", [("write", False), ("fsync", True)])
+def test_durability_write_and_fsync_wait_for_the_store(make_buffer, durability, fsync):
+    store = RecordingStore()
+    written = []
+    write_buffer = make_buffer(store, max_delay=0.01, durability=durability)
+    write_buffer.submit([reading(0)], on_written=lambda: written.append(1))
+    assert store.batches == [([reading(0)], fsync)]
+    assert written == [1]
+
+
+def test_unknown_durability_is_refused():
+    with pytest.raises(ValueError):
+        WriteBehindBuffer(RecordingStore(), durability="eventually")
+
+
+def test_a_full_batch_is_written_at_once(make_buffer):
+    store = RecordingStore()
+    write_buffer = make_buffer(store, max_batch=3, max_delay=60, durability="none")
+    write_buffer.submit([reading(0), reading(1)])
+    write_buffer.submit([reading(2)])
+    assert store.written.wait(timeout=5)
+    assert store.batches == [([reading(0), reading(1), reading(2)], False)]
+
+
+def test_a_partial_batch_is_written_after_max_delay(make_buffer):
+    store = RecordingStore()
+    write_buffer = make_buffer(store, max_batch=100, max_delay=0.05, durability="none")
+    write_buffer.submit([reading(0)])
+    write_buffer.submit([reading(1)])
+    assert store.written.wait(timeout=5)
+    assert store.batches == [([reading(0), reading(1)], False)]
+
+
+def test_concurrent_submits_share_a_batch(make_buffer):
+    store = RecordingStore()
+    write_buffer = make_buffer(store, max_batch=1000, max_delay=0.2)
+    threads = [
+        threading.Thread(target=write_buffer.submit, args=([reading(i)],))
+        for i in range(20)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert sorted(sum((batch for batch, _ in store.batches), [])) == [
+        reading(i) for i in range(20)
+    ]
+    assert len(store.batches) < 20
+
+
+def test_a_failed_write_is_raised_and_skips_the_callbacks(make_buffer):
+    written = []
+    write_buffer = make_buffer(RecordingStore(fail=True), max_delay=0.01)
+    with pytest.raises(OSError):
+        write_buffer.submit([reading(0)], on_written=lambda: written.append(1))
+    assert written == []
+    assert write_buffer.stats()["failed_readings"] == 1
+
+
+def test_close_writes_what_is_queued(make_buffer):
+    store = RecordingStore()
+    write_buffer = make_buffer(store, max_delay=60, durability="none")
+    write_buffer.submit([reading(0)])
+    write_buffer.close()
+    assert store.batches == [([reading(0)], False)]
+    with pytest.raises(RuntimeError):
+        write_buffer.submit([reading(1)])
+
+
+def test_stats(make_buffer):
+    write_buffer = make_buffer(RecordingStore(), max_delay=60, durability="none")
+    write_buffer.submit([reading(0), reading(1)])
+    assert write_buffer.stats()["queue_depth"] == 2
+    write_buffer.flush()
+    stats = write_buffer.stats()
+    assert stats["queue_depth"] == 0
+    assert stats["flush_count"] == 1
+    assert stats["flushed_readings"] == 2
+    assert stats["max_flush_ms"] >= stats["mean_flush_ms"] >= 0
+
+
+def test_ingest_stats_endpoint(client, monkeypatch):
+    from app import ingest
+
+    assert client.get("/sensor/ingest_stats").json == {"write_behind": False}
+
+    monkeypatch.setitem(client.application.config, "WRITE_BEHIND", True)
+    monkeypatch.setattr(ingest, "_write_buffer", None)
+    try:
+        response = client.post(
+            "/sensor/add_reading",
+            json={"sensor_name": "den", "sensor_id": 1, "temperature": 20.5},
+        )
+        assert response.status_code == 200
+        stats = client.get("/sensor/ingest_stats").json
+        assert stats["write_behind"] is True
+        assert stats["flushed_readings"] == 1
+    finally:
+        ingest._write_buffer.close()
+
+
+def test_sigterm_writes_out_the_buffer(tmp_path):
+    script = textwrap.dedent("""
+        import os, signal, sys, time
+        sys.path.insert(0, sys.argv[1])
+        from app import app
+        from app.ingest import record_readings
+
+        app.config.update(
+            WRITE_BEHIND=True,
+            WRITE_DURABILITY="none",
+            WRITE_BEHIND_MAX_DELAY=60,
+            ARCHIVE_AFTER=0,
+        )
+        record_readings([(1700000000, "den", 20.5, 40.0)], 1)
+        assert not os.path.exists("readings.csv")
+        os.kill(os.getpid(), signal.SIGTERM)
+        time.sleep(10)
+        """)
+    result = subprocess.run(
+        [sys.executable, "-c", script, os.path.abspath(SERVER_DIR)],
+        cwd=tmp_path,
+        capture_output=True,
+        timeout=30,
+    )
+    assert result.returncode == 128 + 15, result.stderr.decode()
+    with open(tmp_path / "readings.csv") as csv_file:
+        assert csv_file.read().splitlines() == ["1700000000,den,20.5,40.0"]
+    assert (tmp_path / "sensors.json").exists()